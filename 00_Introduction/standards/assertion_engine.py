@@ -0,0 +1,146 @@
+"""
+Assertion Engine for Prompt Evaluation
+
+Evaluates AI outputs against test case assertions:
+- Expected / forbidden phrases (one Aho-Corasick pass for the whole suite)
+- Regex matches (compiled once per suite)
+- JSON path values
+- Required Markdown sections
+- Similarity to a golden output
+"""
+
+import os
+import re
+import sys
+import json
+import difflib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scripts"))
+from aho_corasick import AhoCorasick
+
+
+class AssertionEngine:
+    """
+    Compiles the assertions of a whole test suite once and evaluates an
+    output against any of its test cases.
+
+    Supported test case keys:
+        expected_contains / expected_not_contains: phrases (case-insensitive)
+        expected_regex / forbidden_regex: regular expressions
+        json_paths: {"$.path[0].field": expected_value_or_None}
+        required_sections: Markdown headings that must be present
+        golden_output + min_similarity: similarity floor (0-1)
+        max_length: maximum output length
+    """
+
+    HEADING_PATTERN = re.compile(r'^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$', re.MULTILINE)
+    JSON_BLOCK_PATTERN = re.compile(r'```json\s*([\s\S]*?)\s*```')
+    JSON_PATH_TOKEN = re.compile(r'\.([^.\[\]]+)|\[(\d+)\]')
+
+    def __init__(self, test_cases: Iterable[Dict[str, Any]]):
+        test_cases = list(test_cases)
+        phrases = {
+            phrase.lower()
+            for tc in test_cases
+            for key in ("expected_contains", "expected_not_contains")
+            for phrase in tc.get(key) or []
+        }
+        self._phrase_ids = {phrase: i for i, phrase in enumerate(sorted(phrases))}
+        self._automaton = AhoCorasick(sorted(phrases))
+        self._regex = {
+            pattern: re.compile(pattern, re.MULTILINE)
+            for tc in test_cases
+            for key in ("expected_regex", "forbidden_regex")
+            for pattern in tc.get(key) or []
+        }
+
+    def evaluate(self, output: str, test_case: Dict[str, Any]) -> List[str]:
+        """Return the list of issues (empty when every assertion passes)."""
+        issues = []
+        found = self._automaton.find_all(output.lower()) if self._phrase_ids else set()
+
+        for phrase in test_case.get("expected_contains") or []:
+            if self._phrase_id(phrase) not in found:
+                issues.append(f"Missing expected phrase: '{phrase}'")
+
+        for phrase in test_case.get("expected_not_contains") or []:
+            if self._phrase_id(phrase) in found:
+                issues.append(f"Contains forbidden phrase: '{phrase}'")
+
+        for pattern in test_case.get("expected_regex") or []:
+            if not self._compiled(pattern).search(output):
+                issues.append(f"No match for regex: '{pattern}'")
+
+        for pattern in test_case.get("forbidden_regex") or []:
+            if self._compiled(pattern).search(output):
+                issues.append(f"Matches forbidden regex: '{pattern}'")
+
+        if test_case.get("required_sections"):
+            headings = {h.strip().lower() for h in self.HEADING_PATTERN.findall(output)}
+            for section in test_case["required_sections"]:
+                if section.lstrip("# ").strip().lower() not in headings:
+                    issues.append(f"Missing section: '{section}'")
+
+        if test_case.get("json_paths"):
+            issues.extend(self._check_json_paths(output, test_case["json_paths"]))
+
+        if test_case.get("golden_output") is not None:
+            # An explicit 0.0 disables the floor; only a missing/None value means the default
+            min_similarity = test_case.get("min_similarity", 0.8)
+            if min_similarity is None:
+                min_similarity = 0.8
+            score = self.similarity(output, test_case["golden_output"], min_similarity)
+            if score < min_similarity:
+                issues.append(f"Similarity to golden output too low: {score:.2f} < {min_similarity}")
+
+        max_length = test_case.get("max_length")
+        if max_length and len(output) > max_length:
+            issues.append(f"Output too long: {len(output)} > {max_length}")
+
+        return issues
+
+    def _phrase_id(self, phrase: str) -> Optional[int]:
+        return self._phrase_ids.get(phrase.lower())
+
+    def _compiled(self, pattern: str) -> "re.Pattern":
+        compiled = self._regex.get(pattern)
+        if compiled is None:
+            compiled = self._regex[pattern] = re.compile(pattern, re.MULTILINE)
+        return compiled
+
+    def _check_json_paths(self, output: str, json_paths: Dict[str, Any]) -> List[str]:
+        block = self.JSON_BLOCK_PATTERN.search(output)
+        try:
+            document = json.loads(block.group(1) if block else output)
+        except json.JSONDecodeError as e:
+            return [f"Output is not valid JSON: {e}"]
+
+        issues = []
+        for path, expected in json_paths.items():
+            ok, value = self._resolve_json_path(document, path)
+            if not ok:
+                issues.append(f"JSON path not found: '{path}'")
+            elif expected is not None and value != expected:
+                issues.append(f"JSON path '{path}' is {value!r}, expected {expected!r}")
+        return issues
+
+    @classmethod
+    def _resolve_json_path(cls, document: Any, path: str) -> Tuple[bool, Any]:
+        """Resolve a simple $.a.b[0].c path."""
+        value = document
+        for key, index in cls.JSON_PATH_TOKEN.findall(path.lstrip("$")):
+            try:
+                value = value[int(index)] if index else value[key]
+            except (KeyError, IndexError, TypeError):
+                return False, None
+        return True, value
+
+    @staticmethod
+    def similarity(output: str, golden: str, threshold: float = 0.0) -> float:
+        """Word-level similarity ratio (0-1), with a cheap upper bound check first."""
+        matcher = difflib.SequenceMatcher(None, output.split(), golden.split())
+        upper = matcher.quick_ratio()
+        if upper < threshold:
+            return upper
+        return matcher.ratio()
@@ -0,0 +1,60 @@
+"""
+Advisory File Locking
+
+Cross-process locking for the Markdown/JSONL state files in outputs/,
+so parallel agent runs do not clobber each other.
+
+Usage:
+    from file_lock import locked
+
+    with locked("outputs/open_questions.jsonl"):
+        ...  # exclusive access across processes
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to msvcrt
+    fcntl = None
+    import msvcrt
+
+# flock() locks are per open file description; serialize threads in-process too
+_THREAD_LOCKS = {}
+_THREAD_LOCKS_GUARD = threading.Lock()
+
+
+def _thread_lock(path: str) -> threading.RLock:
+    with _THREAD_LOCKS_GUARD:
+        return _THREAD_LOCKS.setdefault(path, threading.RLock())
+
+
+@contextmanager
+def locked(path: str, shared: bool = False):
+    """
+    Hold an advisory lock on `<path>.lock` for the duration of the block.
+
+    Args:
+        path: The file being protected (the lock file sits next to it)
+        shared: Take a shared (read) lock instead of an exclusive one
+    """
+    lock_path = os.path.abspath(path) + ".lock"
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+
+    with _thread_lock(lock_path):
+        with open(lock_path, "a+") as handle:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield handle
+            finally:
+                if fcntl:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+                else:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
@@ -1,52 +1,204 @@
 import os
 import re
+import json
+import time
+import atexit
+import weakref
 import datetime
 from typing import List, Dict, Any
 from rich.console import Console
 
+from file_lock import locked
+
 console = Console()
 
+# Managers flushed at exit. Weak, so short-lived managers can be collected;
+# a table one of them left stale is re-rendered by the next manager's init.
+_LIVE_MANAGERS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_managers():
+    for manager in list(_LIVE_MANAGERS):
+        manager.flush()
+
+
 class FollowUpManager:
     """
     Manages a persistent list of 'Open Questions' or 'Follow-Up Items' 
     across agent sessions.
     
-    Uses MARKDOWN (.md) format for human readability AND machine parsing.
+    The source of truth is an append-only event journal (open_questions.jsonl)
+    replayed into an id-indexed map, so adding or resolving an item is a
+    single append. IDs come from a lock-protected counter and are safe across
+    parallel agent processes.
+
+    The MARKDOWN (.md) table is kept for human readability and is regenerated
+    from the journal periodically, at exit, and on startup when the journal
+    is newer.
     """
-    def __init__(self, output_dir: str):
+    def __init__(self, output_dir: str, fsync_every: int = 20, render_interval: float = 30.0):
         self.output_dir = output_dir
         self.filepath = os.path.join(output_dir, "open_questions.md")
-        self.items = self._load()
+        self.journal_path = os.path.join(output_dir, "open_questions.jsonl")
+        self.seq_path = os.path.join(output_dir, "open_questions.seq")
+        self.fsync_every = fsync_every
+        self.render_interval = render_interval
+
+        self._index: Dict[int, Dict] = {}
+        self._offset = 0
+        self._unsynced = 0
+        self._dirty = False
+        self._last_render = time.monotonic()
+
+        if not os.path.exists(self.journal_path) and os.path.exists(self.filepath):
+            self._migrate_markdown()
+        self.refresh()
+        if self._markdown_is_stale():
+            self._save()
+        _LIVE_MANAGERS.add(self)
+
+    @property
+    def items(self) -> List[Dict]:
+        return list(self._index.values())
+
+    # ─────────────────────────────────────────────────────────────
+    # JOURNAL
+    # ─────────────────────────────────────────────────────────────
+
+    def refresh(self):
+        """Apply journal events appended since the last read (by any process)."""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+
+        complete = data.rfind(b"\n") + 1  # Ignore a partially written last line
+        for line in data[:complete].splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+        self._offset += complete
+
+    def _apply(self, event: Dict[str, Any]):
+        if event["event"] == "add":
+            self._index[event["id"]] = {
+                "id": event["id"],
+                "question": event["question"],
+                "status": event["status"],
+                "context": event.get("context", ""),
+                "created_at": event.get("created_at", "")
+            }
+        elif event["event"] == "resolve" and event["id"] in self._index:
+            item = self._index[event["id"]]
+            item["status"] = event["status"]
+            item["answer"] = event.get("answer", "")
 
-    def _load(self) -> List[Dict]:
-        """Parses the Markdown table into a list of dicts."""
+    def _append(self, make_event):
+        """
+        Append one event under the journal lock.
+        `make_event` receives the next free ID so allocation and append are atomic.
+        """
+        with locked(self.journal_path):
+            event = make_event(self._allocate_id)
+            with open(self.journal_path, 'a') as f:
+                f.write(json.dumps(event) + "\n")
+                f.flush()
+                self._unsynced += 1
+                if self._unsynced >= self.fsync_every:
+                    os.fsync(f.fileno())
+                    self._unsynced = 0
+
+        self._dirty = True
+        self.refresh()
+        if time.monotonic() - self._last_render >= self.render_interval:
+            self._save()
+        return event
+
+    def _allocate_id(self) -> int:
+        """Monotonic ID counter. Must be called with the journal lock held."""
+        try:
+            with open(self.seq_path, 'r') as f:
+                last_id = int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            # Missing or unreadable counter: recover from the journal
+            self.refresh()
+            last_id = max(self._index, default=0)
+
+        next_id = last_id + 1
+        tmp_path = f"{self.seq_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(str(next_id))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.seq_path)
+        return next_id
+
+    def flush(self):
+        """fsync pending journal writes and regenerate the Markdown table."""
+        if self._unsynced and os.path.exists(self.journal_path):
+            with open(self.journal_path, 'a') as f:
+                os.fsync(f.fileno())
+            self._unsynced = 0
+        if self._dirty:
+            self.refresh()
+            self._save()
+
+    def _markdown_is_stale(self) -> bool:
+        """True if the journal has events the Markdown table may not show yet."""
+        if not os.path.exists(self.journal_path):
+            return False
         if not os.path.exists(self.filepath):
-            return []
-        
+            return True
+        return os.stat(self.journal_path).st_mtime_ns > os.stat(self.filepath).st_mtime_ns
+
+    def _migrate_markdown(self):
+        """One-time import of an existing open_questions.md table into the journal."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        with locked(self.journal_path):
+            if os.path.exists(self.journal_path):
+                return  # Another process migrated first
+            events = []
+            for item in self._load_markdown():
+                events.append({"event": "add", **{k: v for k, v in item.items() if k != "answer"}})
+                if 'Resolved' in item["status"]:
+                    events.append({"event": "resolve", "id": item["id"], "status": item["status"], "answer": item["answer"]})
+            with open(self.journal_path, 'w') as f:
+                f.writelines(json.dumps(e) + "\n" for e in events)
+            with open(self.seq_path, 'w') as f:
+                f.write(str(max((e["id"] for e in events), default=0)))
+
+    def _load_markdown(self) -> List[Dict]:
+        """Parses the Markdown table(s) into a list of dicts, using the header row for column names."""
         items = []
         try:
             with open(self.filepath, 'r') as f:
                 content = f.read()
             
-            # Parse table rows (skip header and separator)
-            lines = content.strip().split('\n')
-            for line in lines:
-                if line.startswith('|') and not line.startswith('| ID') and '---' not in line:
-                    parts = [p.strip() for p in line.split('|')[1:-1]]  # Remove first/last empty
-                    if len(parts) >= 4:
-                        items.append({
-                            "id": int(parts[0]),
-                            "question": parts[1],
-                            "status": parts[2],
-                            "context": parts[3],
-                            "created_at": parts[4] if len(parts) > 4 else ""
-                        })
+            columns: List[str] = []
+            for line in content.strip().split('\n'):
+                if not line.startswith('|') or '---' in line:
+                    continue
+                parts = [p.strip() for p in line.split('|')[1:-1]]  # Remove first/last empty
+                if parts and not re.fullmatch(r'\d+', parts[0]):
+                    columns = [c.lower() for c in parts]  # Header row (or placeholder row)
+                    continue
+                row = dict(zip(columns, parts))
+                resolved = 'answer' in row
+                items.append({
+                    "id": int(parts[0]),
+                    "question": row.get("question", ""),
+                    "status": row.get("status") or ("✅ Resolved" if resolved else "🟡 Open"),
+                    "context": row.get("context", ""),
+                    "created_at": row.get("created", ""),
+                    "answer": row.get("answer", "")
+                })
         except Exception as e:
             console.print(f"[yellow]Warning: Could not load {self.filepath}: {e}[/yellow]")
         return items
 
     def _save(self):
-        """Saves items as a Markdown table."""
+        """Regenerates the Markdown table from the in-memory index."""
         os.makedirs(self.output_dir, exist_ok=True)
         
         lines = [
@@ -55,37 +207,49 @@ class FollowUpManager:
             "| ID | Question | Status | Context | Created |",
             "|----|----------|--------|---------|---------|"
         ]
-        for item in self.items:
+        for item in sorted(self._index.values(), key=lambda i: i['id']):
             lines.append(f"| {item['id']} | {item['question']} | {item['status']} | {item.get('context', '')} | {item.get('created_at', '')} |")
         
-        with open(self.filepath, 'w') as f:
+        tmp_path = f"{self.filepath}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
             f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, self.filepath)
+        self._dirty = False
+        self._last_render = time.monotonic()
+
+    # ─────────────────────────────────────────────────────────────
+    # PUBLIC API
+    # ─────────────────────────────────────────────────────────────
 
     def add_item(self, question: str, context: str = ""):
         """Adds a new question to the parking lot."""
-        item = {
-            "id": len(self.items) + 1,
+        event = self._append(lambda next_id: {
+            "event": "add",
+            "id": next_id(),
             "question": question,
             "status": "🟡 Open",
             "context": context,
             "created_at": datetime.datetime.now().strftime("%Y-%m-%d")
-        }
-        self.items.append(item)
-        self._save()
+        })
         console.print(f"[green]✓ Parked question:[/green] '{question}'")
+        return self._index.get(event["id"])
 
     def get_open_items(self) -> List[Dict]:
-        return [i for i in self.items if 'Open' in i.get('status', '')]
+        self.refresh()
+        return [i for i in self._index.values() if 'Open' in i.get('status', '')]
 
     def resolve_item(self, item_id: int, answer: str):
         """Marks an item as resolved."""
-        for item in self.items:
-            if item['id'] == item_id:
-                item['status'] = '✅ Resolved'
-                item['answer'] = answer
-                self._save()
-                return item
-        return None
+        self.refresh()
+        if item_id not in self._index:
+            return None
+        self._append(lambda _: {
+            "event": "resolve",
+            "id": item_id,
+            "status": "✅ Resolved",
+            "answer": answer
+        })
+        return self._index[item_id]
 
     def prompt_for_updates(self) -> str:
         """
@@ -112,6 +276,7 @@ class FollowUpManager:
                 updates.append(f"Q: {item['question']}\nA: {ans} (Resolved)")
                 console.print("[green]✓ Marked as resolved.[/green]")
         
+        self.flush()
         if updates:
             return "\n\n*** UPDATES TO FOLLOW-UP ITEMS ***\n" + "\n".join(updates) + "\n"
         return ""
@@ -3,6 +3,7 @@
 # Enhanced with: Guardrails, Context Management, HITL, Prompt-Ops
 
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from google import genai
 from google.genai import types
 from rich.console import Console
@@ -90,6 +91,7 @@ class GenAIBaseAgent:
         self.approval_gate = ApprovalGate(auto_approve=not require_approval)
         self.context_manager = ContextManager()
         self.token_budget = TokenBudget()
+        self._background = ThreadPoolExecutor(max_workers=int(os.getenv("GENAI_MAX_WORKERS", "4")))
         
         console.print(f"[green]Agent Ready. Model: {self.model_version}[/green]")
         if enable_guardrails:
@@ -179,6 +181,33 @@ class GenAIBaseAgent:
         else:
             return ""  # Rejected
 
+    def generate_for_review(
+        self,
+        prompt: str,
+        action_description: str,
+        target_path: str = None,
+        **kwargs
+    ) -> Future:
+        """
+        Generate in the background and queue the output for batched approval.
+        The agent never waits on the reviewer; approved items are written to
+        target_path as soon as they are approved.
+
+        Returns:
+            Future resolving to the approval queue item ID (None if generation failed)
+        """
+        def _run():
+            output = self.generate(prompt, **kwargs)
+            if not output:
+                return None
+            return self.approval_gate.submit(action_description, output, target_path=target_path)
+
+        return self._background.submit(_run)
+
+    def review_pending_approvals(self) -> int:
+        """Review every queued output in one batch (CLI)."""
+        return self.approval_gate.review_pending()
+
     def load_context(
         self,
         paths: list,
@@ -6,13 +6,24 @@ Validates AI outputs to prevent:
 - PII exposure (emails, SSNs, phone numbers)
 - Excessive output length
 - Invalid structured data (JSON, YAML)
+
+Also provides the Human-in-the-Loop ApprovalGate and its batched ApprovalQueue.
 """
 
 import re
 import os
 import json
-from typing import Tuple, List, Dict, Any
+import html
+import difflib
+import datetime
+import itertools
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple, List, Dict, Any, Callable
+from urllib.parse import parse_qs
 from rich.console import Console
+from rich.table import Table
 
 console = Console()
 
@@ -148,11 +159,20 @@ class ApprovalGate:
     """
     Human-in-the-Loop approval gate for critical actions.
     Use before saving files, creating Jira tickets, or other side effects.
+
+    Two modes:
+    - require_approval(): blocking, one action at a time.
+    - submit() + review_pending(): non-blocking, items queue up while the
+      agent keeps generating and the reviewer decides in batches.
+
+    Every decision is appended to a JSONL audit log on disk.
     """
 
-    def __init__(self, auto_approve: bool = False):
+    def __init__(self, auto_approve: bool = False, audit_log_path: str = None):
         self.auto_approve = auto_approve
-        self.approval_log = []
+        self.audit_log_path = audit_log_path or os.path.join("outputs", "approval_log.jsonl")
+        self._log_lock = threading.Lock()
+        self.queue = ApprovalQueue(self)
 
     def require_approval(
         self,
@@ -200,15 +220,299 @@ class ApprovalGate:
         
         return approved
 
-    def _log_decision(self, action: str, decision: str):
-        """Log approval decisions for audit trail."""
-        import datetime
-        self.approval_log.append({
+    def submit(
+        self,
+        action: str,
+        content: str,
+        target_path: str = None,
+        on_approve: Callable[[str], Any] = None
+    ) -> int:
+        """
+        Queue an action for batched review and return immediately.
+
+        Args:
+            action: Description of what will happen
+            content: The content being approved
+            target_path: File written as soon as the item is approved
+            on_approve: Optional callback invoked with the content on approval
+
+        Returns:
+            The queue item ID
+        """
+        item_id = self.queue.submit(action, content, target_path, on_approve)
+        if self.auto_approve:
+            self.queue.decide([item_id], approved=True, decision="auto-approved")
+        return item_id
+
+    def review_pending(self) -> int:
+        """Interactively review all queued items. Returns the number decided."""
+        return self.queue.review()
+
+    def _log_decision(self, action: str, decision: str, target_path: str = None):
+        """Append an approval decision to the on-disk audit trail."""
+        entry = {
             "timestamp": datetime.datetime.now().isoformat(),
             "action": action,
             "decision": decision
-        })
+        }
+        if target_path:
+            entry["target_path"] = target_path
+
+        with self._log_lock:
+            os.makedirs(os.path.dirname(self.audit_log_path) or ".", exist_ok=True)
+            with open(self.audit_log_path, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
 
     def get_audit_log(self) -> List[Dict]:
         """Return the approval audit log."""
-        return self.approval_log
+        if not os.path.exists(self.audit_log_path):
+            return []
+        with self._log_lock, open(self.audit_log_path, 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    @property
+    def approval_log(self) -> List[Dict]:
+        """Backwards-compatible alias for get_audit_log()."""
+        return self.get_audit_log()
+
+
+class ApprovalQueue:
+    """
+    Thread-safe queue of actions awaiting human review.
+
+    Generation threads call submit() and move on; the reviewer approves or
+    rejects pending items in batches from the CLI (review()) or a local web
+    page (serve()). Approved items are flushed to disk immediately.
+    """
+
+    def __init__(self, gate: ApprovalGate):
+        self.gate = gate
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._server = None
+        self._token = None
+
+    def submit(
+        self,
+        action: str,
+        content: str,
+        target_path: str = None,
+        on_approve: Callable[[str], Any] = None
+    ) -> int:
+        """Add an item to the queue. Never blocks on the reviewer."""
+        with self._lock:
+            item_id = next(self._ids)
+            self._pending[item_id] = {
+                "id": item_id,
+                "action": action,
+                "content": content,
+                "target_path": target_path,
+                "on_approve": on_approve,
+                "submitted_at": datetime.datetime.now().isoformat()
+            }
+        return item_id
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Snapshot of pending items in submission order."""
+        with self._lock:
+            return list(self._pending.values())
+
+    def diff(self, item: Dict[str, Any]) -> str:
+        """Unified diff of the item against the current target file (if any)."""
+        target = item.get("target_path")
+        current = ""
+        if target and os.path.exists(target):
+            with open(target, 'r') as f:
+                current = f.read()
+        return "".join(difflib.unified_diff(
+            current.splitlines(keepends=True),
+            item["content"].splitlines(keepends=True),
+            fromfile=f"a/{target or 'current'}",
+            tofile=f"b/{target or 'proposed'}"
+        ))
+
+    def decide(self, item_ids: List[int], approved: bool, decision: str = None) -> List[Dict[str, Any]]:
+        """
+        Approve or reject a batch of items.
+        Approved items are flushed right away; every decision is audited.
+        If a write or the audit fails, that item and the rest of the batch
+        go back on the queue before the error is raised.
+        """
+        with self._lock:
+            items = [self._pending.pop(i) for i in item_ids if i in self._pending]
+
+        decision = decision or ("approved" if approved else "rejected")
+        for done, item in enumerate(items):
+            try:
+                if approved:
+                    self._flush(item)
+                self.gate._log_decision(item["action"], decision, item.get("target_path"))
+            except BaseException:
+                with self._lock:
+                    self._pending.update((i["id"], i) for i in items[done:])
+                    self._pending = dict(sorted(self._pending.items()))
+                raise
+        return items
+
+    def _flush(self, item: Dict[str, Any]):
+        """Write an approved item to its target and run its callback."""
+        target = item.get("target_path")
+        if target:
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            tmp_path = f"{target}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(item["content"])
+            os.replace(tmp_path, target)
+        if item.get("on_approve"):
+            item["on_approve"](item["content"])
+
+    # ─────────────────────────────────────────────────────────────
+    # CLI REVIEW
+    # ─────────────────────────────────────────────────────────────
+
+    def review(self) -> int:
+        """
+        Batch review loop.
+
+        Commands:
+            a            approve all pending
+            r            reject all pending
+            y 1,3        approve the listed IDs
+            n 2          reject the listed IDs
+            v 3          show the diff for an item
+            q            stop reviewing (items stay queued)
+        """
+        decided = 0
+        while True:
+            items = self.pending()
+            if not items:
+                break
+
+            table = Table(title=f"Pending Approvals ({len(items)})")
+            table.add_column("ID", style="cyan")
+            table.add_column("Action")
+            table.add_column("Target", style="dim")
+            table.add_column("Size", justify="right")
+            for item in items:
+                table.add_row(str(item["id"]), item["action"], item.get("target_path") or "-", str(len(item["content"])))
+            console.print(table)
+
+            response = console.input("[bold]a=approve all, r=reject all, y/n <ids>, v <id>, q=later: [/bold]").strip().lower()
+            command, _, arg = response.partition(" ")
+            ids = [int(x) for x in re.findall(r'\d+', arg)]
+
+            if command == 'q':
+                break
+            elif command == 'a':
+                decided += len(self.decide([i["id"] for i in items], approved=True))
+            elif command == 'r':
+                decided += len(self.decide([i["id"] for i in items], approved=False))
+            elif command in ('y', 'n') and ids:
+                decided += len(self.decide(ids, approved=(command == 'y')))
+            elif command == 'v' and ids:
+                item = next((i for i in items if i["id"] == ids[0]), None)
+                if item:
+                    console.print(self.diff(item) or item["content"])
+            else:
+                console.print("[yellow]Unrecognised command.[/yellow]")
+
+        return decided
+
+    # ─────────────────────────────────────────────────────────────
+    # LOCAL WEB REVIEW
+    # ─────────────────────────────────────────────────────────────
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8765) -> str:
+        """
+        Start a local review page in a background thread.
+        Returns the URL. Generation continues on the calling thread.
+        """
+        if self._server:
+            return f"http://{host}:{self._server.server_address[1]}"
+
+        queue = self
+        # Per-session token: only pages rendered by this server can post decisions
+        self._token = secrets.token_urlsafe(32)
+        allowed_hosts = set()
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _trusted(self) -> bool:
+                # Host blocks DNS rebinding; Origin (when sent) blocks cross-site posts
+                if self.headers.get("Host") not in allowed_hosts:
+                    return False
+                origin = self.headers.get("Origin")
+                return origin is None or origin in {f"http://{h}" for h in allowed_hosts}
+
+            def _forbidden(self):
+                self.send_response(403)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self):
+                if not self._trusted():
+                    return self._forbidden()
+                body = queue._render_html().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                form = parse_qs(self.rfile.read(length).decode("utf-8"))
+                token = form.get("token", [""])[0]
+                if not self._trusted() or not secrets.compare_digest(token, queue._token):
+                    return self._forbidden()
+                # Only the items the reviewer saw: "all" forms carry the rendered IDs
+                ids = [int(i) for i in form.get("id", [])]
+                queue.decide(ids, approved=form.get("decision", [""])[0] == "approve")
+                self.send_response(303)
+                self.send_header("Location", "/")
+                self.end_headers()
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        bound_port = self._server.server_address[1]
+        allowed_hosts.add(f"{host}:{bound_port}")
+        if host in ("127.0.0.1", "::1"):
+            allowed_hosts.add(f"localhost:{bound_port}")
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        url = f"http://{host}:{bound_port}"
+        console.print(f"[green]Approval queue available at {url}[/green]")
+        return url
+
+    def shutdown(self):
+        """Stop the local review page if running."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _render_html(self) -> str:
+        token = f"<input type='hidden' name='token' value='{html.escape(self._token)}'>"
+        rows = []
+        ids = []
+        for item in self.pending():
+            ids.append(f"<input type='hidden' name='id' value='{item['id']}'>")
+            rows.append(
+                f"<section><h3>#{item['id']} {html.escape(item['action'])}</h3>"
+                f"<p><code>{html.escape(item.get('target_path') or '-')}</code></p>"
+                f"<pre>{html.escape(self.diff(item))}</pre>"
+                f"<form method='post'>{token}<input type='hidden' name='id' value='{item['id']}'>"
+                f"<button name='decision' value='approve'>Approve</button> "
+                f"<button name='decision' value='reject'>Reject</button></form></section>"
+            )
+        batch = (
+            f"<form method='post'>{token}{''.join(ids)}"
+            "<button name='decision' value='approve'>Approve all</button> "
+            "<button name='decision' value='reject'>Reject all</button></form>"
+        ) if rows else "<p>No pending items.</p>"
+        return (
+            "<!doctype html><html><head><meta charset='utf-8'>"
+            "<meta http-equiv='refresh' content='10'><title>Approval Queue</title></head>"
+            f"<body><h1>Approval Queue ({len(rows)})</h1>{batch}{''.join(rows)}</body></html>"
+        )
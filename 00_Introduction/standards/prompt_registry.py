@@ -2,50 +2,413 @@
 Prompt Registry and Operations
 
 Provides:
-- Versioned prompt management
+- Versioned prompt management (SQLite-backed, safe for concurrent workers)
+- Compiled {{KEY}} template rendering
+- Stat-first change detection and optional file watching
 - Prompt testing against test cases
 - A/B comparison between prompt versions
 - Evaluation metrics
 """
 
 import os
+import re
 import json
+import sqlite3
+import math
+import time
 import hashlib
-from typing import Dict, List, Optional, Any, Callable
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from statistics import NormalDist
+from typing import Dict, List, Optional, Any, Callable, IO, Tuple
 from pathlib import Path
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
 
+from assertion_engine import AssertionEngine
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # Optional: fall back to stat polling
+    Observer = None
+    FileSystemEventHandler = object
+
 console = Console()
 
 
+class TemplateError(ValueError):
+    """Raised when a template is rendered with missing or unexpected variables."""
+
+
+class CompiledTemplate:
+    """
+    A prompt template parsed once into literal and slot segments.
+
+    Placeholders use the {{KEY}} syntax. Rendering fills the slots and joins
+    the segments in one pass, so the cost does not grow with the number of
+    placeholders and substituted values are never re-scanned for {{...}}.
+    """
+
+    SLOT_PATTERN = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+    def __init__(self, source: str):
+        self.source = source
+        self._parts: List[str] = []
+        self._slots: List[Tuple[int, str]] = []  # (index into _parts, variable name)
+
+        pos = 0
+        for match in self.SLOT_PATTERN.finditer(source):
+            self._parts.append(source[pos:match.start()])
+            self._slots.append((len(self._parts), match.group(1)))
+            self._parts.append(match.group(0))  # Left in place when a variable is missing
+            pos = match.end()
+        self._parts.append(source[pos:])
+
+        self.variables = frozenset(name for _, name in self._slots)
+
+    def validate(self, variables: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Report template variables not supplied and supplied variables not used."""
+        return {
+            "missing": sorted(self.variables - variables.keys()),
+            "extra": sorted(variables.keys() - self.variables)
+        }
+
+    def _filled(self, variables: Dict[str, Any], strict: bool) -> List[str]:
+        if strict:
+            problems = self.validate(variables)
+            if problems["missing"] or problems["extra"]:
+                raise TemplateError(
+                    f"Template variables mismatch (missing: {problems['missing']}, extra: {problems['extra']})"
+                )
+        parts = list(self._parts)
+        for index, name in self._slots:
+            if name in variables:
+                parts[index] = str(variables[name])
+        return parts
+
+    def render(self, variables: Dict[str, Any], strict: bool = False) -> str:
+        """
+        Render the template.
+
+        Args:
+            variables: Values keyed by placeholder name (without braces)
+            strict: Raise TemplateError on missing or extra variables.
+                    Otherwise unknown placeholders are left untouched.
+        """
+        return "".join(self._filled(variables, strict))
+
+    def render_to(self, buffer: IO[str], variables: Dict[str, Any], strict: bool = False) -> IO[str]:
+        """Stream the rendered template into a writable text buffer."""
+        for part in self._filled(variables, strict):
+            buffer.write(part)
+        return buffer
+
+
+_TEMPLATE_CACHE: "OrderedDict[str, CompiledTemplate]" = OrderedDict()
+_TEMPLATE_CACHE_SIZE = 128
+_TEMPLATE_CACHE_LOCK = threading.Lock()
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def compile_template(source: str, key: str = None) -> CompiledTemplate:
+    """
+    Compile a template, reusing the cached form for identical content.
+
+    Args:
+        source: Template text
+        key: Precomputed content hash (e.g. from the registry's file index)
+    """
+    key = key or _content_hash(source.encode("utf-8"))
+    with _TEMPLATE_CACHE_LOCK:
+        template = _TEMPLATE_CACHE.get(key)
+        if template is not None:
+            _TEMPLATE_CACHE.move_to_end(key)
+            return template
+
+    template = CompiledTemplate(source)
+    with _TEMPLATE_CACHE_LOCK:
+        _TEMPLATE_CACHE[key] = template
+        if len(_TEMPLATE_CACHE) > _TEMPLATE_CACHE_SIZE:
+            _TEMPLATE_CACHE.popitem(last=False)
+    return template
+
+
+def invalidate_templates(keys: List[str] = None):
+    """Drop compiled templates by content hash (or all of them)."""
+    with _TEMPLATE_CACHE_LOCK:
+        if keys is None:
+            _TEMPLATE_CACHE.clear()
+        for key in keys or []:
+            _TEMPLATE_CACHE.pop(key, None)
+
+
+def load_template(path: str) -> CompiledTemplate:
+    """Read and compile a template file (cached by file content hash)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return compile_template(f.read())
+
+
+def render_template(source: str, variables: Dict[str, Any], strict: bool = False) -> str:
+    """Drop-in replacement for chained str.replace("{{KEY}}", value) calls."""
+    return compile_template(source).render(variables, strict=strict)
+
+
+class SQLitePromptStore:
+    """
+    SQLite (WAL mode) storage backend for the PromptRegistry.
+
+    Registration is a single transaction, lookups by name/version/tag are
+    indexed, and multiple pipeline workers (threads or processes) can read
+    and write concurrently without clobbering each other.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS prompts (
+            name        TEXT PRIMARY KEY,
+            latest      TEXT NOT NULL,
+            description TEXT DEFAULT '',
+            test_cases  TEXT
+        );
+        CREATE TABLE IF NOT EXISTS prompt_versions (
+            name       TEXT NOT NULL REFERENCES prompts(name),
+            version    TEXT NOT NULL,
+            path       TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            hash       TEXT,
+            PRIMARY KEY (name, version)
+        );
+        CREATE TABLE IF NOT EXISTS prompt_tags (
+            name    TEXT NOT NULL,
+            version TEXT NOT NULL,
+            tag     TEXT NOT NULL,
+            PRIMARY KEY (name, version, tag)
+        );
+        CREATE TABLE IF NOT EXISTS file_index (
+            path     TEXT PRIMARY KEY,
+            size     INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            hash     TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_versions_created ON prompt_versions(name, created_at);
+        CREATE INDEX IF NOT EXISTS idx_tags_tag ON prompt_tags(tag);
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn.executescript(self.SCHEMA)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not shareable)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT, rolled back on error."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM prompts LIMIT 1").fetchone() is None
+
+    def upsert_version(
+        self,
+        name: str,
+        version: str,
+        path: str,
+        file_hash: str,
+        description: str = "",
+        test_cases: str = None,
+        tags: List[str] = None,
+        created_at: str = None,
+        make_latest: bool = True
+    ):
+        """Atomically register a prompt version (and the prompt, if new)."""
+        with self.transaction() as conn:
+            self._write_version(conn, name, version, path, file_hash, description,
+                                test_cases, tags, created_at, make_latest)
+
+    def seed_versions(self, versions: List[Dict[str, Any]]) -> bool:
+        """
+        Import many versions (upsert_version keyword dicts) in ONE transaction,
+        only if the database is still empty. A crash mid-import leaves it
+        empty, so the next start imports again. Returns False if already seeded.
+        """
+        with self.transaction() as conn:
+            if conn.execute("SELECT 1 FROM prompts LIMIT 1").fetchone() is not None:
+                return False  # Another worker seeded first
+            for version in versions:
+                self._write_version(conn, **version)
+        return True
+
+    @staticmethod
+    def _write_version(conn, name, version, path, file_hash, description="", test_cases=None,
+                       tags=None, created_at=None, make_latest=True):
+        created_at = created_at or datetime.now().isoformat()
+        conn.execute(
+            "INSERT INTO prompts (name, latest, description, test_cases) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(name) DO NOTHING",
+            (name, version, description, test_cases)
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO prompt_versions (name, version, path, created_at, hash) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (name, version, path, created_at, file_hash)
+        )
+        if make_latest:
+            conn.execute("UPDATE prompts SET latest = ? WHERE name = ?", (version, name))
+        conn.executemany(
+            "INSERT OR IGNORE INTO prompt_tags (name, version, tag) VALUES (?, ?, ?)",
+            [(name, version, tag) for tag in (tags or [])]
+        )
+
+    def get_prompt_info(self, name: str) -> Optional[sqlite3.Row]:
+        return self.conn.execute("SELECT * FROM prompts WHERE name = ?", (name,)).fetchone()
+
+    def get_version(self, name: str, version: str) -> Optional[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT * FROM prompt_versions WHERE name = ? AND version = ?", (name, version)
+        ).fetchone()
+
+    def list_prompts(self) -> List[sqlite3.Row]:
+        return self.conn.execute("SELECT * FROM prompts ORDER BY rowid").fetchall()
+
+    def list_versions(self, name: str = None) -> List[sqlite3.Row]:
+        if name is None:
+            return self.conn.execute("SELECT * FROM prompt_versions ORDER BY name, created_at").fetchall()
+        return self.conn.execute(
+            "SELECT * FROM prompt_versions WHERE name = ? ORDER BY created_at", (name,)
+        ).fetchall()
+
+    def find_by_tag(self, tag: str) -> List[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT v.* FROM prompt_tags t JOIN prompt_versions v "
+            "ON v.name = t.name AND v.version = t.version WHERE t.tag = ? ORDER BY v.name, v.created_at",
+            (tag,)
+        ).fetchall()
+
+    def get_file_entry(self, path: str) -> Optional[sqlite3.Row]:
+        return self.conn.execute("SELECT * FROM file_index WHERE path = ?", (path,)).fetchone()
+
+    def put_file_entry(self, path: str, size: int, mtime_ns: int, file_hash: str):
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO file_index (path, size, mtime_ns, hash) VALUES (?, ?, ?, ?)",
+                (path, size, mtime_ns, file_hash)
+            )
+
+    def set_version_hash(self, name: str, version: str, file_hash: str):
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE prompt_versions SET hash = ? WHERE name = ? AND version = ?", (file_hash, name, version)
+            )
+
+    def tags_for(self, name: str, version: str) -> List[str]:
+        rows = self.conn.execute(
+            "SELECT tag FROM prompt_tags WHERE name = ? AND version = ? ORDER BY tag", (name, version)
+        ).fetchall()
+        return [r["tag"] for r in rows]
+
+
 class PromptRegistry:
     """
     Central registry for versioned prompts.
     Treats prompts as code: versioned, tested, evaluated.
+
+    Storage is SQLite (prompts/registry.db). prompts/registry.json is kept as
+    a human-reviewable export: it seeds an empty database and is rewritten
+    by export_json().
     """
 
-    def __init__(self, registry_path: str = None, prompts_base: str = None):
+    def __init__(self, registry_path: str = None, prompts_base: str = None, db_path: str = None):
         self.registry_path = registry_path or "prompts/registry.json"
         self.prompts_base = prompts_base or "."
-        self.registry = self._load_registry()
-
-    def _load_registry(self) -> Dict:
-        """Load the prompt registry from JSON."""
-        if os.path.exists(self.registry_path):
-            try:
-                with open(self.registry_path, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                console.print(f"[yellow]Warning: Invalid registry file, starting fresh[/yellow]")
-        return {"prompts": {}}
-
-    def _save_registry(self):
-        """Save the registry to disk."""
-        os.makedirs(os.path.dirname(self.registry_path) or ".", exist_ok=True)
-        with open(self.registry_path, 'w') as f:
-            json.dump(self.registry, f, indent=2)
+        self.db_path = db_path or os.path.splitext(self.registry_path)[0] + ".db"
+        self.store = SQLitePromptStore(self.db_path)
+        self._invalidation_hooks: List[Callable[[Dict[str, Any]], None]] = []
+        if self.store.is_empty():
+            self._import_json()
+
+    def _import_json(self):
+        """Seed the database from the JSON registry (one-time migration)."""
+        if not os.path.exists(self.registry_path):
+            return
+        try:
+            with open(self.registry_path, 'r') as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            console.print(f"[yellow]Warning: Invalid registry file, starting fresh[/yellow]")
+            return
+
+        self.store.seed_versions([
+            {
+                "name": name,
+                "version": version,
+                "path": version_info["path"],
+                "file_hash": version_info.get("hash"),
+                "description": info.get("description", ""),
+                "test_cases": info.get("test_cases"),
+                "tags": version_info.get("tags"),
+                "created_at": version_info.get("created_at"),
+                "make_latest": version == info.get("latest")
+            }
+            for name, info in data.get("prompts", {}).items()
+            for version, version_info in info.get("versions", {}).items()
+        ])
+
+    @property
+    def registry(self) -> Dict:
+        """The registry as the legacy registry.json structure."""
+        prompts = {}
+        for row in self.store.list_prompts():
+            prompts[row["name"]] = {
+                "latest": row["latest"],
+                "description": row["description"],
+                "versions": {},
+                "test_cases": row["test_cases"]
+            }
+        for row in self.store.list_versions():
+            entry = {"path": row["path"], "created_at": row["created_at"]}
+            if row["hash"]:
+                entry["hash"] = row["hash"]
+            tags = self.store.tags_for(row["name"], row["version"])
+            if tags:
+                entry["tags"] = tags
+            prompts[row["name"]]["versions"][row["version"]] = entry
+        return {"prompts": prompts}
+
+    def export_json(self, path: str = None) -> str:
+        """Write the registry to JSON for review (atomic replace)."""
+        path = path or self.registry_path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.registry, f, indent=4)
+            f.write("\n")
+        os.replace(tmp_path, path)
+        return path
 
     def register_prompt(
         self,
@@ -53,27 +416,31 @@ class PromptRegistry:
         file_path: str,
         version: str = "v1",
         description: str = "",
-        test_cases_path: str = None
+        test_cases_path: str = None,
+        tags: List[str] = None
     ):
-        """Register a new prompt or version."""
-        if name not in self.registry["prompts"]:
-            self.registry["prompts"][name] = {
-                "latest": version,
-                "description": description,
-                "versions": {},
-                "test_cases": test_cases_path
-            }
-        
-        self.registry["prompts"][name]["versions"][version] = {
-            "path": file_path,
-            "created_at": datetime.now().isoformat(),
-            "hash": self._hash_file(file_path)
-        }
-        self.registry["prompts"][name]["latest"] = version
-        
-        self._save_registry()
+        """Register a new prompt or version (single atomic transaction)."""
+        self.store.upsert_version(
+            name, version, file_path, self._hash_file(file_path),
+            description=description,
+            test_cases=test_cases_path,
+            tags=tags
+        )
         console.print(f"[green]Registered {name} {version}[/green]")
 
+    def _resolve_version(self, name: str, version: str) -> sqlite3.Row:
+        prompt_info = self.store.get_prompt_info(name)
+        if prompt_info is None:
+            raise ValueError(f"Prompt '{name}' not found in registry")
+
+        if version == "latest":
+            version = prompt_info["latest"]
+
+        version_info = self.store.get_version(name, version)
+        if version_info is None:
+            raise ValueError(f"Version '{version}' not found for prompt '{name}'")
+        return version_info
+
     def get_prompt(self, name: str, version: str = "latest") -> str:
         """
         Get a prompt by name and version.
@@ -85,18 +452,7 @@ class PromptRegistry:
         Returns:
             The prompt content as a string
         """
-        if name not in self.registry["prompts"]:
-            raise ValueError(f"Prompt '{name}' not found in registry")
-        
-        prompt_info = self.registry["prompts"][name]
-        
-        if version == "latest":
-            version = prompt_info["latest"]
-        
-        if version not in prompt_info["versions"]:
-            raise ValueError(f"Version '{version}' not found for prompt '{name}'")
-        
-        file_path = prompt_info["versions"][version]["path"]
+        file_path = self._resolve_version(name, version)["path"]
         full_path = os.path.join(self.prompts_base, file_path)
         
         if not os.path.exists(full_path):
@@ -105,82 +461,415 @@ class PromptRegistry:
         with open(full_path, 'r') as f:
             return f.read()
 
+    def get_template(self, name: str, version: str = "latest") -> CompiledTemplate:
+        """
+        Get a prompt as a compiled template, ready for render().
+        Unchanged files (same size and mtime) are served from the compiled cache
+        without being re-read.
+        """
+        file_path = self._resolve_version(name, version)["path"]
+        file_hash = self._hash_file(file_path)
+        with _TEMPLATE_CACHE_LOCK:
+            template = _TEMPLATE_CACHE.get(file_hash)
+        if template is not None:
+            return template
+        return compile_template(self.get_prompt(name, version), key=file_hash)
+
     def list_prompts(self) -> List[Dict]:
         """List all registered prompts with their versions."""
         prompts = []
-        for name, info in self.registry["prompts"].items():
+        for row in self.store.list_prompts():
             prompts.append({
-                "name": name,
-                "latest": info["latest"],
-                "versions": list(info["versions"].keys()),
-                "description": info.get("description", "")
+                "name": row["name"],
+                "latest": row["latest"],
+                "versions": [v["version"] for v in self.store.list_versions(row["name"])],
+                "description": row["description"] or ""
             })
         return prompts
 
+    def find_by_tag(self, tag: str) -> List[Dict]:
+        """All prompt versions carrying a tag (e.g. "production")."""
+        return [
+            {"name": r["name"], "version": r["version"], "path": r["path"], "created_at": r["created_at"]}
+            for r in self.store.find_by_tag(tag)
+        ]
+
+    def get_history(self, name: str) -> List[Dict]:
+        """Version history of a prompt, oldest first."""
+        if self.store.get_prompt_info(name) is None:
+            raise ValueError(f"Prompt '{name}' not found in registry")
+        return [
+            {
+                "version": r["version"],
+                "path": r["path"],
+                "created_at": r["created_at"],
+                "hash": r["hash"],
+                "tags": self.store.tags_for(name, r["version"])
+            }
+            for r in self.store.list_versions(name)
+        ]
+
     def _hash_file(self, path: str) -> str:
-        """Generate a hash of a file's contents."""
-        full_path = os.path.join(self.prompts_base, path)
-        if os.path.exists(full_path):
-            with open(full_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()[:8]
-        return "unknown"
+        """
+        BLAKE2 hash of a file's contents, via the persisted stat index.
+        Size and mtime are checked first; the file is only re-read and
+        re-hashed when they differ from the indexed values.
+        """
+        full_path = os.path.abspath(os.path.join(self.prompts_base, path))
+        try:
+            st = os.stat(full_path)
+        except FileNotFoundError:
+            return "unknown"
+
+        entry = self.store.get_file_entry(full_path)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["hash"]
+
+        digest = hashlib.blake2b(digest_size=16)
+        with open(full_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        file_hash = digest.hexdigest()
+        self.store.put_file_entry(full_path, st.st_size, st.st_mtime_ns, file_hash)
+        return file_hash
+
+    def _matches_registered(self, row: sqlite3.Row, current_hash: str) -> bool:
+        """
+        Compare against the registered hash. A legacy 8-char MD5 hash is
+        checked once by reading the file; on a match the version is upgraded
+        to the BLAKE2 hash so later checks stay stat-only.
+        """
+        registered_hash = row["hash"]
+        if registered_hash and len(registered_hash) == 8 and current_hash != "unknown":
+            with open(os.path.join(self.prompts_base, row["path"]), 'rb') as f:
+                if hashlib.md5(f.read()).hexdigest()[:8] != registered_hash:
+                    return False
+            self.store.set_version_hash(row["name"], row["version"], current_hash)
+            return True
+        return current_hash == registered_hash
 
     def check_for_changes(self) -> List[Dict]:
-        """Check if any registered prompts have changed since registration."""
+        """
+        Check if any registered prompts have changed since registration.
+        Only files whose size or mtime moved are re-hashed.
+        """
         changes = []
-        for name, info in self.registry["prompts"].items():
-            for version, version_info in info["versions"].items():
-                current_hash = self._hash_file(version_info["path"])
-                if current_hash != version_info.get("hash"):
-                    changes.append({
-                        "name": name,
-                        "version": version,
-                        "original_hash": version_info.get("hash"),
-                        "current_hash": current_hash
-                    })
+        for row in self.store.list_versions():
+            current_hash = self._hash_file(row["path"])
+            if not self._matches_registered(row, current_hash):
+                changes.append({
+                    "name": row["name"],
+                    "version": row["version"],
+                    "original_hash": row["hash"],
+                    "current_hash": current_hash
+                })
         return changes
 
+    def add_invalidation_hook(self, hook: Callable[[Dict[str, Any]], None]):
+        """
+        Register a callback run when watch() sees a prompt file change,
+        e.g. to drop response caches keyed by prompt hash.
+        """
+        self._invalidation_hooks.append(hook)
+
+    def _refresh(self, full_path: str, seen: Dict[str, str]):
+        """
+        Re-hash a changed file and, if it differs from the hash this watcher
+        last saw (`seen`), drop its compiled template and notify hooks.
+        The shared file index is not used for the comparison: another
+        caller may already have re-hashed the file.
+        """
+        rel_path = os.path.relpath(full_path, self.prompts_base)
+        new_hash = self._hash_file(rel_path)
+        old_hash = seen.get(full_path)
+        seen[full_path] = new_hash
+        if old_hash is None or new_hash == old_hash:
+            return
+
+        invalidate_templates([old_hash])
+        event = {"path": rel_path, "old_hash": old_hash, "new_hash": new_hash}
+        console.print(f"[yellow]Prompt changed: {rel_path}[/yellow]")
+        for hook in self._invalidation_hooks:
+            hook(event)
+
+    def _remember(self, paths, seen: Dict[str, str]):
+        """Record the current hash of newly watched files as this watcher's baseline."""
+        for path in paths:
+            if path not in seen:
+                seen[path] = self._hash_file(os.path.relpath(path, self.prompts_base))
+
+    def _watched_paths(self) -> set:
+        return {
+            os.path.abspath(os.path.join(self.prompts_base, row["path"]))
+            for row in self.store.list_versions()
+        }
+
+    def watch(self, interval: float = 1.0) -> threading.Event:
+        """
+        Watch registered prompt files in a background thread.
+
+        Uses watchdog (inotify/FSEvents) when installed, otherwise polls
+        os.stat every `interval` seconds. The registry is re-read every
+        `interval` seconds, so prompts registered later are watched too.
+        Set the returned Event to stop.
+        """
+        stop = threading.Event()
+        seen: Dict[str, str] = {}
+
+        if Observer is not None:
+            registry = self
+            watched = self._watched_paths()
+            self._remember(watched, seen)
+            scheduled = set()
+
+            class _Handler(FileSystemEventHandler):
+                def on_modified(self, event):
+                    if os.path.abspath(event.src_path) in watched:
+                        registry._refresh(os.path.abspath(event.src_path), seen)
+
+                on_created = on_modified
+
+            observer = Observer()
+
+            def _schedule():
+                for directory in {os.path.dirname(p) for p in watched} - scheduled:
+                    if os.path.isdir(directory):
+                        observer.schedule(_Handler(), directory, recursive=False)
+                        scheduled.add(directory)
+
+            _schedule()
+            observer.start()
+
+            def _track_registry():
+                # Each thread uses its own SQLite connection (see SQLitePromptStore.conn)
+                while not stop.wait(interval):
+                    current = self._watched_paths()
+                    self._remember(current, seen)
+                    watched.intersection_update(current)
+                    watched.update(current)
+                    _schedule()
+                observer.stop()
+                observer.join()
+
+            threading.Thread(target=_track_registry, daemon=True).start()
+            return stop
+
+        def _poll():
+            # Each thread uses its own SQLite connection (see SQLitePromptStore.conn)
+            stats = {}
+            while not stop.is_set():
+                current = self._watched_paths()
+                self._remember(current, seen)
+                for path in current:
+                    try:
+                        st = os.stat(path)
+                        signature = (st.st_size, st.st_mtime_ns)
+                    except FileNotFoundError:
+                        signature = None
+                    if path in stats and stats[path] != signature and signature is not None:
+                        self._refresh(path, seen)
+                    stats[path] = signature
+                stop.wait(interval)
+
+        threading.Thread(target=_poll, daemon=True).start()
+        return stop
+
+
+class EvaluationCache:
+    """
+    Persistent cache of generated outputs for PromptEvaluator.
+
+    Keyed by (prompt hash, case input, model) and stored as JSONL, so an
+    interrupted evaluation resumes where it stopped and unchanged cases are
+    never sent to the model twice.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(".prompt_eval_cache", "outputs.jsonl")
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry
+
+    @staticmethod
+    def key(prompt_hash: str, case_input: Any, model: str, sample: int = 0) -> str:
+        parts = [prompt_hash, case_input, model] + ([sample] if sample else [])
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return _content_hash(payload.encode("utf-8"))
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        return entry["output"] if entry else None
+
+    def put(self, key: str, output: str, prompt_hash: str):
+        entry = {"key": key, "prompt_hash": prompt_hash, "output": output}
+        with self._lock:
+            self._entries[key] = entry
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def invalidate(self, prompt_hash: str = None):
+        """Drop cached outputs for one prompt hash (or everything)."""
+        with self._lock:
+            self._entries = {
+                k: e for k, e in self._entries.items()
+                if prompt_hash is not None and e["prompt_hash"] != prompt_hash
+            }
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, 'w') as f:
+                for entry in self._entries.values():
+                    f.write(json.dumps(entry) + "\n")
+
+
+def _wilson_interval(successes: int, n: int, z: float) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion."""
+    if n == 0:
+        return (0.0, 1.0)
+    p = successes / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * ((p * (1 - p) / n + z * z / (4 * n * n)) ** 0.5) / denom
+    return (max(0.0, centre - half), min(1.0, centre + half))
+
+
+def _incomplete_beta(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta I_x(a, b) (continued fraction, modified Lentz)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        return 1.0 - _incomplete_beta(b, a, 1.0 - x)
+
+    tiny = 1e-300
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)) / a
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))
+        ):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-14:
+            break
+    return front * h
+
+
+def _t_two_sided_p(t: float, df: int) -> float:
+    """Two-sided p-value of Student's t statistic."""
+    if math.isinf(t):
+        return 0.0
+    return _incomplete_beta(df / 2, 0.5, df / (df + t * t))
+
+
+def _t_critical(alpha: float, df: int) -> float:
+    """t such that the two-sided p-value equals alpha (bisection)."""
+    low, high = 0.0, 1e6
+    for _ in range(200):
+        mid = (low + high) / 2
+        if _t_two_sided_p(mid, df) > alpha:
+            low = mid
+        else:
+            high = mid
+    return high
+
+
+def _paired_t_test(diffs: List[float]) -> Tuple[float, float, float]:
+    """
+    Paired t-test on per-case differences.
+
+    Returns:
+        (p_value, mean, standard_error); p is 1.0 with fewer than two cases.
+    """
+    n = len(diffs)
+    mean = sum(diffs) / n if n else 0.0
+    if n < 2:
+        return 1.0, mean, float("inf")
+    se = (sum((d - mean) ** 2 for d in diffs) / (n - 1) / n) ** 0.5
+    if se == 0:
+        return (1.0 if mean == 0 else 0.0), mean, 0.0
+    return _t_two_sided_p(mean / se, n - 1), mean, se
+
 
 class PromptEvaluator:
     """
     Evaluates prompts against test cases and metrics.
     Enables prompt testing like unit testing.
+
+    Test cases (and both arms of an A/B comparison) run concurrently on a
+    worker pool; outputs are cached so repeated or resumed runs skip the model.
     """
 
-    def __init__(self, generator_fn: Callable[[str], str] = None):
+    def __init__(
+        self,
+        generator_fn: Callable[[str], str] = None,
+        max_workers: int = 8,
+        model: str = "default",
+        cache: EvaluationCache = None,
+        use_cache: bool = True
+    ):
         """
         Args:
             generator_fn: Function that takes a prompt and returns AI output
+            max_workers: Concurrent generator calls
+            model: Model identifier, part of the cache key
+            cache: Output cache (defaults to .prompt_eval_cache/outputs.jsonl)
+            use_cache: Disable to always call the model
         """
         self.generator_fn = generator_fn
+        self.max_workers = max_workers
+        self.model = model
+        self.cache = (cache or EvaluationCache()) if use_cache else None
         self.results = []
 
-    def run_test_case(
+    def _format_prompt(self, prompt: str, test_case: Dict[str, Any]) -> str:
+        """Format prompt with test input."""
+        return prompt.format(**test_case.get("input", {})) if test_case.get("input") else prompt
+
+    def _generate(self, prompt: str, test_case: Dict[str, Any], sample: int = 0) -> Tuple[str, float, bool, int]:
+        """Return (output, latency in seconds, served_from_cache, estimated tokens spent)."""
+        cache_key = None
+        if self.cache:
+            prompt_hash = _content_hash(prompt.encode("utf-8"))
+            cache_key = EvaluationCache.key(prompt_hash, test_case.get("input", {}), self.model, sample)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached, 0.0, True, 0
+
+        formatted_prompt = self._format_prompt(prompt, test_case)
+        started = time.perf_counter()
+        output = self.generator_fn(formatted_prompt)
+        latency = time.perf_counter() - started
+
+        if cache_key:
+            self.cache.put(cache_key, output, prompt_hash)
+        # ~4 characters per token (same heuristic as ContextManager)
+        return output, latency, False, (len(formatted_prompt) + len(output)) // 4
+
+    def _run_case(
         self,
         prompt: str,
-        test_case: Dict[str, Any]
+        test_case: Dict[str, Any],
+        sample: int = 0,
+        engine: AssertionEngine = None
     ) -> Dict[str, Any]:
-        """
-        Run a single test case against a prompt.
-        
-        Test case format:
-        {
-            "name": "Test description",
-            "input": "Variables to inject into prompt",
-            "expected_contains": ["phrases that should appear"],
-            "expected_not_contains": ["phrases that should NOT appear"],
-            "max_length": 1000
-        }
-        """
+        """Generate and evaluate one case without touching self.results."""
         if not self.generator_fn:
             return {"error": "No generator function provided"}
 
-        # Format prompt with test input
-        formatted_prompt = prompt.format(**test_case.get("input", {})) if test_case.get("input") else prompt
-        
-        # Generate output
         try:
-            output = self.generator_fn(formatted_prompt)
+            output, latency, cached, tokens = self._generate(prompt, test_case, sample)
         except Exception as e:
             return {
                 "name": test_case.get("name", "unknown"),
@@ -188,92 +877,221 @@ class PromptEvaluator:
                 "error": str(e)
             }
 
-        # Evaluate
-        issues = []
-        
-        # Check expected phrases
-        for phrase in test_case.get("expected_contains", []):
-            if phrase.lower() not in output.lower():
-                issues.append(f"Missing expected phrase: '{phrase}'")
-        
-        # Check forbidden phrases
-        for phrase in test_case.get("expected_not_contains", []):
-            if phrase.lower() in output.lower():
-                issues.append(f"Contains forbidden phrase: '{phrase}'")
-        
-        # Check length
-        max_length = test_case.get("max_length")
-        if max_length and len(output) > max_length:
-            issues.append(f"Output too long: {len(output)} > {max_length}")
-
-        result = {
+        issues = (engine or AssertionEngine([test_case])).evaluate(output, test_case)
+        return {
             "name": test_case.get("name", "unknown"),
             "passed": len(issues) == 0,
             "issues": issues,
+            "latency_s": round(latency, 3),
+            "cached": cached,
+            "estimated_tokens": tokens,
             "output_length": len(output),
             "output_preview": output[:200] + "..." if len(output) > 200 else output
         }
-        
-        self.results.append(result)
-        return result
 
-    def run_test_suite(
+    def run_test_case(
         self,
         prompt: str,
-        test_cases: List[Dict]
+        test_case: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Run all test cases and return summary."""
-        results = []
-        for test_case in test_cases:
-            result = self.run_test_case(prompt, test_case)
-            results.append(result)
+        """
+        Run a single test case against a prompt.
         
+        Test case format:
+        {
+            "name": "Test description",
+            "input": "Variables to inject into prompt",
+            "expected_contains": ["phrases that should appear"],
+            "expected_not_contains": ["phrases that should NOT appear"],
+            "max_length": 1000
+        }
+        plus the optional regex, JSON path, section and golden-output checks
+        documented on AssertionEngine.
+        """
+        result = self._run_case(prompt, test_case)
+        if "name" in result:
+            self.results.append(result)
+        return result
+
+    def _run_jobs(self, jobs: List[Tuple]) -> List[Dict[str, Any]]:
+        """Run (prompt, test_case[, sample]) jobs on the worker pool, preserving order."""
+        if not jobs:
+            return []
+        # Compile every assertion in the suite once, shared by all workers
+        engine = AssertionEngine({id(job[1]): job[1] for job in jobs}.values())
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(jobs)))) as pool:
+            return list(pool.map(lambda job: self._run_case(*job, engine=engine), jobs))
+
+    @staticmethod
+    def _summarize(results: List[Dict], wall_time: float) -> Dict[str, Any]:
         passed = sum(1 for r in results if r.get("passed", False))
         total = len(results)
+        latencies = [r["latency_s"] for r in results if "latency_s" in r and not r.get("cached")]
         
         return {
             "passed": passed,
             "total": total,
             "success_rate": passed / total if total > 0 else 0,
+            "cached": sum(1 for r in results if r.get("cached")),
+            "avg_latency_s": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "wall_time_s": round(wall_time, 3),
             "results": results
         }
 
+    def run_test_suite(
+        self,
+        prompt: str,
+        test_cases: List[Dict]
+    ) -> Dict[str, Any]:
+        """Run all test cases concurrently and return summary."""
+        started = time.perf_counter()
+        results = self._run_jobs([(prompt, tc) for tc in test_cases])
+        self.results.extend(r for r in results if "name" in r)
+        return self._summarize(results, time.perf_counter() - started)
+
     def compare_prompts(
         self,
         prompt_a: str,
         prompt_b: str,
         test_cases: List[Dict]
     ) -> Dict[str, Any]:
-        """A/B compare two prompt versions."""
-        results_a = self.run_test_suite(prompt_a, test_cases)
-        self.results = []  # Reset for B
-        results_b = self.run_test_suite(prompt_b, test_cases)
+        """A/B compare two prompt versions (both arms run concurrently)."""
+        started = time.perf_counter()
+        results = self._run_jobs([(prompt_a, tc) for tc in test_cases] + [(prompt_b, tc) for tc in test_cases])
+        wall_time = time.perf_counter() - started
+        results_a = self._summarize(results[:len(test_cases)], wall_time)
+        results_b = self._summarize(results[len(test_cases):], wall_time)
+        self.results = [r for r in results_b["results"] if "name" in r]
         
         return {
             "prompt_a": {
                 "success_rate": results_a["success_rate"],
                 "passed": results_a["passed"],
-                "total": results_a["total"]
+                "total": results_a["total"],
+                "avg_latency_s": results_a["avg_latency_s"]
             },
             "prompt_b": {
                 "success_rate": results_b["success_rate"],
                 "passed": results_b["passed"],
-                "total": results_b["total"]
+                "total": results_b["total"],
+                "avg_latency_s": results_b["avg_latency_s"]
             },
+            "wall_time_s": round(wall_time, 3),
             "winner": "A" if results_a["success_rate"] > results_b["success_rate"] else "B" if results_b["success_rate"] > results_a["success_rate"] else "TIE"
         }
 
+    def compare_prompts_statistical(
+        self,
+        prompt_a: str,
+        prompt_b: str,
+        test_cases: List[Dict],
+        samples: int = 10,
+        samples_per_look: int = 2,
+        alpha: float = 0.05,
+        min_samples: int = 2
+    ) -> Dict[str, Any]:
+        """
+        A/B compare with repeated sampling and sequential early stopping.
+
+        Each case is sampled up to `samples` times per arm. After every look
+        (`samples_per_look` new samples per case, both arms run concurrently)
+        the per-case pass rates of the two arms are compared with a paired
+        t-test over cases: the test case, not the individual sample, is the
+        unit of evidence, so repeated samples of one case never count as
+        independent observations. Sampling stops as soon as the difference is
+        significant at alpha / number_of_looks (Bonferroni spending, so the
+        overall false positive rate stays below alpha).
+
+        Returns:
+            Pass rates with Wilson confidence intervals, the mean per-case
+            difference with its t interval, the p-value and winner ("TIE"
+            unless significant), plus tokens and wall time saved by stopping
+            early.
+        """
+        samples_per_look = max(1, min(samples_per_look, samples))
+        looks = -(-samples // samples_per_look)
+        look_alpha = alpha / looks
+        z = NormalDist().inv_cdf(1 - alpha / 2)
+
+        passes_a = [0] * len(test_cases)
+        passes_b = [0] * len(test_cases)
+        tokens_used = 0
+        taken = 0
+        p_value = 1.0
+        mean_diff, se = 0.0, float("inf")
+        started = time.perf_counter()
+
+        while taken < samples:
+            batch = range(taken, min(taken + samples_per_look, samples))
+            jobs = [(prompt, tc, n) for n in batch for prompt in (prompt_a, prompt_b) for tc in test_cases]
+            results = self._run_jobs(jobs)
+            tokens_used += sum(r.get("estimated_tokens", 0) for r in results)
+
+            per_sample = 2 * len(test_cases)
+            for offset in range(0, len(results), per_sample):
+                chunk = results[offset:offset + per_sample]
+                for i, (a, b) in enumerate(zip(chunk[:len(test_cases)], chunk[len(test_cases):])):
+                    passes_a[i] += bool(a.get("passed"))
+                    passes_b[i] += bool(b.get("passed"))
+            taken = batch.stop
+
+            diffs = [(a - b) / taken for a, b in zip(passes_a, passes_b)]
+            p_value, mean_diff, se = _paired_t_test(diffs)
+            if taken >= min_samples and p_value < look_alpha:
+                break
+
+        wall_time = time.perf_counter() - started
+        n = len(test_cases) * taken
+        passed_a = sum(passes_a)
+        passed_b = sum(passes_b)
+        if len(test_cases) > 1:
+            margin = _t_critical(alpha, len(test_cases) - 1) * se
+            diff_ci = (max(-1.0, mean_diff - margin), min(1.0, mean_diff + margin))
+        else:
+            diff_ci = (-1.0, 1.0)
+
+        significant = p_value < look_alpha
+        remaining = samples - taken
+        return {
+            "prompt_a": {
+                "success_rate": passed_a / n if n else 0,
+                "ci": _wilson_interval(passed_a, n, z),
+                "passed": passed_a,
+                "total": n
+            },
+            "prompt_b": {
+                "success_rate": passed_b / n if n else 0,
+                "ci": _wilson_interval(passed_b, n, z),
+                "passed": passed_b,
+                "total": n
+            },
+            "difference": {"mean": mean_diff, "ci": diff_ci},
+            "p_value": p_value,
+            "alpha_per_look": look_alpha,
+            "significant": significant,
+            "winner": ("A" if mean_diff > 0 else "B") if significant and mean_diff != 0 else "TIE",
+            "cases": len(test_cases),
+            "samples_per_case": taken,
+            "stopped_early": remaining > 0,
+            "tokens_used": tokens_used,
+            "tokens_saved": int(tokens_used / taken * remaining) if taken else 0,
+            "wall_time_s": round(wall_time, 3),
+            "wall_time_saved_s": round(wall_time / taken * remaining, 3) if taken else 0.0
+        }
+
     def print_report(self):
         """Print a formatted test report."""
         table = Table(title="Prompt Evaluation Results")
         table.add_column("Test", style="cyan")
         table.add_column("Passed", style="green")
+        table.add_column("Latency", justify="right")
         table.add_column("Issues", style="red")
 
         for result in self.results:
             passed = "✓" if result.get("passed") else "✗"
+            latency = "cached" if result.get("cached") else f"{result.get('latency_s', 0):.2f}s"
             issues = ", ".join(result.get("issues", []))[:50]
-            table.add_row(result.get("name", "?"), passed, issues or "-")
+            table.add_row(result.get("name", "?"), passed, latency, issues or "-")
 
         console.print(table)
 
@@ -283,13 +1101,25 @@ def create_test_case(
     input_vars: Dict = None,
     expected_contains: List[str] = None,
     expected_not_contains: List[str] = None,
-    max_length: int = None
+    max_length: int = None,
+    expected_regex: List[str] = None,
+    forbidden_regex: List[str] = None,
+    json_paths: Dict[str, Any] = None,
+    required_sections: List[str] = None,
+    golden_output: str = None,
+    min_similarity: float = 0.8
 ) -> Dict:
-    """Helper to create a test case dict."""
+    """Helper to create a test case dict (see AssertionEngine for the checks)."""
     return {
         "name": name,
         "input": input_vars or {},
         "expected_contains": expected_contains or [],
         "expected_not_contains": expected_not_contains or [],
-        "max_length": max_length
+        "max_length": max_length,
+        "expected_regex": expected_regex or [],
+        "forbidden_regex": forbidden_regex or [],
+        "json_paths": json_paths or {},
+        "required_sections": required_sections or [],
+        "golden_output": golden_output,
+        "min_similarity": min_similarity
     }
@@ -1,26 +1,52 @@
 import os
+import re
+import json
+import atexit
 import datetime
 from typing import List, Dict, Optional
 from rich.console import Console
 
+from file_lock import locked
+
 console = Console()
 
 
 class SessionStateManager:
     """
     Manages persistent session state in Markdown files.
-    - session_log.md: Appended at end of each session.
-    - entities.md: Updated when entities are discovered.
+    - session_log.md: Appended at end of each session (locked, indexed, rotated).
+    - entities.md: Rendered from the indexed entity store (entities.jsonl).
     """
 
-    def __init__(self, output_dir: str):
+    def __init__(
+        self,
+        output_dir: str,
+        session_buffer_size: int = 1,
+        max_log_bytes: int = 5 * 1024 * 1024
+    ):
         self.output_dir = output_dir
         self.session_log_path = os.path.join(output_dir, "session_log.md")
+        self.session_index_path = os.path.join(output_dir, "session_log.idx.jsonl")
+        self.session_buffer_size = session_buffer_size
+        self.max_log_bytes = max_log_bytes
+        self._session_buffer: List[tuple] = []
         self.entities_path = os.path.join(output_dir, "entities.md")
+        self.entities_store_path = os.path.join(output_dir, "entities.jsonl")
+        self._entities: Optional[Dict[str, Dict]] = None
+        self._entities_dirty = False
+        atexit.register(self.flush_sessions)
 
     # ─────────────────────────────────────────────────────────────
     # SESSION LOG
     # ─────────────────────────────────────────────────────────────
+    #
+    # Appends happen under an advisory lock. Every entry gets a row in
+    # session_log.idx.jsonl (file, byte offset, length) so the latest
+    # sessions can be read without scanning the log. When session_log.md
+    # grows past max_log_bytes it is rotated to session_log.<n>.md.
+
+    SESSION_LOG_HEADER = "# Session Log\n\nThis file tracks all interactive agent sessions.\n\n---\n"
+    SESSION_ENTRY_PATTERN = re.compile(rb"\n## Session ([^\n]*)\n\*\*Agent:\*\* ([^\n]*)")
 
     def log_session(
         self,
@@ -33,8 +59,6 @@ class SessionStateManager:
         Appends a session summary to session_log.md.
         Called at the END of an interactive session.
         """
-        os.makedirs(self.output_dir, exist_ok=True)
-
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
 
         entry = f"""
@@ -47,19 +71,178 @@ class SessionStateManager:
 
 ---
 """
-        # Append to file (create with header if doesn't exist)
-        if not os.path.exists(self.session_log_path):
-            with open(self.session_log_path, 'w') as f:
-                f.write("# Session Log\n\nThis file tracks all interactive agent sessions.\n\n---\n")
-
-        with open(self.session_log_path, 'a') as f:
-            f.write(entry)
+        self._session_buffer.append((timestamp, agent_name, entry))
+        if len(self._session_buffer) >= self.session_buffer_size:
+            self.flush_sessions()
 
         console.print(f"[green]✓ Session logged to {self.session_log_path}[/green]")
+        self.flush_entities()
+
+    def flush_sessions(self):
+        """Write buffered session entries (one locked append for the batch)."""
+        if not self._session_buffer:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        with locked(self.session_log_path):
+            self._index_legacy_log()
+            pending, self._session_buffer = self._session_buffer, []
+            payload = "".join(entry for _, _, entry in pending).encode("utf-8")
+            size = os.path.getsize(self.session_log_path) if os.path.exists(self.session_log_path) else 0
+            if size and size + len(payload) > self.max_log_bytes:
+                self._rotate_session_log()
+                size = 0
+
+            # Append to file (create with header if doesn't exist)
+            with open(self.session_log_path, 'ab') as f:
+                if size == 0:
+                    f.write(self.SESSION_LOG_HEADER.encode("utf-8"))
+                offset = f.tell()
+                f.write(payload)
+
+            rows = []
+            for timestamp, agent_name, entry in pending:
+                length = len(entry.encode("utf-8"))
+                rows.append({
+                    "file": os.path.basename(self.session_log_path),
+                    "offset": offset,
+                    "length": length,
+                    "timestamp": timestamp,
+                    "agent": agent_name
+                })
+                offset += length
+            with open(self.session_index_path, 'a') as f:
+                f.writelines(json.dumps(r) + "\n" for r in rows)
+
+    def _index_legacy_log(self):
+        """
+        Index the entries of a session_log.md written before the index
+        existed (one-time). Caller holds the exclusive log lock.
+        """
+        if os.path.exists(self.session_index_path) or not os.path.exists(self.session_log_path):
+            return
+        with open(self.session_log_path, 'rb') as f:
+            data = f.read()
+
+        matches = list(self.SESSION_ENTRY_PATTERN.finditer(data))
+        rows = []
+        for match, following in zip(matches, matches[1:] + [None]):
+            end = following.start() if following else len(data)
+            rows.append({
+                "file": os.path.basename(self.session_log_path),
+                "offset": match.start(),
+                "length": end - match.start(),
+                "timestamp": match.group(1).decode("utf-8").strip(),
+                "agent": match.group(2).decode("utf-8").strip()
+            })
+        tmp_path = f"{self.session_index_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.writelines(json.dumps(r) + "\n" for r in rows)
+        os.replace(tmp_path, self.session_index_path)
+
+    def _rotate_session_log(self):
+        """Move session_log.md to the next session_log.<n>.md. Caller holds the lock."""
+        base, ext = os.path.splitext(self.session_log_path)
+        n = 1
+        while os.path.exists(f"{base}.{n}{ext}"):
+            n += 1
+        rotated = f"{base}.{n}{ext}"
+        os.replace(self.session_log_path, rotated)
+
+        # Point existing index rows at the rotated file
+        if os.path.exists(self.session_index_path):
+            current = os.path.basename(self.session_log_path)
+            with open(self.session_index_path, 'r') as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+            for row in rows:
+                if row["file"] == current:
+                    row["file"] = os.path.basename(rotated)
+            tmp_path = f"{self.session_index_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.writelines(json.dumps(r) + "\n" for r in rows)
+            os.replace(tmp_path, self.session_index_path)
+
+    def get_recent_sessions(self, n: int = 5) -> List[Dict]:
+        """
+        Returns the latest n sessions (newest first) using the offset index.
+        Only the tail of the index and the n entries are read.
+        """
+        self.flush_sessions()
+        if not os.path.exists(self.session_index_path):
+            if not os.path.exists(self.session_log_path):
+                return []
+            with locked(self.session_log_path):
+                self._index_legacy_log()
+
+        sessions = []
+        with locked(self.session_log_path, shared=True):
+            for row in reversed(self._tail_lines(self.session_index_path, n)):
+                entry = json.loads(row)
+                with open(os.path.join(self.output_dir, entry["file"]), 'rb') as f:
+                    f.seek(entry["offset"])
+                    entry["content"] = f.read(entry["length"]).decode("utf-8").strip()
+                sessions.append(entry)
+        return sessions
+
+    @staticmethod
+    def _tail_lines(path: str, n: int, block_size: int = 8192) -> List[str]:
+        """Last n non-empty lines of a file, reading backwards in blocks."""
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            data = b""
+            while position > 0 and data.count(b"\n") <= n:
+                step = min(block_size, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+        lines = [line for line in data.decode("utf-8").splitlines() if line.strip()]
+        return lines[-n:] if n > 0 else []
 
     # ─────────────────────────────────────────────────────────────
     # ENTITY REGISTRY
     # ─────────────────────────────────────────────────────────────
+    #
+    # Entities live in a name-keyed (casefolded) in-memory index backed by
+    # entities.jsonl: each upsert appends one record (last record wins) and
+    # the file is compacted once stale records dominate. entities.md is
+    # rendered on demand (flush_entities / at exit), not on every write.
+
+    def _entity_index(self) -> Dict[str, Dict]:
+        """Load the index once per manager (migrating entities.md if needed)."""
+        if self._entities is None:
+            self._entities = {}
+            self._entity_records = 0
+            self._entity_offset = 0
+            self._entity_inode = None
+            if not os.path.exists(self.entities_store_path) and os.path.exists(self.entities_path):
+                self._migrate_entities_markdown()
+            self._refresh_entities()
+            atexit.register(self.flush_entities)
+        return self._entities
+
+    def _refresh_entities(self):
+        """Apply records appended since the last read (by any process)."""
+        if not os.path.exists(self.entities_store_path):
+            return
+        with open(self.entities_store_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_ino != self._entity_inode or stat.st_size < self._entity_offset:
+                # Compacted (replaced) by another manager: our offset is meaningless, reload
+                self._entities.clear()
+                self._entity_records = 0
+                self._entity_offset = 0
+                self._entity_inode = stat.st_ino
+            f.seek(self._entity_offset)
+            data = f.read()
+
+        complete = data.rfind(b"\n") + 1  # Ignore a partially written last line
+        for line in data[:complete].splitlines():
+            if line.strip():
+                entity = json.loads(line)
+                self._entities[entity['name'].casefold()] = entity
+                self._entity_records += 1
+        self._entity_offset += complete
 
     def register_entity(
         self,
@@ -73,31 +256,81 @@ class SessionStateManager:
         Adds or updates an entity in the entity registry.
         Called after CRUD or State analysis tools.
         """
+        self.register_entities([{
+            'name': name,
+            'discovered_in': discovered_in,
+            'operations': operations,
+            'states': states,
+            'notes': notes
+        }])
+
+    def register_entities(self, entities: List[Dict]):
+        """
+        Batched upsert: one locked append for the whole batch.
+        Each dict needs 'name' and 'discovered_in'; other fields are optional.
+        """
         os.makedirs(self.output_dir, exist_ok=True)
+        # First load may migrate entities.md, which takes the store lock itself
+        index = self._entity_index()
 
-        # Load existing entities
-        entities = self._load_entities()
-
-        # Check if entity already exists
-        existing = next((e for e in entities if e['name'].lower() == name.lower()), None)
-        if existing:
-            # Update existing
-            existing['operations'] = operations or existing.get('operations', '')
-            existing['states'] = states or existing.get('states', '')
-            existing['notes'] = notes or existing.get('notes', '')
-            console.print(f"[yellow]✓ Updated entity: {name}[/yellow]")
-        else:
-            # Add new
-            entities.append({
-                'name': name,
-                'discovered_in': discovered_in,
-                'operations': operations,
-                'states': states,
-                'notes': notes
-            })
-            console.print(f"[green]✓ Registered new entity: {name}[/green]")
+        with locked(self.entities_store_path):
+            self._refresh_entities()
+            records = []
+            for entity in entities:
+                key = entity['name'].casefold()
+                existing = index.get(key)
+                if existing:
+                    # Update existing
+                    record = {
+                        **existing,
+                        'operations': entity.get('operations') or existing.get('operations', ''),
+                        'states': entity.get('states') or existing.get('states', ''),
+                        'notes': entity.get('notes') or existing.get('notes', '')
+                    }
+                    console.print(f"[yellow]✓ Updated entity: {entity['name']}[/yellow]")
+                else:
+                    # Add new
+                    record = {
+                        'name': entity['name'],
+                        'discovered_in': entity['discovered_in'],
+                        'operations': entity.get('operations', ''),
+                        'states': entity.get('states', ''),
+                        'notes': entity.get('notes', '')
+                    }
+                    console.print(f"[green]✓ Registered new entity: {entity['name']}[/green]")
+                index[key] = record
+                records.append(record)
+
+            with open(self.entities_store_path, 'a') as f:
+                f.writelines(json.dumps(r) + "\n" for r in records)
+            self._entity_records += len(records)
+            stat = os.stat(self.entities_store_path)
+            self._entity_offset = stat.st_size
+            self._entity_inode = stat.st_ino
+
+            if self._entity_records > 2 * len(index) + 100:
+                self._compact_entities()
 
-        self._save_entities(entities)
+        self._entities_dirty = True
+
+    def _compact_entities(self):
+        """Rewrite entities.jsonl with one record per entity. Caller holds the lock."""
+        tmp_path = f"{self.entities_store_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.writelines(json.dumps(e) + "\n" for e in self._entities.values())
+        os.replace(tmp_path, self.entities_store_path)
+        self._entity_records = len(self._entities)
+        stat = os.stat(self.entities_store_path)
+        self._entity_offset = stat.st_size
+        self._entity_inode = stat.st_ino
+
+    def _migrate_entities_markdown(self):
+        """One-time import of an existing entities.md table."""
+        with locked(self.entities_store_path):
+            if os.path.exists(self.entities_store_path):
+                return  # Another process migrated first
+            with open(self.entities_store_path, 'w') as f:
+                f.writelines(json.dumps(e) + "\n" for e in self._load_entities())
 
     def _load_entities(self) -> List[Dict]:
         """Parses entities.md into a list of dicts."""
@@ -126,8 +359,8 @@ class SessionStateManager:
 
         return entities
 
-    def _save_entities(self, entities: List[Dict]):
-        """Saves entities as a Markdown table."""
+    def render_entities_markdown(self) -> str:
+        """Renders the entity registry as a Markdown table."""
         lines = [
             "# Entity Registry",
             "",
@@ -136,14 +369,31 @@ class SessionStateManager:
             "| Entity | Discovered In | CRUD | States | Notes |",
             "|:-------|:--------------|:-----|:-------|:------|"
         ]
-        for e in entities:
+        for e in self.get_all_entities():
             lines.append(
                 f"| {e['name']} | {e['discovered_in']} | {e['operations']} | {e['states']} | {e['notes']} |"
             )
+        return '\n'.join(lines) + '\n'
+
+    def flush_entities(self):
+        """Writes entities.md if the registry changed since the last render."""
+        if not self._entities_dirty:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = f"{self.entities_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.render_entities_markdown())
+        os.replace(tmp_path, self.entities_path)
+        self._entities_dirty = False
 
-        with open(self.entities_path, 'w') as f:
-            f.write('\n'.join(lines) + '\n')
+    def get_entity(self, name: str) -> Optional[Dict]:
+        """O(1) case-insensitive lookup."""
+        index = self._entity_index()
+        self._refresh_entities()
+        return index.get(name.casefold())
 
     def get_all_entities(self) -> List[Dict]:
         """Returns all registered entities (for context injection)."""
-        return self._load_entities()
+        index = self._entity_index()
+        self._refresh_entities()
+        return list(index.values())
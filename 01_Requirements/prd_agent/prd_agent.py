@@ -11,6 +11,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../0
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
 from contracts_loader import load_dod
 from genai_agent_base import GenAIBaseAgent
+from prompt_registry import render_template
 from follow_up_manager import FollowUpManager
 from session_state_manager import SessionStateManager
 
@@ -89,8 +90,10 @@ class PRDAgent(GenAIBaseAgent):
         prompt_template = self._load_prompt("PRD_GEN-synthesize-prd.md")
         
         if prompt_template:
-            prompt = prompt_template.replace("{{DOCUMENTS_CONTENT}}", documents_content)
-            prompt = prompt.replace("{{TEMPLATE_CONTENT}}", template_content)
+            prompt = render_template(prompt_template, {
+                "DOCUMENTS_CONTENT": documents_content,
+                "TEMPLATE_CONTENT": template_content
+            })
         else:
             raise FileNotFoundError("Critical Error: PRD_GEN prompt file is missing.")
 
@@ -108,7 +111,7 @@ class PRDAgent(GenAIBaseAgent):
         prompt_template = self._load_prompt("PRD_GAP-identify-gaps.md")
         
         if prompt_template:
-            prompt = prompt_template.replace("{{PRD_CONTENT}}", prd_content)
+            prompt = render_template(prompt_template, {"PRD_CONTENT": prd_content})
         else:
             # Fallback prompt if file missing
             prompt = f"Identify gaps in this PRD:\n{prd_content}"
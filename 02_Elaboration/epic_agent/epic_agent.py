@@ -7,6 +7,7 @@ import sys
 # Ensure standards module is importable
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../00_Introduction/standards')))
 from genai_agent_base import GenAIBaseAgent
+from prompt_registry import render_template
 
 # Import Contracts Loader
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
@@ -53,10 +54,12 @@ class EpicAgent(GenAIBaseAgent):
         prompt_template = self._load_prompt("EPIC_GEN-decompose-epics.md")
 
         if prompt_template:
-            prompt = prompt_template.replace("{{PRD_CONTENT}}", prd_content)
-            prompt = prompt.replace("{{ARCHITECTURE_CONTENT}}", architecture_content)
-            prompt = prompt.replace("{{DETAILED_SPECS}}", detailed_specs)
-            prompt = prompt.replace("{{TEMPLATE_CONTENT}}", template_content)
+            prompt = render_template(prompt_template, {
+                "PRD_CONTENT": prd_content,
+                "ARCHITECTURE_CONTENT": architecture_content,
+                "DETAILED_SPECS": detailed_specs,
+                "TEMPLATE_CONTENT": template_content
+            })
         else:
              raise FileNotFoundError("Critical Error: EPIC_GEN prompt file is missing.")
 
@@ -6,10 +6,12 @@ import sys
 # Ensure standards module is importable
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../00_Introduction/standards')))
 from genai_agent_base import GenAIBaseAgent
+from prompt_registry import render_template
 
 # Import Contracts Loader
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
 from contracts_loader import load_dod
+from dod_verifier import verify_and_repair
 
 from rich.console import Console
 
@@ -40,19 +42,31 @@ class StoryAgent(GenAIBaseAgent):
             return match.group(1).strip()
         return response_text.strip()
 
-    def generate_stories(self, epic_content: str, architecture_content: str, template_content: str, output_dir: str):
+    @staticmethod
+    def _epic_id(epic_content: str):
+        """Epic ID from the epic's frontmatter, its '# Epic: <ID>' heading, or the first EPIC-n mention."""
+        for pattern in (r'\A---\s*\n(?:.*\n)*?id:\s*([A-Z][A-Z0-9]*-\d+)', r'^#\s*Epic:\s*([A-Z][A-Z0-9]*-\d+)', r'\b(EPIC-\d+)\b'):
+            match = re.search(pattern, epic_content, re.MULTILINE)
+            if match:
+                return match.group(1)
+        return None
+
+    def generate_stories(self, epic_content: str, architecture_content: str, template_content: str, output_dir: str,
+                         verify_dod: bool = True):
         prompt_template = self._load_prompt("STORY_GEN-generate-stories.md")
 
         if prompt_template:
-            prompt = prompt_template.replace("{{EPIC_CONTENT}}", epic_content)
-            prompt = prompt.replace("{{ARCHITECTURE_CONTENT}}", architecture_content)
-            prompt = prompt.replace("{{TEMPLATE_CONTENT}}", template_content)
+            prompt = render_template(prompt_template, {
+                "EPIC_CONTENT": epic_content,
+                "ARCHITECTURE_CONTENT": architecture_content,
+                "TEMPLATE_CONTENT": template_content
+            })
         else:
             raise FileNotFoundError("Critical Error: STORY_GEN prompt file is missing.")
 
-        # Inject Definition of Done (Contract)
-        dod_instruction = load_dod("STORY")
-        prompt += dod_instruction
+        # Inject Definition of Done (Contract) as a shared prefix: this runs once
+        # per epic, and an identical prompt start lets the contract be cached
+        prompt = load_dod("STORY", mode="prefix") + prompt
 
         console.print("[bold blue]GenAI SDK: Generating User Stories...[/bold blue]")
         
@@ -60,16 +74,36 @@ class StoryAgent(GenAIBaseAgent):
         content = self._extract_output(response_text)
 
         # Parsing logic
-        stories = content.split("=== STORY START:")
-        for story_section in stories[1:]:
+        stories = content.split("=== STORY START:")[1:]
+        headers = [section.strip().split("\n")[0].strip().strip("=").strip() for section in stories]
+
+        # Traceability is set here, not by the model: id from the story marker, parent from the epic
+        epic_id = self._epic_id(epic_content)
+        known_ids = {h.split()[0] for h in headers if h} | ({epic_id} if epic_id else set())
+
+        for story_section, header_line in zip(stories, headers):
             lines = story_section.strip().split("\n")
-            header_line = lines[0].strip()
             safe_title = "".join([c if c.isalnum() else "_" for c in header_line])
 
             filename = f"Story_{safe_title}.md"
             path = os.path.join(output_dir, filename)
-            
-            content = f"# Story: {header_line}\n" + "\n".join(lines[1:])
+
+            # Drop any frontmatter the model copied from the template
+            body = re.sub(r'\A\s*---\s*\n.*?\n---\s*\n', '', "\n".join(lines[1:]), count=1, flags=re.DOTALL)
+            frontmatter = ["---", f"id: {header_line.split()[0]}" if header_line else None,
+                           f"parent: {epic_id}" if epic_id else None, "---"]
+            heading = "" if body.lstrip().startswith("# Story:") else f"# Story: {header_line}\n"
+            content = "\n".join(line for line in frontmatter if line) + "\n" + heading + body.lstrip("\n")
+
+            if verify_dod:
+                # Check the contract locally; only failing sections go back to the model
+                content, failures = verify_and_repair(
+                    content, "STORY",
+                    lambda p: self._extract_output(self.generate(p, temperature=0.2)),
+                    known_ids=known_ids
+                )
+                for failure in failures:
+                    console.print(f"[yellow]DoD {failure['item_id']} {failure['title']}: {failure['message']}[/yellow]")
 
             with open(path, "w", encoding="utf-8") as f:
                 f.write(content)
@@ -84,6 +118,7 @@ def main():
     gen_parser.add_argument("--epic", required=True, help="Path to Epic file")
     gen_parser.add_argument("--arch", required=True, help="Path to Architecture file")
     gen_parser.add_argument("--output", default="outputs/stories", help="Output directory")
+    gen_parser.add_argument("--no-verify", action="store_true", help="Skip the post-generation DoD checks")
 
     args = parser.parse_args()
     agent = StoryAgent()
@@ -100,7 +135,7 @@ def main():
             else:
                  template = "" 
             
-            agent.generate_stories(epic, arch, template, args.output)
+            agent.generate_stories(epic, arch, template, args.output, verify_dod=not args.no_verify)
         except Exception as e:
             console.print(f"[red]Error: {e}[/red]")
 
@@ -7,6 +7,7 @@ import re
 # Ensure standards module is importable
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../00_Introduction/standards')))
 from genai_agent_base import GenAIBaseAgent
+from prompt_registry import render_template
 
 from rich.console import Console
 
@@ -93,10 +94,8 @@ class ArchitectureAgent(GenAIBaseAgent):
         if not template:
              raise FileNotFoundError(f"Prompt {prompt_file} missing.")
 
-        # Replace all inputs
-        prompt = template
-        for key, value in inputs.items():
-            prompt = prompt.replace(f"{{{{{key}}}}}", value)
+        # Replace all inputs (single pass over the compiled template)
+        prompt = render_template(template, inputs)
 
         # Inject Standards
         standards = self._load_standards()
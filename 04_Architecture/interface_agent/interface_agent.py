@@ -8,6 +8,7 @@ import argparse
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '00_Introduction', 'standards'))
 
 from genai_agent_base import GenAIBaseAgent
+from prompt_registry import render_template
 from rich.console import Console
 
 console = Console()
@@ -62,8 +63,10 @@ class InterfaceAgent(GenAIBaseAgent):
         prompt_template = self._load_prompt("INT_DISCOVER-interface-discovery.md")
         
         if prompt_template:
-            prompt = prompt_template.replace("{{PRD_CONTENT}}", prd_content)
-            prompt = prompt.replace("{{ARCHITECTURE_CONTENT}}", arch_content or "Not provided")
+            prompt = render_template(prompt_template, {
+                "PRD_CONTENT": prd_content,
+                "ARCHITECTURE_CONTENT": arch_content or "Not provided"
+            })
         else:
             prompt = f"""
 Analyze this PRD and discover all system interfaces:
@@ -115,9 +118,11 @@ Interface types to look for:
         prompt_template = self._load_prompt("INT_SPEC-interface-specification.md")
         
         if prompt_template:
-            prompt = prompt_template.replace("{{INTERFACE_ID}}", interface_id)
-            prompt = prompt.replace("{{SYSTEM_NAME}}", system_name)
-            prompt = prompt.replace("{{EXISTING_DOCS}}", existing_docs or "Not provided")
+            prompt = render_template(prompt_template, {
+                "INTERFACE_ID": interface_id,
+                "SYSTEM_NAME": system_name,
+                "EXISTING_DOCS": existing_docs or "Not provided"
+            })
         else:
             prompt = f"""
 Generate a detailed interface specification for:
@@ -158,7 +163,7 @@ Include:
         prompt_template = self._load_prompt("INT_TEST-interface-tests.md")
         
         if prompt_template:
-            prompt = prompt_template.replace("{{INTERFACE_SPEC}}", spec_content)
+            prompt = render_template(prompt_template, {"INTERFACE_SPEC": spec_content})
         else:
             prompt = f"""
 Generate contract tests for this interface specification:
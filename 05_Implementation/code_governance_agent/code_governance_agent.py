@@ -19,6 +19,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../s
 from contracts_loader import load_dod
 
 from genai_agent_base import GenAIBaseAgent
+from prompt_registry import render_template
 
 # Handle import for confluence_utils - may not be available in all environments
 try:
@@ -114,10 +115,12 @@ class CodeGovernanceAgent(GenAIBaseAgent):
 
         if prompt_template:
             # Replace placeholders in external prompt
-            prompt = prompt_template.replace("{{GOVERNANCE_CONTEXT}}", governance_context)
-            prompt = prompt.replace("{{STATIC_ANALYSIS_RUFF}}", static_analysis['ruff'])
-            prompt = prompt.replace("{{STATIC_ANALYSIS_BANDIT}}", static_analysis['bandit'])
-            prompt = prompt.replace("{{CODE_CONTENT}}", code_content[:20000])  # Context limit safety
+            prompt = render_template(prompt_template, {
+                "GOVERNANCE_CONTEXT": governance_context,
+                "STATIC_ANALYSIS_RUFF": static_analysis['ruff'],
+                "STATIC_ANALYSIS_BANDIT": static_analysis['bandit'],
+                "CODE_CONTENT": code_content[:20000]  # Context limit safety
+            })
 
             # Inject Definition of Done (Contract)
             dod_instruction = load_dod("DEV")
@@ -8,6 +8,7 @@ import argparse
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '00_Introduction', 'standards'))
 
 from genai_agent_base import GenAIBaseAgent
+from prompt_registry import render_template
 from rich.console import Console
 
 console = Console()
@@ -58,7 +59,7 @@ class ResilienceAgent(GenAIBaseAgent):
         prompt_template = self._load_prompt("LOAD_001-generate-load-tests.md")
         
         if prompt_template:
-            prompt = prompt_template.replace("{{API_ENDPOINTS}}", api_spec)
+            prompt = render_template(prompt_template, {"API_ENDPOINTS": api_spec})
         else:
             prompt = f"""
 Generate load test scripts for these API endpoints:
@@ -97,7 +98,7 @@ Include thresholds for P95 < 500ms and error rate < 1%.
         prompt_template = self._load_prompt("CHAOS_001-chaos-scenarios.md")
         
         if prompt_template:
-            prompt = prompt_template.replace("{{ARCHITECTURE_DOCS}}", architecture)
+            prompt = render_template(prompt_template, {"ARCHITECTURE_DOCS": architecture})
         else:
             prompt = f"""
 Generate chaos engineering scenarios for this architecture:
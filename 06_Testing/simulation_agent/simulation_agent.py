@@ -8,6 +8,7 @@ import argparse
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '00_Introduction', 'standards'))
 
 from genai_agent_base import GenAIBaseAgent
+from prompt_registry import render_template
 from rich.console import Console
 
 console = Console()
@@ -57,8 +58,10 @@ class SimulationAgent(GenAIBaseAgent):
         prompt_template = self._load_prompt("SIM_001-persona-simulation.md")
         
         if prompt_template:
-            prompt = prompt_template.replace("{{PERSONA_CONTENT}}", personas)
-            prompt = prompt.replace("{{USER_STORIES}}", stories)
+            prompt = render_template(prompt_template, {
+                "PERSONA_CONTENT": personas,
+                "USER_STORIES": stories
+            })
         else:
             prompt = f"""
 Analyze these personas and generate simulation test scenarios:
@@ -6,6 +6,7 @@ import sys
 # Ensure standards module is importable
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../00_Introduction/standards')))
 from genai_agent_base import GenAIBaseAgent
+from prompt_registry import render_template
 
 # Import Contracts Loader
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
@@ -44,9 +45,11 @@ class TestPlanAgent(GenAIBaseAgent):
         prompt_template = self._load_prompt("TEST_GEN-generate-test-plan.md")
 
         if prompt_template:
-            prompt = prompt_template.replace("{{STORY_CONTENT}}", story_content)
-            prompt = prompt.replace("{{ARCHITECTURE_CONTENT}}", architecture_content)
-            prompt = prompt.replace("{{TEMPLATE_CONTENT}}", template_content)
+            prompt = render_template(prompt_template, {
+                "STORY_CONTENT": story_content,
+                "ARCHITECTURE_CONTENT": architecture_content,
+                "TEMPLATE_CONTENT": template_content
+            })
         else:
              raise FileNotFoundError("Critical Error: TEST_GEN prompt file is missing.")
         
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Dependency Graph Benchmark
+--------------------------
+Compares DependencyGraph (dict/list adjacency) with CompactDependencyGraph
+(CSR arrays) on a synthetic layered backlog.
+
+Usage:
+    python benchmark_graph.py                 # 1M edges
+    python benchmark_graph.py --edges 200000 --fan-in 4
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from planning_agent import DependencyGraph
+from compact_graph import CompactDependencyGraph
+
+
+def make_backlog(edges, fan_in, seed=7):
+    """Stories where each depends on `fan_in` earlier stories (always a DAG)."""
+    rng = random.Random(seed)
+    count = edges // fan_in + fan_in
+    stories = []
+    for i in range(count):
+        deps = [f"S-{j}" for j in rng.sample(range(i), min(i, fan_in))] if i else []
+        stories.append({"id": f"S-{i}", "points": rng.randint(1, 8), "dependencies": deps})
+    return stories
+
+
+def measure(label, build, stories):
+    gc.collect()
+    tracemalloc.start()
+    graph = build(stories)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del graph
+    gc.collect()
+
+    start = time.perf_counter()
+    graph = build(stories)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    order = graph.topological_sort()
+    sorted_in = time.perf_counter() - start
+
+    start = time.perf_counter()
+    layers = graph.get_layers()
+    layered_in = time.perf_counter() - start
+
+    print(f"{label:<24} {memory / 2**20:>9.1f} MB {built:>9.2f}s {sorted_in:>9.2f}s {layered_in:>9.2f}s"
+          f"   ({len(order)} nodes, {len(layers)} layers)")
+    return layers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dependency graph representations")
+    parser.add_argument("--edges", type=int, default=1_000_000, help="Approximate edge count")
+    parser.add_argument("--fan-in", type=int, default=5, help="Dependencies per story")
+    args = parser.parse_args()
+
+    print(f"Generating backlog with ~{args.edges:,} edges...")
+    stories = make_backlog(args.edges, args.fan_in)
+
+    print(f"\n{'Graph':<24} {'Memory':>12} {'Build':>10} {'Topo':>10} {'Layers':>10}")
+    dict_layers = measure("DependencyGraph", DependencyGraph, stories)
+    csr_layers = measure("CompactDependencyGraph", CompactDependencyGraph, stories)
+
+    same = [sorted(layer) for layer in dict_layers] == [sorted(layer) for layer in csr_layers]
+    print(f"\nLayers identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Compact Dependency Graph (Portfolio Scale)
+------------------------------------------
+Array-backed drop-in for DependencyGraph when a backlog spans many teams.
+
+Story IDs are interned to int32 indexes and edges are stored in CSR form
+(`offsets`/`targets` NumPy arrays), so a million edges cost a few MB instead
+of a million Python list slots. In-degrees and layer extraction are
+vectorized; `topological_sort` and `get_layers` return the same shapes as
+DependencyGraph.
+
+Requires numpy (optional dependency of this agent).
+
+Usage:
+    from compact_graph import CompactDependencyGraph
+
+    graph = CompactDependencyGraph(stories)
+    layers = graph.get_layers()
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class CompactDependencyGraph:
+    """
+    CSR dependency graph. Edge direction matches DependencyGraph: Dep -> Story.
+    """
+
+    def __init__(self, stories):
+        if np is None:
+            raise ImportError("CompactDependencyGraph requires numpy (pip install numpy)")
+
+        self.stories = {s['id']: s for s in stories}
+        self.ids = list(self.stories.keys())
+        self.index = {node: i for i, node in enumerate(self.ids)}
+
+        src, dst = [], []
+        for i, story in enumerate(self.stories.values()):
+            for dep_id in story.get('dependencies', []):
+                j = self.index.get(dep_id)
+                if j is None:
+                    j = self.index[dep_id] = len(self.ids)
+                    self.ids.append(dep_id)
+                src.append(j)
+                dst.append(i)
+
+        self._build(np.asarray(src, dtype=np.int32), np.asarray(dst, dtype=np.int32))
+
+    @classmethod
+    def from_edges(cls, ids, src, dst):
+        """
+        Build directly from interned IDs and edge index arrays (Dep -> Story),
+        skipping per-story dicts entirely.
+        """
+        if np is None:
+            raise ImportError("CompactDependencyGraph requires numpy (pip install numpy)")
+        graph = cls.__new__(cls)
+        graph.stories = {}
+        graph.ids = list(ids)
+        graph.index = {node: i for i, node in enumerate(graph.ids)}
+        graph._build(np.asarray(src, dtype=np.int32), np.asarray(dst, dtype=np.int32))
+        return graph
+
+    def _build(self, src, dst):
+        n = len(self.ids)
+        order = np.argsort(src, kind='stable')
+        self.targets = dst[order]
+        self.offsets = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src, minlength=n), out=self.offsets[1:])
+        self.in_degree = np.bincount(dst, minlength=n).astype(np.int32)
+
+    @property
+    def nodes(self):
+        return set(self.ids)
+
+    def successors(self, node):
+        """IDs that depend on `node`."""
+        i = self.index[node]
+        return [self.ids[j] for j in self.targets[self.offsets[i]:self.offsets[i + 1]]]
+
+    def _out_edges(self, frontier):
+        """Targets of every edge leaving the frontier, in one gather."""
+        starts = self.offsets[frontier]
+        counts = (self.offsets[frontier + 1] - starts).astype(np.int64)
+        total = int(counts.sum())
+        if total == 0:
+            return self.targets[:0]
+        # Edge slot k of frontier node f lives at starts[f] + k
+        base = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return self.targets[base + np.arange(total)]
+
+    def _layer_indexes(self):
+        """Kahn's algorithm a whole wave at a time; returns (layers, visited)."""
+        remaining = self.in_degree.copy()
+        frontier = np.flatnonzero(remaining == 0).astype(np.int32)
+        layers = []
+        visited = 0
+
+        while frontier.size:
+            layers.append(frontier)
+            visited += frontier.size
+            touched, hits = np.unique(self._out_edges(frontier), return_counts=True)
+            remaining[touched] -= hits.astype(np.int32)
+            frontier = touched[remaining[touched] == 0]
+
+        return layers, visited
+
+    def topological_sort(self):
+        """
+        Returns ordered list of tasks or None if cycle detected.
+        """
+        layers, visited = self._layer_indexes()
+        if visited != len(self.ids):
+            return None # Cycle detected
+        ids = self.ids
+        return [ids[i] for layer in layers for i in layer.tolist()]
+
+    def get_layers(self):
+        """
+        Returns tasks grouped by 'earliest possible start phase'.
+        Phase 1: No dependencies. Phase 2: Depends only on Phase 1, etc.
+        """
+        layers, _ = self._layer_indexes()
+        ids = self.ids
+        return [[ids[i] for i in layer.tolist()] for layer in layers]
+
+    def memory_bytes(self):
+        """Bytes held by the adjacency arrays (excludes the ID strings)."""
+        return self.offsets.nbytes + self.targets.nbytes + self.in_degree.nbytes
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Sprint Health Engine
+--------------------
+Classifies every story in a sprint against the status of everything it
+(transitively) depends on, matching the README legend:
+
+- HEALTHY  (🟢): all dependencies are done
+- AT_RISK  (🟡): open dependencies, but all of them are in this sprint
+- BLOCKED  (🔴): an open dependency (direct or transitive) sits outside
+  this sprint, i.e. dependent work is scheduled before its blocker
+
+One topological pass over the graph propagates, for every open story, the
+longest open blocker chain (via a back-pointer) and the set of root
+blockers: open ancestors that are not themselves waiting on anything.
+
+Statuses come from the stories themselves, optionally overlaid with a cached
+Jira snapshot (the `search_issue` result of scripts/jira_client.py, matched
+through each story's `jira_id`).
+"""
+
+import json
+
+DONE_STATUSES = {"DONE", "CLOSED", "RESOLVED"}
+HEALTHY, AT_RISK, BLOCKED, DONE = "HEALTHY", "AT_RISK", "BLOCKED", "DONE"
+
+
+def normalize_status(status):
+    return str(status or "TODO").strip().upper().replace(" ", "_")
+
+
+def load_jira_snapshot(path):
+    """{jira_key: STATUS} from a saved Jira search result ({"issues": [...]} or a bare list)."""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    issues = data.get("issues", []) if isinstance(data, dict) else data
+    return {
+        issue["key"]: normalize_status(issue.get("fields", {}).get("status", {}).get("name"))
+        for issue in issues if "key" in issue
+    }
+
+
+class SprintHealthEngine:
+    """
+    Health analysis over a DependencyGraph (edges Dep -> Story, which is
+    already the reverse-dependency index: blocker -> dependents).
+    """
+
+    def __init__(self, graph, statuses=None, jira_statuses=None):
+        self.graph = graph
+        self.status = {}
+        for s_id, story in graph.stories.items():
+            status = story.get('status')
+            if jira_statuses and story.get('jira_id') in jira_statuses:
+                status = jira_statuses[story['jira_id']]
+            if statuses and s_id in statuses:
+                status = statuses[s_id]
+            self.status[s_id] = normalize_status(status)
+
+        self.order = graph.topological_sort()
+        if self.order is None:
+            raise ValueError("Circular dependency detected; run `planning_agent.py sequence` for a cycle report")
+        self._propagate()
+
+    def is_done(self, node):
+        # Dependencies outside the backlog are assumed delivered
+        return node not in self.graph.stories or self.status[node] in DONE_STATUSES
+
+    def _propagate(self):
+        """Single pass in topological order over open stories."""
+        self.open_deps = {}
+        self.depth = {}
+        self.via = {}
+        self.roots = {}
+
+        for node in self.order:
+            if self.is_done(node):
+                continue
+            open_deps = [d for d in self.graph.stories[node].get('dependencies', []) if not self.is_done(d)]
+            self.open_deps[node] = open_deps
+            if not open_deps:
+                self.depth[node] = 0
+                self.roots[node] = frozenset()
+                continue
+
+            deepest = max(open_deps, key=lambda d: self.depth[d])
+            self.depth[node] = self.depth[deepest] + 1
+            self.via[node] = deepest
+            roots = set()
+            for dep in open_deps:
+                roots |= self.roots[dep] or {dep}
+            self.roots[node] = frozenset(roots)
+
+    def chain(self, node):
+        """Longest open blocker chain, root first, ending at node."""
+        path = [node]
+        while node in self.via:
+            node = self.via[node]
+            path.append(node)
+        return path[::-1]
+
+    def evaluate(self, scope=None):
+        """
+        Args:
+            scope: Story IDs in the current sprint (default: every open story)
+
+        Returns:
+            Machine-readable report: {"scope", "summary", "items": [...]}
+        """
+        scope = list(scope) if scope is not None else [n for n in self.order if n in self.open_deps]
+        in_scope = set(scope)
+
+        # Does an open blocker outside the sprint sit anywhere upstream?
+        outside = {}
+        for node in self.order:
+            if node in self.open_deps:
+                outside[node] = any(d not in in_scope or outside[d] for d in self.open_deps[node])
+
+        items = []
+        summary = {HEALTHY: 0, AT_RISK: 0, BLOCKED: 0, DONE: 0}
+
+        for node in scope:
+            if node not in self.graph.stories:
+                continue
+            if self.is_done(node):
+                summary[DONE] += 1
+                continue
+
+            open_deps = self.open_deps[node]
+            if not open_deps:
+                health = HEALTHY
+            elif outside[node]:
+                health = BLOCKED
+            else:
+                health = AT_RISK
+            summary[health] += 1
+
+            items.append({
+                "id": node,
+                "status": self.status[node],
+                "health": health,
+                "blocked_by": [{"id": d, "status": self.status[d], "in_sprint": d in in_scope} for d in open_deps],
+                "chain": [{"id": n, "status": self.status[n]} for n in self.chain(node)],
+                "root_blockers": sorted(self.roots[node])
+            })
+
+        return {"scope": scope, "summary": summary, "items": items}
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Incremental Dependency Graph (Live Backlog)
+-------------------------------------------
+Keeps a backlog's dependency graph up to date edit by edit instead of
+rebuilding DependencyGraph from JSON on every command.
+
+Maintained incrementally:
+- Topological order: Pearce-Kelly dynamic topological sort. Adding a
+  dependency only reorders the nodes between its two endpoints, and a
+  dependency that would create a cycle is rejected.
+- Layer (build phase) and earliest start (points-weighted) per story:
+  re-propagated only through the successors of what changed.
+- Critical path: traced back from the latest finishing story on demand.
+
+State is persisted as a JSON snapshot plus an append-only change log, so a
+long-running monitor restarts by replaying only the edits since the last
+checkpoint. Dependency targets that are not stories themselves (external
+items) are kept as placeholder nodes and left out of the snapshot.
+
+This module is standalone (its own CLI below); planning_agent.py still
+builds DependencyGraph from JSON per command.
+
+Usage:
+    python incremental_graph.py backlog_state.json init stories.json
+    python incremental_graph.py backlog_state.json add-dep UI-1 API-1
+    python incremental_graph.py backlog_state.json layers
+    python incremental_graph.py backlog_state.json checkpoint
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+from collections import defaultdict
+
+
+class CycleError(ValueError):
+    """Raised when an edit would introduce a circular dependency."""
+
+
+class IncrementalDependencyGraph:
+    """
+    Dependency graph with edge direction Dep -> Story (same as DependencyGraph).
+    """
+
+    def __init__(self, stories=None, path=None):
+        self.path = path
+        self.stories = {}
+        self.placeholders = set()
+        self.succ = defaultdict(set)
+        self.pred = defaultdict(set)
+        self.order = {}
+        self.layer = {}
+        self.earliest_start = {}
+        self._next_position = 0
+        self._log = None
+        self._loading = False
+
+        if stories:
+            self._bulk_load(stories)
+
+    # --- Persistence ---
+
+    @property
+    def log_path(self):
+        return os.path.splitext(self.path)[0] + ".changes.jsonl"
+
+    @classmethod
+    def open(cls, path):
+        """Load the snapshot at `path` (if any) and replay its change log."""
+        stories = []
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                stories = json.load(f).get("stories", [])
+        graph = cls(stories, path=path)
+
+        if os.path.exists(graph.log_path):
+            with open(graph.log_path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        graph._apply(json.loads(line))
+        return graph
+
+    def checkpoint(self):
+        """Write a fresh snapshot atomically and truncate the change log."""
+        if not self.path:
+            return
+        stories = []
+        for story_id in self.topological_sort():
+            if story_id in self.placeholders:
+                continue  # Recreated from the dependencies that name it
+            story = dict(self.stories[story_id])
+            story["dependencies"] = sorted(self.pred[story_id])
+            stories.append(story)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": 1, "stories": stories}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+        self.close()
+        open(self.log_path, 'w').close()
+
+    def close(self):
+        if self._log:
+            self._log.close()
+            self._log = None
+
+    def _record(self, change):
+        if not self.path:
+            return
+        if self._log is None:
+            self._log = open(self.log_path, 'a')
+        self._log.write(json.dumps(change) + "\n")
+        self._log.flush()
+
+    def _apply(self, change):
+        op = change["op"]
+        if op == "add_story":
+            self.add_story(change["story"], record=False)
+        elif op == "remove_story":
+            self.remove_story(change["id"], record=False)
+        elif op == "add_dependency":
+            self.add_dependency(change["story"], change["dependency"], record=False)
+        elif op == "remove_dependency":
+            self.remove_dependency(change["story"], change["dependency"], record=False)
+        elif op == "set_points":
+            self.set_points(change["id"], change["points"], record=False)
+
+    # --- Bulk build ---
+
+    def _bulk_load(self, stories):
+        self._loading = True
+        for story in stories:
+            story = dict(story, dependencies=list(story.get('dependencies', [])))
+            self._ensure_node(story['id'], story)
+            for dep_id in story.get('dependencies', []):
+                self._ensure_node(dep_id)
+                self.succ[dep_id].add(story['id'])
+                self.pred[story['id']].add(dep_id)
+
+        # Kahn's algorithm seeds positions, layers and earliest starts
+        in_degree = {node: len(self.pred[node]) for node in self.stories}
+        ready = [node for node, degree in in_degree.items() if degree == 0]
+        position = 0
+        while ready:
+            u = ready.pop()
+            self.order[u] = position
+            position += 1
+            self._recompute(u)
+            for v in self.succ[u]:
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    ready.append(v)
+
+        self._next_position = position
+        self._loading = False
+        if position != len(self.stories):
+            raise CycleError("Circular dependency in backlog; run `planning_agent.py sequence` for a cycle report")
+
+    def _ensure_node(self, story_id, story=None):
+        """Create a node (a placeholder if no story is given) or replace its story."""
+        if story:
+            self.placeholders.discard(story_id)
+        if story_id in self.stories:
+            if story:
+                self.stories[story_id] = story
+            return
+        if not story:
+            self.placeholders.add(story_id)
+        self.stories[story_id] = story or {"id": story_id}
+        if not self._loading:
+            self.order[story_id] = self._next_position
+            self._next_position += 1
+            self.layer[story_id] = 0
+            self.earliest_start[story_id] = 0
+
+    def _weight(self, node):
+        return self.stories[node].get('points', 1)
+
+    # --- Incremental maintenance ---
+
+    def _recompute(self, v):
+        """Layer and earliest start of v from its predecessors; True if changed."""
+        preds = self.pred.get(v, ())
+        layer = max((self.layer[p] + 1 for p in preds), default=0)
+        start = max((self.earliest_start[p] + self._weight(p) for p in preds), default=0)
+        changed = self.layer.get(v) != layer or self.earliest_start.get(v) != start
+        self.layer[v] = layer
+        self.earliest_start[v] = start
+        return changed
+
+    def _propagate(self, nodes):
+        """Re-derive layers/starts for `nodes` and, where they change, their successors."""
+        heap = [(self.order[n], n) for n in set(nodes) if n in self.order]
+        heapq.heapify(heap)
+        queued = {n for _, n in heap}
+        forced = set(queued)
+        while heap:
+            _, u = heapq.heappop(heap)
+            if self._recompute(u) or u in forced:
+                for v in self.succ.get(u, ()):
+                    if v not in queued:
+                        queued.add(v)
+                        heapq.heappush(heap, (self.order[v], v))
+
+    def _reorder(self, dep, story):
+        """
+        Pearce-Kelly: restore order[dep] < order[story] after adding dep -> story
+        when the current order has them the other way round.
+        """
+        lower, upper = self.order[story], self.order[dep]
+
+        forward, stack, seen = [], [story], {story}
+        while stack:
+            u = stack.pop()
+            forward.append(u)
+            for v in self.succ.get(u, ()):
+                if v == dep:
+                    raise CycleError(f"{story} already (transitively) blocks {dep}")
+                if v not in seen and self.order[v] < upper:
+                    seen.add(v)
+                    stack.append(v)
+
+        backward, stack, seen = [], [dep], {dep}
+        while stack:
+            u = stack.pop()
+            backward.append(u)
+            for p in self.pred.get(u, ()):
+                if p not in seen and self.order[p] > lower:
+                    seen.add(p)
+                    stack.append(p)
+
+        backward.sort(key=self.order.get)
+        forward.sort(key=self.order.get)
+        slots = sorted(self.order[n] for n in backward + forward)
+        for node, slot in zip(backward + forward, slots):
+            self.order[node] = slot
+
+    # --- Edits ---
+
+    def add_story(self, story, record=True):
+        """
+        Add (or replace) a story, including its dependencies. If any
+        dependency would close a loop, the whole change is rolled back
+        before CycleError propagates, so memory still matches the log.
+        """
+        story = dict(story, dependencies=list(story.get('dependencies', [])))
+        story_id = story['id']
+        known = set(self.stories)
+        previous = self.stories.get(story_id)
+        previous = dict(previous, dependencies=list(previous.get('dependencies', []))) if previous else None
+        previous_deps = set(self.pred.get(story_id, ()))
+        was_placeholder = story_id in self.placeholders
+
+        try:
+            self._ensure_node(story_id, story)
+            for dep_id in self.pred.get(story_id, set()) - set(story['dependencies']):
+                self.remove_dependency(story_id, dep_id, record=False)
+            for dep_id in story['dependencies']:
+                self.add_dependency(story_id, dep_id, record=False)
+        except CycleError:
+            for dep_id in set(self.pred.get(story_id, ())) - previous_deps:
+                self.remove_dependency(story_id, dep_id, record=False)
+            # Nodes created only for this call (the story itself, if new)
+            for node in set(self.stories) - known:
+                self.remove_story(node, record=False)
+            if previous is not None:
+                # Re-adding a subset of the previous (acyclic) edges cannot fail
+                for dep_id in previous_deps - set(self.pred.get(story_id, ())):
+                    self.add_dependency(story_id, dep_id, record=False)
+                self.stories[story_id] = previous
+                if was_placeholder:
+                    self.placeholders.add(story_id)
+                # Its points may have changed too; propagation always revisits its successors
+                self._propagate([story_id])
+            raise
+        self._propagate([story_id])
+        if record:
+            self._record({"op": "add_story", "story": story})
+
+    def remove_story(self, story_id, record=True):
+        if story_id not in self.stories:
+            return
+        successors = self.succ.pop(story_id, set())
+        for v in successors:
+            self.pred[v].discard(story_id)
+        for p in self.pred.pop(story_id, set()):
+            self.succ[p].discard(story_id)
+        for index in (self.stories, self.order, self.layer, self.earliest_start):
+            index.pop(story_id, None)
+        self.placeholders.discard(story_id)
+        self._propagate(successors)
+        if record:
+            self._record({"op": "remove_story", "id": story_id})
+
+    def add_dependency(self, story_id, dep_id, record=True):
+        """story_id now waits on dep_id. Raises CycleError if that closes a loop."""
+        if story_id == dep_id:
+            raise CycleError(f"{story_id} cannot depend on itself")
+        self._ensure_node(story_id)
+        self._ensure_node(dep_id)
+        if dep_id in self.pred[story_id]:
+            return
+        if self.order[dep_id] > self.order[story_id]:
+            self._reorder(dep_id, story_id)
+
+        self.succ[dep_id].add(story_id)
+        self.pred[story_id].add(dep_id)
+        self.stories[story_id].setdefault('dependencies', [])
+        if dep_id not in self.stories[story_id]['dependencies']:
+            self.stories[story_id]['dependencies'].append(dep_id)
+        self._propagate([story_id])
+        if record:
+            self._record({"op": "add_dependency", "story": story_id, "dependency": dep_id})
+
+    def remove_dependency(self, story_id, dep_id, record=True):
+        if dep_id not in self.pred.get(story_id, ()):
+            return
+        self.pred[story_id].discard(dep_id)
+        self.succ[dep_id].discard(story_id)
+        deps = self.stories[story_id].get('dependencies', [])
+        if dep_id in deps:
+            deps.remove(dep_id)
+        self._propagate([story_id])
+        if record:
+            self._record({"op": "remove_dependency", "story": story_id, "dependency": dep_id})
+
+    def set_points(self, story_id, points, record=True):
+        self._ensure_node(story_id)
+        self.placeholders.discard(story_id)  # Sized now, so it is a story of its own
+        self.stories[story_id]['points'] = points
+        # The story's own start is unchanged; everything after it may move
+        self._propagate(self.succ.get(story_id, ()))
+        if record:
+            self._record({"op": "set_points", "id": story_id, "points": points})
+
+    # --- Queries (same shapes as DependencyGraph) ---
+
+    @property
+    def nodes(self):
+        return set(self.stories)
+
+    def topological_sort(self):
+        return sorted(self.order, key=self.order.get)
+
+    def get_layers(self):
+        layers = defaultdict(list)
+        for node in self.topological_sort():
+            layers[self.layer[node]].append(node)
+        return [layers[i] for i in range(len(layers))]
+
+    def earliest_finish(self, story_id):
+        return self.earliest_start[story_id] + self._weight(story_id)
+
+    def duration(self):
+        return max((self.earliest_finish(n) for n in self.stories), default=0)
+
+    def get_critical_path(self):
+        """Back-trace from the latest finishing story through tight predecessors."""
+        if not self.stories:
+            return []
+        node = max(self.stories, key=self.earliest_finish)
+        path = [node]
+        while self.pred.get(node):
+            start = self.earliest_start[node]
+            node = next(p for p in self.pred[node] if self.earliest_finish(p) == start)
+            path.append(node)
+        path.reverse()
+        return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally maintained dependency graph")
+    parser.add_argument("state", help="Snapshot path (change log sits next to it)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ip = subparsers.add_parser("init", help="Create a snapshot from a stories JSON file")
+    ip.add_argument("file", help="Path to stories JSON")
+
+    ap = subparsers.add_parser("add-story", help="Add a story")
+    ap.add_argument("id")
+    ap.add_argument("--points", type=int, default=1)
+    ap.add_argument("--deps", default="", help="Comma-separated dependency IDs")
+
+    rp = subparsers.add_parser("remove-story", help="Remove a story and its edges")
+    rp.add_argument("id")
+
+    for name in ("add-dep", "remove-dep"):
+        dp = subparsers.add_parser(name, help=f"{name.split('-')[0].title()} a dependency")
+        dp.add_argument("story")
+        dp.add_argument("dependency")
+
+    pp = subparsers.add_parser("set-points", help="Change a story's points")
+    pp.add_argument("id")
+    pp.add_argument("points", type=int)
+
+    subparsers.add_parser("layers", help="Print build phases")
+    subparsers.add_parser("critical-path", help="Print the critical path")
+    subparsers.add_parser("checkpoint", help="Compact the change log into the snapshot")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "init":
+            with open(args.file, 'r') as f:
+                graph = IncrementalDependencyGraph(json.load(f).get('stories', []), path=args.state)
+            graph.checkpoint()
+            print(f"Snapshot written: {args.state} ({len(graph.stories)} stories)")
+            return
+
+        graph = IncrementalDependencyGraph.open(args.state)
+        if args.command == "add-story":
+            deps = [d for d in args.deps.split(",") if d]
+            graph.add_story({"id": args.id, "points": args.points, "dependencies": deps})
+        elif args.command == "remove-story":
+            graph.remove_story(args.id)
+        elif args.command == "add-dep":
+            graph.add_dependency(args.story, args.dependency)
+        elif args.command == "remove-dep":
+            graph.remove_dependency(args.story, args.dependency)
+        elif args.command == "set-points":
+            graph.set_points(args.id, args.points)
+        elif args.command == "layers":
+            for i, layer in enumerate(graph.get_layers(), 1):
+                print(f"Phase {i}: {', '.join(layer)}")
+        elif args.command == "critical-path":
+            print(f"Critical Path ({graph.duration()} points): {' -> '.join(graph.get_critical_path())}")
+        elif args.command == "checkpoint":
+            graph.checkpoint()
+            print(f"Checkpoint written: {args.state}")
+        graph.close()
+    except CycleError as e:
+        print(f"Rejected: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Reachability Index
+------------------
+Precomputed answers to "does UI-1 (transitively) depend on DB-1?" and
+"what is the blast radius of delaying API-1?" without walking the graph.
+
+Two representations, chosen by size:
+- Bitset closure (default up to BITSET_LIMIT stories): every story keeps a
+  Python int whose bits are its transitive dependents. Queries are a single
+  bit test. Edge edits update only the ancestors of the changed edge.
+- Interval labeling (larger DAGs): post-order numbers on a spanning forest
+  plus merged interval lists per node (Agrawal/Borgida/Jagadish compressed
+  closure). Queries are a binary search over a node's few intervals. Adding
+  an edge merges the target's intervals into the source's ancestors;
+  removing a non-tree edge recomputes only those ancestors. Removing a
+  spanning-tree edge invalidates the numbering, so the index is rebuilt on
+  the next query.
+
+Build order is kept topological across edge inserts with Pearce-Kelly:
+only the nodes between the edge's two positions that must move are
+reordered.
+
+Also provides the transitive reduction: the minimal edge set with the same
+reachability, used to strip redundant "depends on" links from displayed plans.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+
+BITSET_LIMIT = 20_000
+
+
+class ReachabilityIndex:
+    """
+    Reachability over a DependencyGraph (edges Dep -> Story).
+    """
+
+    def __init__(self, graph, mode=None):
+        self.succ = defaultdict(list)
+        self.pred = defaultdict(list)
+        for u, successors in graph.graph.items():
+            for v in successors:
+                self.succ[u].append(v)
+                self.pred[v].append(u)
+        self.nodes = list(graph.nodes)
+        self.mode = mode or ("bitset" if len(self.nodes) <= BITSET_LIMIT else "interval")
+        self._stale = True
+        self.rebuild()
+
+    # --- Build ---
+
+    def _topological_order(self):
+        in_degree = {node: len(self.pred.get(node, ())) for node in self.nodes}
+        ready = [node for node, degree in in_degree.items() if degree == 0]
+        order = []
+        while ready:
+            u = ready.pop()
+            order.append(u)
+            for v in self.succ.get(u, ()):
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    ready.append(v)
+        if len(order) != len(self.nodes):
+            raise ValueError("Circular dependency detected; run `planning_agent.py sequence` for a cycle report")
+        return order
+
+    def rebuild(self):
+        self.order = self._topological_order()
+        self.position = {node: i for i, node in enumerate(self.order)}
+        if self.mode == "bitset":
+            self._build_bitsets()
+        else:
+            self._build_intervals()
+        self._stale = False
+
+    def _build_bitsets(self):
+        self.bit = {node: 1 << i for i, node in enumerate(self.order)}
+        self.reach = {}
+        for u in reversed(self.order):
+            mask = 0
+            for v in self.succ.get(u, ()):
+                mask |= self.bit[v] | self.reach[v]
+            self.reach[u] = mask
+
+    def _build_intervals(self):
+        # Post-order numbering over a spanning forest (iterative DFS from sources)
+        self.post = {}
+        self.low = {}
+        self.tree_parent = {}
+        visited = set()
+        counter = 0
+        for root in self.order:
+            if root in visited or self.pred.get(root):
+                continue
+            visited.add(root)
+            stack = [(root, iter(self.succ.get(root, ())), counter)]
+            while stack:
+                node, children, low = stack[-1]
+                for child in children:
+                    if child not in visited:
+                        visited.add(child)
+                        self.tree_parent[child] = node
+                        stack.append((child, iter(self.succ.get(child, ())), counter))
+                        break
+                else:
+                    stack.pop()
+                    self.post[node] = counter
+                    self.low[node] = low
+                    counter += 1
+
+        self.by_post = {number: node for node, number in self.post.items()}
+        self._next_post = counter
+
+        # Each node covers its own tree interval plus everything its successors cover
+        self.intervals = {}
+        for u in reversed(self.order):
+            self._recompute_intervals(u)
+
+    def _recompute_intervals(self, u):
+        spans = [(self.low[u], self.post[u])]
+        for v in self.succ.get(u, ()):
+            spans.extend(self.intervals[v])
+        self.intervals[u] = self._merge(spans)
+
+    @staticmethod
+    def _merge(spans):
+        spans.sort()
+        merged = [list(spans[0])]
+        for start, end in spans[1:]:
+            if start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return [tuple(span) for span in merged]
+
+    def _ensure_fresh(self):
+        if self._stale:
+            self.rebuild()
+
+    # --- Queries ---
+
+    def reaches(self, source, target):
+        """True if `target` transitively depends on `source` (source -> ... -> target)."""
+        self._ensure_fresh()
+        if source == target or source not in self.position or target not in self.position:
+            return False
+        if self.mode == "bitset":
+            return bool(self.reach[source] & self.bit[target])
+        # Own interval includes the node itself; exclude it above
+        spans = self.intervals[source]
+        number = self.post[target]
+        i = bisect_right(spans, (number, float("inf"))) - 1
+        return i >= 0 and spans[i][0] <= number <= spans[i][1]
+
+    def depends_on(self, story, dependency):
+        """Does `story` (transitively) depend on `dependency`?"""
+        return self.reaches(dependency, story)
+
+    def dependents(self, story):
+        """Blast radius: every story that transitively waits on `story`, in build order."""
+        self._ensure_fresh()
+        if story not in self.position:
+            return []
+        if self.mode == "bitset":
+            mask = self.reach[story]
+            return [node for node in self.order if mask & self.bit[node]]
+        found = [self.by_post[n] for start, end in self.intervals[story] for n in range(start, end + 1)]
+        return sorted((n for n in found if n != story), key=self.position.get)
+
+    def transitive_reduction(self):
+        """
+        Minimal edge list [(dep, story)] with the same reachability:
+        drop dep -> story when another successor of dep already reaches story.
+        """
+        self._ensure_fresh()
+        edges = []
+        for u in self.order:
+            successors = self.succ.get(u, ())
+            if self.mode == "bitset":
+                covered = 0
+                for w in successors:
+                    covered |= self.reach[w]
+                edges.extend((u, v) for v in successors if not covered & self.bit[v])
+            else:
+                edges.extend((u, v) for v in successors
+                             if not any(w != v and self.reaches(w, v) for w in successors))
+        return edges
+
+    # --- Incremental maintenance ---
+
+    def _ancestors(self, node):
+        seen, stack = {node}, [node]
+        while stack:
+            for p in self.pred.get(stack.pop(), ()):
+                if p not in seen:
+                    seen.add(p)
+                    stack.append(p)
+        return seen
+
+    def add_story(self, story_id, dependencies=()):
+        if story_id not in self.position:
+            self.nodes.append(story_id)
+            self.position[story_id] = len(self.order)
+            self.order.append(story_id)
+            if self.mode == "bitset":
+                self.bit[story_id] = 1 << len(self.bit)
+                self.reach[story_id] = 0
+            elif not self._stale:
+                # A new root of the spanning forest: next post-order number, reaching only itself
+                number = self._next_post
+                self._next_post += 1
+                self.post[story_id] = self.low[story_id] = number
+                self.by_post[number] = story_id
+                self.intervals[story_id] = [(number, number)]
+        for dep in dependencies:
+            self.add_edge(dep, story_id)
+
+    def add_edge(self, dep, story):
+        """Record that `story` now depends on `dep`."""
+        for node in (dep, story):
+            if node not in self.position:
+                self.add_story(node)
+        if story in self.succ[dep]:
+            return
+        if dep == story or self.reaches(story, dep):
+            raise ValueError(f"{dep} -> {story} would create a circular dependency")
+
+        if self.position[dep] > self.position[story]:
+            self._reorder(dep, story)
+        self.succ[dep].append(story)
+        self.pred[story].append(dep)
+
+        if self.mode == "bitset":
+            added = self.bit[story] | self.reach[story]
+            for node in self._ancestors(dep):
+                self.reach[node] |= added
+        elif not self._stale:
+            added = self.intervals[story]
+            for node in self._ancestors(dep):
+                self.intervals[node] = self._merge(self.intervals[node] + added)
+
+    def remove_edge(self, dep, story):
+        if story not in self.succ.get(dep, ()):
+            return
+        self.succ[dep].remove(story)
+        self.pred[story].remove(dep)
+        if self.mode != "bitset" and (self._stale or self.tree_parent.get(story) == dep):
+            self._stale = True  # Tree intervals below `story` no longer hold
+            return
+        # Only dep and its ancestors can lose reachability; recompute them bottom-up
+        for u in sorted(self._ancestors(dep), key=self.position.get, reverse=True):
+            if self.mode != "bitset":
+                self._recompute_intervals(u)
+                continue
+            mask = 0
+            for v in self.succ.get(u, ()):
+                mask |= self.bit[v] | self.reach[v]
+            self.reach[u] = mask
+
+    def _reorder(self, dep, story):
+        """
+        Pearce-Kelly: restore position[dep] < position[story] before adding
+        dep -> story. Only nodes between the two positions that are reachable
+        from `story` or reach `dep` move, into the slots they already held.
+        """
+        lower, upper = self.position[story], self.position[dep]
+
+        forward, stack, seen = [], [story], {story}
+        while stack:
+            u = stack.pop()
+            forward.append(u)
+            for v in self.succ.get(u, ()):
+                if v not in seen and self.position[v] < upper:
+                    seen.add(v)
+                    stack.append(v)
+
+        backward, stack, seen = [], [dep], {dep}
+        while stack:
+            u = stack.pop()
+            backward.append(u)
+            for p in self.pred.get(u, ()):
+                if p not in seen and self.position[p] > lower:
+                    seen.add(p)
+                    stack.append(p)
+
+        backward.sort(key=self.position.get)
+        forward.sort(key=self.position.get)
+        slots = sorted(self.position[n] for n in backward + forward)
+        for node, slot in zip(backward + forward, slots):
+            self.position[node] = slot
+            self.order[slot] = node
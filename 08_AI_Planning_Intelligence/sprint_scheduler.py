@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Resource-Constrained Sprint Scheduler
+-------------------------------------
+DependencyGraph layers assume unlimited parallelism. This turns a backlog
+into a sprint-by-sprint plan a real team can deliver:
+
+- Team capacity per sprint (points), plus optional per-skill capacity
+  (e.g. {"backend": 15, "frontend": 10}) for stories tagged with `skill`.
+- A story may start only in a sprint after all of its dependencies finish.
+- List scheduling: each sprint repeatedly takes the highest-priority ready
+  story that still fits, ordered by CPM slack (critical work first), then
+  latest start, then size. Ready stories sit in one heap per (skill, points)
+  bucket, so only bucket tops are compared and nothing is re-queued.
+
+Dependencies that are not in the backlog are treated as already delivered.
+
+Usage:
+    from sprint_scheduler import SprintScheduler
+
+    plan = SprintScheduler(graph, capacity=30, skill_capacity={"backend": 15}).schedule()
+"""
+
+import heapq
+
+
+class SprintScheduler:
+    """
+    Heap-based list scheduler on top of a DependencyGraph.
+    """
+
+    def __init__(self, graph, capacity, skill_capacity=None):
+        if capacity <= 0:
+            raise ValueError("Sprint capacity must be positive")
+        self.graph = graph
+        self.capacity = capacity
+        self.skill_capacity = skill_capacity or {}
+
+    def _priorities(self):
+        analysis = self.graph.analyze_critical_path()
+        if analysis is None:
+            raise ValueError("Circular dependency detected; run `planning_agent.py sequence` for a cycle report")
+        return {
+            node: (analysis["slack"][node], analysis["latest_start"][node], -self.graph._weight(node), i)
+            for i, node in enumerate(analysis["order"])
+        }
+
+    def schedule(self):
+        """
+        Returns:
+            {"sprints": [{"sprint": 1, "stories": [...], "points": 21,
+                          "skills": {"backend": 13}}, ...],
+             "makespan": <number of sprints>,
+             "oversized": [stories bigger than a whole sprint]}
+        """
+        stories = self.graph.stories
+        priority = self._priorities()
+
+        # Only backlog stories are scheduled; outside dependencies count as done
+        waiting = {
+            s_id: sum(1 for dep in story.get('dependencies', []) if dep in stories)
+            for s_id, story in stories.items()
+        }
+
+        # Ready stories bucketed by (skill, points), each bucket a heap by priority.
+        # Each pick compares only the bucket tops that still fit the sprint, so a
+        # story is pushed once and popped once however long it waits.
+        buckets = {}
+
+        def make_ready(s_id):
+            key = (stories[s_id].get('skill'), self.graph._weight(s_id))
+            heapq.heappush(buckets.setdefault(key, []), (priority[s_id], s_id))
+
+        for s_id, count in waiting.items():
+            if count == 0:
+                make_ready(s_id)
+
+        sprints = []
+        oversized = []
+        remaining = len(stories)
+
+        while remaining:
+            load = 0
+            skill_load = {}
+            planned = []
+
+            while buckets and load < self.capacity:
+                best = None
+                for key, heap in buckets.items():
+                    skill, points = key
+                    skill_cap = self.skill_capacity.get(skill)
+                    fits = load + points <= self.capacity and (
+                        skill_cap is None or skill_load.get(skill, 0) + points <= skill_cap)
+                    # The first story of a sprint always goes, alone if it is oversized
+                    if (fits or not planned) and (best is None or heap[0] < buckets[best][0]):
+                        best = key
+                if best is None:
+                    break
+
+                skill, points = best
+                _, s_id = heapq.heappop(buckets[best])
+                if not buckets[best]:
+                    del buckets[best]
+                skill_cap = self.skill_capacity.get(skill)
+                if points > self.capacity or (skill_cap is not None and points > skill_cap):
+                    oversized.append(s_id)
+                planned.append(s_id)
+                load += points
+                if skill is not None:
+                    skill_load[skill] = skill_load.get(skill, 0) + points
+
+            if not planned:
+                # Nothing ready at all: should not happen for an acyclic backlog
+                raise RuntimeError("Scheduler made no progress; check capacities")
+
+            # Work finished in this sprint unlocks its dependents for the next one
+            for s_id in planned:
+                for v in self.graph.graph.get(s_id, ()):
+                    if v in waiting:
+                        waiting[v] -= 1
+                        if waiting[v] == 0:
+                            make_ready(v)
+
+            remaining -= len(planned)
+            sprints.append({
+                "sprint": len(sprints) + 1,
+                "stories": planned,
+                "points": load,
+                "skills": skill_load
+            })
+
+        return {"sprints": sprints, "makespan": len(sprints), "oversized": oversized}
@@ -7,6 +7,7 @@ import re
 # Ensure standards module is importable
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../00_Introduction/standards')))
 from genai_agent_base import GenAIBaseAgent
+from prompt_registry import render_template
 
 from rich.console import Console
 
@@ -47,7 +48,7 @@ class GovernanceAgent(GenAIBaseAgent):
         with open(code_file, 'r', encoding='utf-8') as f:
             code_content = f.read()
             
-        prompt = template.replace("{{CODE_CONTENT}}", code_content)
+        prompt = render_template(template, {"CODE_CONTENT": code_content})
         
         console.print(f"[bold blue]GenAI SDK: Auditing {os.path.basename(code_file)}...[/bold blue]")
         
@@ -135,6 +135,15 @@ class AuditEngine:
         except Exception as e:
             return f"ERROR ({str(e)})"
 
+    def count_decisions(self):
+        """
+        Number of decisions in the Decision Registry (decision_log.jsonl).
+        A legacy decision_log.json is migrated on first read.
+        """
+        sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+        from decision_registry import count_decisions
+        return count_decisions()
+
     def generate_report(self):
         print("Generating Dashboard...")
         
@@ -158,10 +167,9 @@ class AuditEngine:
                 f.write(f"| {a.id} | {a.type} | {a.parent_id or '-'} | {icon} | {', '.join(a.issues)} |\n")
             
             f.write("\n## 2. Decision Provenance\n")
-            if os.path.exists("decision_log.json"):
-                 with open("decision_log.json") as f:
-                     log = json.load(f)
-                 f.write(f"> ✅ **Decisions Logged:** {len(log)}\n")
+            decision_count = self.count_decisions()
+            if decision_count:
+                 f.write(f"> ✅ **Decisions Logged:** {decision_count}\n")
             else:
                  f.write("> ⚠️ **No Decisions Logged Yet.** (Audit Risk)\n")
 
@@ -0,0 +1,87 @@
+"""
+Aho-Corasick Multi-Pattern Matcher
+----------------------------------
+Finds every occurrence of a set of phrases in one left-to-right scan,
+however many phrases there are. Shared by the assertion engine (expected /
+forbidden phrases) and the planning agent's TextAnalyzer (dependency
+keywords).
+
+Usage:
+    from aho_corasick import AhoCorasick
+
+    automaton = AhoCorasick(["depends on", "blocked by"])
+    automaton.find_all(text)        # {0, 1}: indexes of the patterns found
+    automaton.iter_matches(text)    # (start offset, pattern index) per occurrence
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring matcher.
+    Finds every pattern occurring in a text in a single left-to-right scan.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[int]] = [set()]
+
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._build_links()
+
+    def _add(self, pattern: str):
+        index = len(self.patterns)
+        self.patterns.append(pattern)
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            node = nxt
+        self._out[node].add(index)
+
+    def _build_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] |= self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> Set[int]:
+        """Return the indexes of all patterns that occur in text."""
+        found: Set[int] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (start offset, pattern index) for every occurrence in text."""
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for index in out[node]:
+                yield i - len(patterns[index]) + 1, index
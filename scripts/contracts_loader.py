@@ -9,60 +9,184 @@ It ensures that:
 1. The Agent knows its specific quality gates.
 2. The Agent is forced to self-verify against the contract.
 
+Contracts are cached per role and only re-read when the file's mtime/size
+changes, so per-epic/per-story loops do not hit the disk on every call.
+
 Usage:
     from scripts.contracts_loader import load_dod
     
     # In agent code:
     dod_instruction = load_dod("PRD") 
     system_prompt += f"\n\n{dod_instruction}"
+
+    # Same contract shared across many calls: put it FIRST so every prompt
+    # starts with an identical, cacheable prefix
+    prompt = load_dod("STORY", mode="prefix") + story_prompt
+
+    # Structured checklist for post-generation verification
+    checklist = load_dod_checklist("STORY")
 """
 
 import os
+import re
 import sys
+import threading
+from typing import Dict, List, Optional
 
 # Define the root of the project relative to this script
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 CONTRACTS_DIR = os.path.join(PROJECT_ROOT, "09_Audit_and_Governance", "contracts")
 
-def load_dod(agent_role: str) -> str:
+# role -> {"mtime_ns", "size", "content", "suffix", "prefix", "tokens", "checklist"}
+_CONTRACT_CACHE: Dict[str, Dict] = {}
+_CACHE_LOCK = threading.Lock()
+
+SECTION_PATTERN = re.compile(r'^##\s+(?:\d+\.\s*)?(.+?)\s*$')
+ITEM_PATTERN = re.compile(r'^\*\s+(?:\[[ xX]\]\s+)?\*\*(.+?):?\*\*:?\s*(.*)$')
+DETAIL_PATTERN = re.compile(r'^\s{2,}\*\s+(.*)$')
+# Machine-checkable annotation for the preceding item, e.g.
+#   <!-- check: section: Acceptance Criteria -->
+CHECK_PATTERN = re.compile(r'^\s*<!--\s*check:\s*(.+?)\s*-->\s*$')
+
+
+def _contract_path(agent_role: str) -> str:
+    return os.path.join(CONTRACTS_DIR, f"{agent_role.upper()}_DoD.md")
+
+
+def _strip_checks(content: str) -> str:
+    """Contract text for prompts: check annotations are for dod_verifier only."""
+    return "\n".join(line for line in content.splitlines() if not CHECK_PATTERN.match(line))
+
+
+def _banner(content: str) -> str:
+    return (
+        f"\n\n{'='*40}\n"
+        f"!!! CRITICAL INSTRUCTION: AUDIT CONTRACT !!!\n"
+        f"{'='*40}\n"
+        f"You are strictly bound by the following Definition of Done (DoD).\n"
+        f"Before generating your final output, you MUST verify it against every item in this checklist.\n"
+        f"If you fail any check, you must correct it immediately.\n\n"
+        f"{content}\n"
+        f"{'='*40}\n"
+    )
+
+
+def parse_checklist(content: str) -> List[Dict]:
+    """
+    Turns a DoD Markdown file into structured checklist items:
+    [{"id": "1.2", "section": "Completeness Checks (The Inventory)",
+      "title": "Acceptance Criteria", "text": "Listed clearly ...", "details": [...],
+      "checks": ["section: Acceptance Criteria"]}]
+    """
+    items = []
+    section = ""
+    section_no = 0
+    item_no = 0
+    for line in content.splitlines():
+        section_match = SECTION_PATTERN.match(line)
+        if section_match:
+            section = section_match.group(1)
+            section_no += 1
+            item_no = 0
+            continue
+
+        item_match = ITEM_PATTERN.match(line)
+        if item_match and section:
+            item_no += 1
+            items.append({
+                "id": f"{section_no}.{item_no}",
+                "section": section,
+                "title": item_match.group(1).strip(),
+                "text": item_match.group(2).strip(),
+                "details": [],
+                "checks": []
+            })
+            continue
+
+        check_match = CHECK_PATTERN.match(line)
+        if check_match and items:
+            items[-1]["checks"].append(check_match.group(1))
+            continue
+
+        detail_match = DETAIL_PATTERN.match(line)
+        if detail_match and items:
+            items[-1]["details"].append(detail_match.group(1).strip())
+    return items
+
+
+def _get_contract(agent_role: str) -> Optional[Dict]:
+    """Cached contract for a role, reloaded only when the file changes."""
+    file_path = _contract_path(agent_role)
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+
+    key = agent_role.upper()
+    with _CACHE_LOCK:
+        cached = _CONTRACT_CACHE.get(key)
+        if cached and cached["mtime_ns"] == st.st_mtime_ns and cached["size"] == st.st_size:
+            return cached
+
+    with open(file_path, 'r') as f:
+        content = f.read()
+
+    suffix = _banner(_strip_checks(content))
+    contract = {
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "content": content,
+        "suffix": suffix,
+        "prefix": suffix.lstrip("\n") + "\n--- TASK ---\n\n",
+        # ~4 characters per token (same heuristic as ContextManager)
+        "tokens": len(suffix) // 4,
+        "checklist": parse_checklist(content)
+    }
+    with _CACHE_LOCK:
+        _CONTRACT_CACHE[key] = contract
+    return contract
+
+
+def load_dod(agent_role: str, mode: str = "suffix") -> str:
     """
     Loads the Definition of Done (DoD) for a specific agent role.
     
     Args:
         agent_role (str): The role ID, corresponding to the filename prefix (e.g., 'PRD', 'ARCH', 'STORY').
+        mode (str): "suffix" (default) to append to a prompt, or "prefix" to
+            start prompts with an identical block that model-side context
+            caching can reuse across calls.
         
     Returns:
-        str: A formatted string containing the DoD instructions to be appended to the System Prompt.
+        str: A formatted string containing the DoD instructions to be added to the System Prompt.
     """
-    filename = f"{agent_role.upper()}_DoD.md"
-    file_path = os.path.join(CONTRACTS_DIR, filename)
-    
-    if not os.path.exists(file_path):
-        return f"\n[WARNING: AUDIT SYSTEM]\nNo Definition of Done found for '{agent_role}'. Proceed with caution."
-    
     try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-            
-        instruction = (
-            f"\n\n{'='*40}\n"
-            f"!!! CRITICAL INSTRUCTION: AUDIT CONTRACT !!!\n"
-            f"{'='*40}\n"
-            f"You are strictly bound by the following Definition of Done (DoD).\n"
-            f"Before generating your final output, you MUST verify it against every item in this checklist.\n"
-            f"If you fail any check, you must correct it immediately.\n\n"
-            f"{content}\n"
-            f"{'='*40}\n"
-        )
-        return instruction
-        
+        contract = _get_contract(agent_role)
     except Exception as e:
         return f"\n[ERROR: AUDIT SYSTEM]\nFailed to load contract: {e}"
 
+    if contract is None:
+        return f"\n[WARNING: AUDIT SYSTEM]\nNo Definition of Done found for '{agent_role}'. Proceed with caution."
+    return contract["prefix"] if mode == "prefix" else contract["suffix"]
+
+
+def load_dod_checklist(agent_role: str) -> List[Dict]:
+    """Structured checklist for a role (empty if no contract exists)."""
+    contract = _get_contract(agent_role)
+    return contract["checklist"] if contract else []
+
+
+def dod_token_count(agent_role: str) -> int:
+    """Estimated tokens the contract adds to each prompt (0 if missing)."""
+    contract = _get_contract(agent_role)
+    return contract["tokens"] if contract else 0
+
+
 if __name__ == "__main__":
     # Test run
     if len(sys.argv) > 1:
         print(load_dod(sys.argv[1]))
+        print(f"[~{dod_token_count(sys.argv[1])} tokens, {len(load_dod_checklist(sys.argv[1]))} checklist items]")
     else:
         print("Usage: python contracts_loader.py <AGENT_ROLE>")
         print("Example: python contracts_loader.py PRD")
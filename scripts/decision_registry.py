@@ -5,7 +5,7 @@ This module provides a standardized way for Agents to log "Key Decisions" (ADRs)
 It ensures that we can trace *WHY* a decision was made, not just *WHAT* was done.
 
 Usage:
-    from scripts.decision_registry import log_decision
+    from scripts.decision_registry import log_decision, iter_decisions, get_decisions
     
     log_decision(
         agent_id="ARCH_AGENT",
@@ -15,15 +15,62 @@ Usage:
         rationale="We need strong ACID compliance for financial transactions."
     )
 
+    for decision in iter_decisions(agent_id="ARCH_AGENT", since="2026-01-01"):
+        print(decision["topic"], decision["selected"])
+
+    get_decisions(topic="Database Selection")   # same filters, as a list
+
+    count_decisions()   # e.g. for the project dashboard
+
 Output:
-    Appends to decision_log.json in the project root.
+    Appends one line to decision_log.jsonl in the project root, plus a row in
+    the decision_log.idx.jsonl sidecar (agent_id, topic, timestamp, byte offset).
+    Queries load the sidecar into an in-memory index by agent_id, topic and
+    timestamp; a sidecar that no longer matches the log is rebuilt on first
+    use. Logging is constant-time and lock-protected.
+
+Migration:
+    python scripts/decision_registry.py migrate   # decision_log.json -> .jsonl
+    python scripts/decision_registry.py reindex   # rebuild the sidecar index
 """
 
 import json
 import os
+import sys
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
 from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_FILE = os.path.join(PROJECT_ROOT, "decision_log.jsonl")
+INDEX_FILE = os.path.join(PROJECT_ROOT, "decision_log.idx.jsonl")
+LEGACY_LOG_FILE = os.path.join(PROJECT_ROOT, "decision_log.json")
+
+sys.path.append(os.path.join(PROJECT_ROOT, "00_Introduction", "standards"))
+from file_lock import locked
+
+
+def _append_locked(entries):
+    """Append entries and their index rows. Caller holds the log lock."""
+    offset = os.path.getsize(LOG_FILE) if os.path.exists(LOG_FILE) else 0
+    lines, rows = [], []
+    for entry in entries:
+        line = json.dumps(entry) + "\n"
+        lines.append(line)
+        rows.append(json.dumps({
+            "offset": offset,
+            "agent_id": entry.get("agent_id"),
+            "topic": entry.get("topic"),
+            "timestamp": entry.get("timestamp")
+        }) + "\n")
+        offset += len(line.encode("utf-8"))
+
+    with open(LOG_FILE, 'a') as f:
+        f.writelines(lines)
+    with open(INDEX_FILE, 'a') as f:
+        f.writelines(rows)
 
-LOG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "decision_log.json")
 
 def log_decision(agent_id, topic, options, selected, rationale):
     entry = {
@@ -34,26 +81,232 @@ def log_decision(agent_id, topic, options, selected, rationale):
         "selected": selected,
         "rationale": rationale
     }
-    
-    # Load existing
-    if os.path.exists(LOG_FILE):
-        try:
-            with open(LOG_FILE, 'r') as f:
-                log = json.load(f)
-        except:
-            log = []
-    else:
-        log = []
-        
-    log.append(entry)
-    
-    with open(LOG_FILE, 'w') as f:
-        json.dump(log, f, indent=2)
+
+    if os.path.exists(LEGACY_LOG_FILE) and not os.path.exists(LOG_FILE):
+        migrate_legacy_log()
+
+    with locked(LOG_FILE):
+        _append_locked([entry])
     
     print(f"[AUDIT] Decision logged: {topic} -> {selected}")
 
-def get_decisions():
-    if os.path.exists(LOG_FILE):
-        with open(LOG_FILE, 'r') as f:
-            return json.load(f)
-    return []
+
+class _DecisionIndex:
+    """
+    In-memory view of the sidecar: offsets by agent_id and by topic, plus
+    (timestamp, offset) pairs in time order. Only rows appended since the
+    last query are read; a rebuilt (replaced) sidecar is reloaded.
+    """
+
+    def __init__(self):
+        self._reset(None)
+
+    def _reset(self, inode):
+        self.inode = inode
+        self.position = 0
+        self.rows: Dict[int, Tuple] = {}
+        self.by_agent: Dict[str, List[int]] = defaultdict(list)
+        self.by_topic: Dict[str, List[int]] = defaultdict(list)
+        self.by_time: List[Tuple[str, int]] = []
+
+    def refresh(self):
+        """Apply new sidecar rows. Caller holds the (shared) log lock."""
+        with open(INDEX_FILE, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_ino != self.inode or stat.st_size < self.position:
+                self._reset(stat.st_ino)
+            f.seek(self.position)
+            data = f.read()
+
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].splitlines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            offset, timestamp = row["offset"], row["timestamp"] or ""
+            self.rows[offset] = (row["agent_id"], row["topic"], timestamp)
+            self.by_agent[row["agent_id"]].append(offset)
+            self.by_topic[row["topic"]].append(offset)
+            insort(self.by_time, (timestamp, offset))
+        self.position += complete
+
+    def select(self, agent_id=None, topic=None, since=None, until=None) -> List[int]:
+        """Log offsets of matching decisions, oldest first."""
+        keyed = [table.get(key, []) for key, table in ((agent_id, self.by_agent), (topic, self.by_topic))
+                 if key is not None]
+        if keyed:
+            offsets = min(keyed, key=len)
+        else:
+            low = bisect_left(self.by_time, (since,)) if since is not None else 0
+            # `until` is inclusive of every timestamp it prefixes ("2026-01" covers all of January)
+            high = bisect_right(self.by_time, (until + "\U0010ffff",)) if until is not None else len(self.by_time)
+            offsets = [offset for _, offset in self.by_time[low:high]]
+
+        matches = []
+        for offset in offsets:
+            row_agent, row_topic, timestamp = self.rows[offset]
+            if agent_id is not None and row_agent != agent_id:
+                continue
+            if topic is not None and row_topic != topic:
+                continue
+            if since is not None and timestamp < since:
+                continue
+            if until is not None and timestamp[:len(until)] > until:
+                continue
+            matches.append(offset)
+        return sorted(matches)
+
+
+_index = _DecisionIndex()
+_index_checked = False
+
+
+def _index_is_stale() -> bool:
+    """
+    True if the sidecar does not cover the log exactly: the log was written
+    after the sidecar, or its size differs from the end of the last indexed
+    entry. Caller holds the (shared) log lock.
+    """
+    log_stat, index_stat = os.stat(LOG_FILE), os.stat(INDEX_FILE)
+    if log_stat.st_mtime_ns > index_stat.st_mtime_ns:
+        return True
+
+    with open(INDEX_FILE, 'rb') as f:
+        f.seek(max(0, index_stat.st_size - 4096))
+        tail = [line for line in f.read().splitlines() if line.strip()]
+    if not tail:
+        return log_stat.st_size != 0
+    try:
+        offset = json.loads(tail[-1])["offset"]
+    except (ValueError, KeyError):
+        return True
+    with open(LOG_FILE, 'rb') as log:
+        log.seek(offset)
+        return offset + len(log.readline()) != log_stat.st_size
+
+
+def _prepare():
+    """Migrate the legacy log and build a missing or stale sidecar; False if nothing is logged."""
+    global _index_checked
+    if os.path.exists(LEGACY_LOG_FILE) and not os.path.exists(LOG_FILE):
+        migrate_legacy_log()
+    if not os.path.exists(LOG_FILE):
+        return False
+    if not os.path.exists(INDEX_FILE):
+        rebuild_index()
+    elif not _index_checked:
+        # First use in this process: catch a log edited or appended outside log_decision()
+        with locked(LOG_FILE, shared=True):
+            stale = _index_is_stale()
+        if stale:
+            rebuild_index()
+    _index_checked = True
+    return True
+
+
+def iter_decisions(
+    agent_id: Optional[str] = None,
+    topic: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+) -> Iterator[Dict]:
+    """
+    Decisions, oldest first, read lazily.
+
+    With no filters the log is streamed line by line. With filters, the
+    in-memory index selects matching offsets and only those entries are
+    read. `since` / `until` are ISO timestamps (prefixes such as "2026-01"
+    work). The lock is held only to snapshot the log's extent, so the caller
+    may log new decisions while iterating; those are not yielded.
+    """
+    if not _prepare():
+        return
+
+    unfiltered = agent_id is None and topic is None and since is None and until is None
+    with locked(LOG_FILE, shared=True):
+        end = os.path.getsize(LOG_FILE)
+        if not unfiltered:
+            _index.refresh()
+            offsets = _index.select(agent_id, topic, since, until)
+
+    with open(LOG_FILE, 'rb') as log:
+        if unfiltered:
+            while log.tell() < end:
+                line = log.readline()
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        for offset in offsets:
+            log.seek(offset)
+            yield json.loads(log.readline())
+
+
+def get_decisions(
+    agent_id: Optional[str] = None,
+    topic: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+) -> List[Dict]:
+    """All matching decisions as a list; see iter_decisions()."""
+    return list(iter_decisions(agent_id, topic, since, until))
+
+
+def count_decisions() -> int:
+    """Number of logged decisions (from the index; the log itself is not read)."""
+    if not _prepare():
+        return 0
+    with locked(LOG_FILE, shared=True):
+        _index.refresh()
+        return len(_index.rows)
+
+
+def rebuild_index():
+    """Regenerate decision_log.idx.jsonl from the log."""
+    with locked(LOG_FILE):
+        rows = []
+        offset = 0
+        if os.path.exists(LOG_FILE):
+            with open(LOG_FILE, 'rb') as f:
+                for raw in f:
+                    if raw.strip():
+                        entry = json.loads(raw)
+                        rows.append(json.dumps({
+                            "offset": offset,
+                            "agent_id": entry.get("agent_id"),
+                            "topic": entry.get("topic"),
+                            "timestamp": entry.get("timestamp")
+                        }) + "\n")
+                    offset += len(raw)
+        tmp_path = f"{INDEX_FILE}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.writelines(rows)
+        os.replace(tmp_path, INDEX_FILE)
+    print(f"[AUDIT] Index rebuilt: {len(rows)} decisions")
+
+
+def migrate_legacy_log():
+    """One-time move of decision_log.json (a JSON array) into the JSONL log."""
+    with locked(LOG_FILE):
+        if not os.path.exists(LEGACY_LOG_FILE):
+            return
+        try:
+            with open(LEGACY_LOG_FILE, 'r') as f:
+                legacy = json.load(f)
+        except json.JSONDecodeError as e:
+            print(f"[AUDIT] Could not migrate {LEGACY_LOG_FILE}: {e}")
+            return
+
+        _append_locked(legacy)
+        os.replace(LEGACY_LOG_FILE, LEGACY_LOG_FILE + ".migrated")
+    print(f"[AUDIT] Migrated {len(legacy)} decisions to {os.path.basename(LOG_FILE)}")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "migrate":
+        migrate_legacy_log()
+    elif command == "reindex":
+        rebuild_index()
+    else:
+        print("Usage: python decision_registry.py [migrate|reindex]")
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+DoD Verifier (The "Post-Generation Gate")
+-----------------------------------------
+Turns the Definition of Done checklists in 09_Audit_and_Governance/contracts
+into executable checks and runs them locally against a generated artifact.
+When a check fails, only the offending section is sent back to the model.
+
+Checks come from annotations placed under a checklist item:
+
+    *   [ ] **Acceptance Criteria:** Listed clearly (list or Gherkin).
+        <!-- check: section: Acceptance Criteria -->
+
+Supported kinds ("(scope)" is optional unless noted):
+    section: <Heading>                  heading must exist
+    columns (<Heading>): A, B           a table under the heading has these columns
+    pattern (<Heading>): <regex>        regex must match (inside the heading if scoped)
+    forbid: TBD, TODO                   none of these strings may appear
+    max_length: <chars>                 output length limit
+    field (<key>): <regex>              frontmatter key present (and matching)
+    xref: <key>                         frontmatter key references a known ID
+
+Items without annotations still get checks inferred from their text:
+frontmatter keys like `parent: <EPIC_ID>`, `@implements` tags and the
+backticked placeholders of "Template Integrity" items.
+
+Usage:
+    from dod_verifier import verify_output, verify_and_repair
+
+    failures = verify_output(story_markdown, "STORY", known_ids={"EPIC-001"})
+    fixed, remaining = verify_and_repair(story_markdown, "STORY", generate_fn)
+
+    # CLI
+    python scripts/dod_verifier.py STORY outputs/stories/Story_*.md
+"""
+
+import os
+import re
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from contracts_loader import load_dod_checklist
+
+ANNOTATION_PATTERN = re.compile(r'^(\w+)\s*(?:\(([^)]*)\))?\s*:\s*(.*)$')
+HEADING_PATTERN = re.compile(r'^\s{0,3}(#{1,6})\s+(.+?)\s*#*\s*$')
+TABLE_SEPARATOR_PATTERN = re.compile(r'^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$')
+FRONTMATTER_KEY_PATTERN = re.compile(r'^([A-Za-z_][\w-]*)\s*:\s*(.*?)\s*$')
+HINT_FIELD_PATTERN = re.compile(r'`([a-z_]+):\s*<?([A-Z][A-Z0-9_-]*)>?`')
+HINT_CODE_PATTERN = re.compile(r'`([^`]+)`')
+
+ID_PATTERN = r'^[A-Z][A-Z0-9]*-\d+$'
+# Words that are ordinary prose on their own; only these forms mark a placeholder
+PLACEHOLDER_FORMS = {"TODO": ["TODO:", "[TODO", "(TODO)", "<TODO>"]}
+FRONTMATTER = "frontmatter"
+
+
+class DocumentView:
+    """
+    Single-pass parse of a Markdown artifact: frontmatter, headings with their
+    line spans, and tables keyed by the heading they sit under.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lines = text.splitlines()
+        self.frontmatter: Dict[str, str] = {}
+        self.frontmatter_end = 0
+        self.headings: List[Dict] = []
+        self.tables: List[Dict] = []
+
+        start = 0
+        if self.lines and self.lines[0].strip() == "---":
+            for i in range(1, len(self.lines)):
+                if self.lines[i].strip() == "---":
+                    for line in self.lines[1:i]:
+                        match = FRONTMATTER_KEY_PATTERN.match(line)
+                        if match:
+                            self.frontmatter[match.group(1)] = match.group(2).strip("'\"")
+                    self.frontmatter_end = start = i + 1
+                    break
+
+        in_fence = False
+        for i in range(start, len(self.lines)):
+            line = self.lines[i]
+            if line.lstrip().startswith("```"):
+                in_fence = not in_fence
+                continue
+            if in_fence:
+                continue
+            heading = HEADING_PATTERN.match(line)
+            if heading:
+                self.headings.append({
+                    "level": len(heading.group(1)),
+                    "title": heading.group(2),
+                    "key": self._normalize(heading.group(2)),
+                    "start": i,
+                    "end": len(self.lines)
+                })
+            elif (line.lstrip().startswith("|") and i + 1 < len(self.lines)
+                  and TABLE_SEPARATOR_PATTERN.match(self.lines[i + 1])):
+                self.tables.append({
+                    "line": i,
+                    "columns": [self._normalize(c) for c in line.strip().strip("|").split("|")]
+                })
+
+        # A section runs until the next heading of the same or a higher level
+        for index, heading in enumerate(self.headings):
+            for later in self.headings[index + 1:]:
+                if later["level"] <= heading["level"]:
+                    heading["end"] = later["start"]
+                    break
+
+    @staticmethod
+    def _normalize(title: str) -> str:
+        title = re.sub(r'[*_`]', '', title)
+        title = re.sub(r'^\s*\d+(\.\d+)*\.?\s*', '', title)
+        return title.strip().casefold()
+
+    def find_section(self, name: str) -> Optional[Dict]:
+        key = self._normalize(name)
+        for heading in self.headings:
+            if heading["key"] == key:
+                return heading
+        for heading in self.headings:
+            if key in heading["key"]:
+                return heading
+        return None
+
+    def section_text(self, section: Dict) -> str:
+        return "\n".join(self.lines[section["start"]:section["end"]])
+
+    def sections_containing(self, needle: str) -> List[str]:
+        """Titles of the innermost sections whose own lines contain needle."""
+        titles = []
+        for index, heading in enumerate(self.headings):
+            own_end = heading["end"]
+            if index + 1 < len(self.headings):
+                own_end = min(own_end, self.headings[index + 1]["start"])
+            if needle in "\n".join(self.lines[heading["start"]:own_end]):
+                titles.append(heading["title"])
+        return titles
+
+
+def _parse_annotation(raw: str) -> Optional[Dict]:
+    match = ANNOTATION_PATTERN.match(raw)
+    if not match:
+        return None
+    kind, scope, arg = match.group(1).lower(), match.group(2), match.group(3).strip()
+    return {"kind": kind, "scope": scope.strip() if scope else None, "arg": arg}
+
+
+def _inferred_checks(item: Dict) -> List[Dict]:
+    """Conservative checks derived from the wording of an unannotated item."""
+    text = " ".join([item["text"]] + item["details"])
+    checks = []
+
+    if "frontmatter" in text.lower():
+        for key, _ in HINT_FIELD_PATTERN.findall(text):
+            checks.append({"kind": "field", "scope": key, "arg": ID_PATTERN})
+            if key == "parent":
+                checks.append({"kind": "xref", "scope": None, "arg": key})
+
+    if "@implements" in text:
+        checks.append({"kind": "pattern", "scope": None,
+                       "arg": r'@implements\s+[A-Z][A-Z0-9]*-\d+'})
+
+    if "template integrity" in item["title"].lower():
+        tokens = [t.split()[0] if t.startswith("[") else t for t in HINT_CODE_PATTERN.findall(text)]
+        tokens = ["{{" if t.startswith("{{") else t for t in tokens]
+        tokens = [form for t in tokens for form in PLACEHOLDER_FORMS.get(t, [t])]
+        if tokens:
+            checks.append({"kind": "forbid", "scope": None, "arg": ", ".join(dict.fromkeys(tokens))})
+
+    return checks
+
+
+def compile_checks(agent_role: str) -> List[Dict]:
+    """Executable checks for a role's contract, one entry per check."""
+    compiled = []
+    for item in load_dod_checklist(agent_role):
+        checks = [c for c in map(_parse_annotation, item.get("checks", [])) if c]
+        if not checks:
+            checks = _inferred_checks(item)
+        for check in checks:
+            if check["kind"] in ("pattern", "field") and check["arg"]:
+                check["regex"] = re.compile(check["arg"], re.MULTILINE)
+            compiled.append(dict(check, item_id=item["id"], title=item["title"]))
+    return compiled
+
+
+def _run_check(check: Dict, view: DocumentView, known_ids: Optional[Set[str]]) -> Optional[Dict]:
+    """Return a failure dict, or None when the check passes."""
+    kind, scope, arg = check["kind"], check["scope"], check["arg"]
+
+    def fail(message: str, location: Optional[str]) -> Dict:
+        return {"item_id": check["item_id"], "title": check["title"],
+                "kind": kind, "message": message, "location": location}
+
+    if kind == "section":
+        if not view.find_section(arg):
+            return fail(f"Missing section '{arg}'", arg)
+
+    elif kind == "columns":
+        wanted = [view._normalize(c) for c in arg.split(",") if c.strip()]
+        section = view.find_section(scope) if scope else None
+        if scope and not section:
+            return fail(f"Missing section '{scope}' (expected table with {arg})", scope)
+        tables = [t for t in view.tables
+                  if not section or section["start"] <= t["line"] < section["end"]]
+        if not any(all(w in t["columns"] for w in wanted) for t in tables):
+            return fail(f"No table with columns: {arg}", scope)
+
+    elif kind == "pattern":
+        if scope:
+            section = view.find_section(scope)
+            if not section:
+                return fail(f"Missing section '{scope}'", scope)
+            if not check["regex"].search(view.section_text(section)):
+                return fail(f"'{scope}' does not match /{arg}/", section["title"])
+        elif not check["regex"].search(view.text):
+            return fail(f"Output does not match /{arg}/", None)
+
+    elif kind == "forbid":
+        for token in (t.strip() for t in arg.split(",")):
+            if token and token in view.text:
+                sections = view.sections_containing(token)
+                return fail(f"Contains placeholder '{token}'", sections[0] if sections else None)
+
+    elif kind == "max_length":
+        if len(view.text) > int(arg):
+            return fail(f"Output too long: {len(view.text)} > {arg} characters", None)
+
+    elif kind == "field":
+        value = view.frontmatter.get(scope)
+        if not value:
+            return fail(f"Frontmatter is missing '{scope}'", FRONTMATTER)
+        if arg and not check["regex"].search(value):
+            return fail(f"Frontmatter '{scope}: {value}' does not match /{arg}/", FRONTMATTER)
+
+    elif kind == "xref":
+        value = view.frontmatter.get(arg)
+        if value and known_ids is not None and value not in known_ids:
+            return fail(f"Frontmatter '{arg}: {value}' does not reference a known artifact", FRONTMATTER)
+
+    return None
+
+
+def verify_output(output: str, agent_role: str, known_ids: Optional[Iterable[str]] = None) -> List[Dict]:
+    """
+    Run every executable DoD check for a role against the output.
+
+    Args:
+        output: The generated Markdown artifact
+        agent_role: Contract prefix (e.g. 'STORY', 'EPIC', 'PRD')
+        known_ids: IDs that cross-references may point to (skipped if None)
+
+    Returns:
+        List of failures: {"item_id", "title", "kind", "message", "location"}.
+        "location" is the section to regenerate ("frontmatter" for metadata,
+        None when the failure is not tied to a section).
+    """
+    view = DocumentView(output)
+    known = set(known_ids) if known_ids is not None else None
+    failures = []
+    for check in compile_checks(agent_role):
+        failure = _run_check(check, view, known)
+        if failure:
+            failures.append(failure)
+    return failures
+
+
+def _instructions(failures: List[Dict]) -> str:
+    return "\n".join(f"- [{f['item_id']}] {f['title']}: {f['message']}" for f in failures)
+
+
+def _strip_fences(text: str) -> str:
+    text = text.strip()
+    match = re.match(r'^```\w*\n([\s\S]*?)\n```$', text)
+    return match.group(1) if match else text
+
+
+def repair_sections(output: str, failures: List[Dict], generate_fn: Callable[[str], str]) -> str:
+    """
+    Regenerate only the sections named by the failures and splice them back.
+    Failures without a location are left for the caller.
+
+    Args:
+        output: The generated Markdown artifact
+        failures: Result of verify_output()
+        generate_fn: Callable taking a prompt and returning the model's text
+    """
+    by_location: Dict[str, List[Dict]] = {}
+    for failure in failures:
+        if failure["location"]:
+            by_location.setdefault(failure["location"], []).append(failure)
+
+    for location, section_failures in by_location.items():
+        view = DocumentView(output)
+        rules = _instructions(section_failures)
+
+        if location == FRONTMATTER:
+            current = "\n".join(view.lines[:view.frontmatter_end])
+            prompt = (
+                "Write ONLY the YAML frontmatter block (between '---' lines) for the document below.\n"
+                f"It must satisfy:\n{rules}\n\nCurrent frontmatter:\n{current or '(none)'}\n\n"
+                f"Document:\n{output[:4000]}"
+            )
+            block = _strip_fences(generate_fn(prompt))
+            if not block.startswith("---"):
+                block = f"---\n{block}\n---"
+            body = "\n".join(view.lines[view.frontmatter_end:])
+            output = f"{block}\n{body}"
+            continue
+
+        section = view.find_section(location)
+        if section:
+            prompt = (
+                "Rewrite ONLY the following Markdown section, keeping its heading.\n"
+                f"It must satisfy:\n{rules}\n\nSection:\n{view.section_text(section)}"
+            )
+            replacement = _strip_fences(generate_fn(prompt))
+            lines = view.lines[:section["start"]] + replacement.splitlines() + view.lines[section["end"]:]
+            output = "\n".join(lines)
+        else:
+            prompt = (
+                f"Write ONLY a new Markdown section with the heading '## {location}' for the document below.\n"
+                f"It must satisfy:\n{rules}\n\nDocument:\n{output[:4000]}"
+            )
+            addition = _strip_fences(generate_fn(prompt))
+            output = f"{output.rstrip()}\n\n{addition}\n"
+
+    return output
+
+
+def verify_and_repair(output: str, agent_role: str, generate_fn: Callable[[str], str],
+                      known_ids: Optional[Iterable[str]] = None, max_rounds: int = 1):
+    """
+    Verify, regenerate failing sections, and re-verify.
+
+    Returns:
+        (output, remaining_failures)
+    """
+    failures = verify_output(output, agent_role, known_ids)
+    for _ in range(max_rounds):
+        if not any(f["location"] for f in failures):
+            break
+        output = repair_sections(output, failures, generate_fn)
+        failures = verify_output(output, agent_role, known_ids)
+    return output, failures
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python dod_verifier.py <AGENT_ROLE> <file.md> [file.md ...]")
+        print("Example: python dod_verifier.py STORY outputs/stories/Story_Login.md")
+        sys.exit(1)
+
+    role = sys.argv[1]
+    exit_code = 0
+    for path in sys.argv[2:]:
+        with open(path, 'r', encoding='utf-8') as f:
+            results = verify_output(f.read(), role)
+        status = "PASS" if not results else f"FAIL ({len(results)})"
+        print(f"{status}: {path}")
+        for result in results:
+            where = f" [{result['location']}]" if result["location"] else ""
+            print(f"   - {result['item_id']} {result['title']}: {result['message']}{where}")
+        exit_code = exit_code or (1 if results else 0)
+    sys.exit(exit_code)
@@ -2,17 +2,54 @@ import os
 import requests
 import json
 import base64
-from typing import Dict, List, Optional
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
 
 # Load environment variables
 load_dotenv()
 
+# Jira Cloud accepts at most 50 issues per bulk create request
+BULK_CREATE_LIMIT = 50
+
+# Throttling (429) and transient gateway errors worth another attempt
+RETRY_STATUSES = {429, 502, 503, 504}
+# Jira rejects throttled requests before processing them, so POSTs may retry these safely
+SAFE_POST_RETRY_STATUSES = {429, 503}
+MAX_BACKOFF_SECONDS = 60.0
+
+def _never_sent(error: Exception) -> bool:
+    """True if the request failed before reaching Jira (connect timeout or refused connection)."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(error, requests.ConnectionError) and isinstance(reason, NewConnectionError)
+
 class JiraClient:
     """
     A specific wrapper for the Jira Cloud REST API v3.
+
+    All requests share one pooled requests.Session (keep-alive, so bulk syncs
+    reuse a handful of TLS connections), use connect/read timeouts and retry
+    throttled or transient failures with exponential backoff, honoring
+    Jira's Retry-After header. Per-endpoint request metrics are available
+    from metrics().
+
+    Settings (constructor argument, else environment variable):
+        base_url     JIRA_BASE_URL     (default https://<JIRA_DOMAIN>/rest/api/3;
+                                        point at a local stand-in server for testing)
+        timeout      JIRA_CONNECT_TIMEOUT / JIRA_READ_TIMEOUT (seconds, default 5 / 30)
+        max_retries  JIRA_MAX_RETRIES  (default 4)
+        backoff      JIRA_BACKOFF      (base seconds, default 0.5)
+        pool_size    JIRA_POOL_SIZE    (connections kept alive, default 8)
     """
-    def __init__(self):
+    def __init__(self, base_url: str = None, timeout=None, max_retries: int = None,
+                 backoff: float = None, pool_size: int = None):
         self.email = os.getenv("JIRA_EMAIL")
         self.token = os.getenv("JIRA_API_TOKEN")
         self.domain = os.getenv("JIRA_DOMAIN")  # e.g., "your-domain.atlassian.net"
@@ -24,7 +61,21 @@ class JiraClient:
         else:
             self.enabled = True
             
-        self.base_url = f"https://{self.domain}/rest/api/3"
+        self.base_url = (base_url or os.getenv("JIRA_BASE_URL") or f"https://{self.domain}/rest/api/3").rstrip("/")
+        self.timeout = timeout or (float(os.getenv("JIRA_CONNECT_TIMEOUT", "5")),
+                                   float(os.getenv("JIRA_READ_TIMEOUT", "30")))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("JIRA_MAX_RETRIES", "4"))
+        self.backoff = backoff if backoff is not None else float(os.getenv("JIRA_BACKOFF", "0.5"))
+        pool_size = pool_size or int(os.getenv("JIRA_POOL_SIZE", "8"))
+
+        # One keep-alive pool shared by every call (and by sync's worker threads)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._metrics_lock = threading.Lock()
+        self._metrics = {}
         
         # Auth header
         if self.enabled:
@@ -34,32 +85,122 @@ class JiraClient:
                 "Content-Type": "application/json",
                 "Accept": "application/json"
             }
+            self.session.headers.update(self.auth_header)
 
-    def _post(self, endpoint: str, data: Dict) -> Optional[Dict]:
+    def close(self):
+        """Releases pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _record(self, method: str, endpoint: str, elapsed: float, status: Optional[int], retried: bool):
+        key = f"{method} {endpoint}"
+        with self._metrics_lock:
+            stats = self._metrics.setdefault(key, {
+                "requests": 0, "retries": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0, "statuses": {}
+            })
+            stats["requests"] += 1
+            stats["total_seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+            stats["retries"] += retried
+            if status is None or status >= 400:
+                stats["errors"] += 1
+            label = str(status) if status is not None else "connection_error"
+            stats["statuses"][label] = stats["statuses"].get(label, 0) + 1
+
+    def metrics(self) -> Dict[str, Dict]:
+        """
+        Per-endpoint counters since construction, e.g.
+        {"POST issue/bulk": {"requests": 3, "retries": 1, "errors": 1,
+         "avg_ms": 412.0, "max_ms": 980.5, "statuses": {"201": 2, "429": 1}}}
+        Every HTTP attempt counts as a request; "retries" counts the repeats.
+        """
+        with self._metrics_lock:
+            return {
+                key: {
+                    "requests": stats["requests"],
+                    "retries": stats["retries"],
+                    "errors": stats["errors"],
+                    "avg_ms": round(1000 * stats["total_seconds"] / stats["requests"], 1),
+                    "max_ms": round(1000 * stats["max_seconds"], 1),
+                    "statuses": dict(stats["statuses"])
+                }
+                for key, stats in self._metrics.items()
+            }
+
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Retry-After (seconds or HTTP date) when Jira sends it, else exponential backoff with jitter."""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(MAX_BACKOFF_SECONDS, max(0.0, float(retry_after)))
+            except ValueError:
+                try:
+                    return min(MAX_BACKOFF_SECONDS, max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()))
+                except (TypeError, ValueError):
+                    pass
+        return min(MAX_BACKOFF_SECONDS, self.backoff * (2 ** attempt)) * random.uniform(0.5, 1.0)
+
+    def _send(self, method: str, endpoint: str, **kwargs) -> Tuple[Optional[Dict], Optional[int], bool]:
+        """
+        Performs the request with retries.
+
+        Returns:
+            (body, status, sent): parsed JSON body (also for error responses,
+            when Jira sends one), the final HTTP status (None if no response
+            arrived) and whether the request may have reached Jira.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        # Creates are not idempotent: only retry a POST when Jira never processed it
+        retry_statuses = RETRY_STATUSES if method == "GET" else SAFE_POST_RETRY_STATUSES
+
+        for attempt in range(self.max_retries + 1):
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except requests.RequestException as e:
+                self._record(method, endpoint, time.monotonic() - started, None, attempt > 0)
+                never_sent = _never_sent(e)
+                retryable = isinstance(e, (requests.ConnectionError, requests.Timeout)) if method == "GET" else never_sent
+                if retryable and attempt < self.max_retries:
+                    time.sleep(self._retry_delay(attempt, None))
+                    continue
+                print(f"❌ Jira {method} Error ({endpoint}): {e}")
+                return None, None, not never_sent
+
+            self._record(method, endpoint, time.monotonic() - started, response.status_code, attempt > 0)
+            if response.status_code in retry_statuses and attempt < self.max_retries:
+                time.sleep(self._retry_delay(attempt, response))
+                continue
+
+            try:
+                body = response.json() if response.content else {}
+            except ValueError:
+                body = None
+            if response.status_code >= 400:
+                print(f"❌ Jira {method} Error ({endpoint}): HTTP {response.status_code}")
+                print(response.text)
+            return body, response.status_code, True
+
+    def _request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict]:
+        """JSON body of a successful response, else None."""
         if not self.enabled: return None
-        try:
-            url = f"{self.base_url}/{endpoint}"
-            response = requests.post(url, headers=self.auth_header, json=data)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            print(f"❌ Jira POST Error ({endpoint}): {e}")
-            if response: print(response.text)
-            return None
+        body, status, _ = self._send(method, endpoint, **kwargs)
+        return body if status is not None and status < 400 else None
+
+    def _post(self, endpoint: str, data: Dict) -> Optional[Dict]:
+        return self._request("POST", endpoint, json=data)
 
     def _get(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
-        if not self.enabled: return None
-        try:
-            url = f"{self.base_url}/{endpoint}"
-            response = requests.get(url, headers=self.auth_header, params=params)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            print(f"❌ Jira GET Error ({endpoint}): {e}")
-            return None
+        return self._request("GET", endpoint, params=params)
 
-    def create_issue(self, project_key: str, summary: str, description: str, issue_type: str, parent_key: str = None) -> Optional[str]:
-        """Creates an issue and returns its KEY (e.g. PROJ-123)."""
+    def build_issue_payload(self, project_key: str, summary: str, description: str, issue_type: str,
+                            parent_key: str = None, labels: List[str] = None) -> Dict:
+        """Request body for one issue (shared by single and bulk create)."""
         payload = {
             "fields": {
                 "project": {"key": project_key},
@@ -84,12 +225,59 @@ class JiraClient:
                 # Linking to Epic might vary by setup, but 'parent' field is standard in V3 for Team-Managed
                 payload["fields"]["parent"] = {"key": parent_key} 
 
+        if labels:
+            payload["fields"]["labels"] = list(labels)
+
+        return payload
+
+    def create_issue(self, project_key: str, summary: str, description: str, issue_type: str, parent_key: str = None) -> Optional[str]:
+        """Creates an issue and returns its KEY (e.g. PROJ-123)."""
+        return self.create_issue_from_payload(
+            self.build_issue_payload(project_key, summary, description, issue_type, parent_key)
+        )
+
+    def create_issue_from_payload(self, payload: Dict) -> Optional[str]:
+        """Creates an issue from a build_issue_payload() body and returns its KEY."""
         response = self._post("issue", payload)
         if response:
             print(f"✅ Created Jira Issue: {response['key']}")
             return response['key']
         return None
 
+    def create_issues_bulk(self, payloads: List[Dict]) -> Optional[List[Optional[str]]]:
+        """
+        Creates up to BULK_CREATE_LIMIT issues in one request (POST issue/bulk).
+
+        Returns:
+            Keys aligned with `payloads` (None for elements that were rejected
+            or whose outcome is unknown), or None only when the bulk endpoint
+            is unsupported (404/405) or the request never reached Jira, so
+            creating the same payloads one by one cannot duplicate issues.
+        """
+        if len(payloads) > BULK_CREATE_LIMIT:
+            raise ValueError(f"Bulk create accepts at most {BULK_CREATE_LIMIT} issues per request")
+        if not self.enabled: return None
+        response, status, sent = self._send("POST", "issue/bulk", json={"issueUpdates": payloads})
+        if not sent or status in (404, 405):
+            return None
+        if status is None or (status >= 400 and not (response and "errors" in response)):
+            # Timeout or server error after sending: issues may exist, so do not re-create them here
+            return [None] * len(payloads)
+
+        failed = {}
+        for error in response.get("errors", []):
+            failed[error.get("failedElementNumber")] = error.get("elementErrors", {})
+        # Jira lists created issues in request order, skipping failed elements
+        created = iter(response.get("issues", []))
+        keys = []
+        for i in range(len(payloads)):
+            if i in failed:
+                print(f"❌ Jira bulk element {i} rejected: {failed[i]}")
+                keys.append(None)
+            else:
+                keys.append(next(created, {}).get("key"))
+        return keys
+
     def link_issues(self, outward_key: str, inward_key: str, link_type: str = "Relates"):
         """Links two issues."""
         payload = {
@@ -107,3 +295,27 @@ class JiraClient:
         if response and "issues" in response:
             return response["issues"]
         return []
+
+    def find_issues_by_label(self, project_key: str, labels: List[str]) -> Optional[Dict[str, str]]:
+        """
+        Issues in the project carrying any of `labels`, as {label: key}.
+
+        Returns None if a search failed, so callers can tell "not created"
+        (label absent from the result) from "could not check".
+        """
+        found = {}
+        for start in range(0, len(labels), BULK_CREATE_LIMIT):
+            chunk = labels[start:start + BULK_CREATE_LIMIT]
+            quoted = ", ".join(f'"{label}"' for label in chunk)
+            response = self._get("search", {
+                "jql": f'project = "{project_key}" AND labels in ({quoted})',
+                "fields": "labels",
+                "maxResults": 2 * len(chunk)
+            })
+            if response is None:
+                return None
+            for issue in response.get("issues", []):
+                for label in issue.get("fields", {}).get("labels", []):
+                    if label in chunk:
+                        found.setdefault(label, issue["key"])
+        return found
@@ -0,0 +1,15 @@
+"""
+Shared test setup: the framework's modules live in numbered pillar
+directories (not packages), so put them on sys.path the same way the
+agents do.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for directory in ("00_Introduction/standards", "scripts", "08_AI_Planning_Intelligence"):
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
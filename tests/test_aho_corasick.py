@@ -0,0 +1,8 @@
+from aho_corasick import AhoCorasick
+
+
+def test_overlapping_patterns_are_all_found():
+    automaton = AhoCorasick(["he", "she", "his", "hers", ""])
+    assert automaton.patterns == ["he", "she", "his", "hers"]
+    assert automaton.find_all("ushers") == {0, 1, 3}
+    assert sorted(automaton.iter_matches("ushers")) == [(1, 1), (2, 0), (2, 3)]
@@ -0,0 +1,10 @@
+from contracts_loader import load_dod, load_dod_checklist
+
+
+def test_check_annotations_stay_out_of_prompts():
+    for mode in ("suffix", "prefix"):
+        prompt = load_dod("STORY", mode=mode)
+        assert "Definition of Done" in prompt
+        assert "check:" not in prompt
+
+    assert any(item["checks"] for item in load_dod_checklist("STORY"))
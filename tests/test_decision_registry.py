@@ -0,0 +1,73 @@
+import json
+import types
+
+import pytest
+
+import decision_registry
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(decision_registry, "LOG_FILE", str(tmp_path / "decision_log.jsonl"))
+    monkeypatch.setattr(decision_registry, "INDEX_FILE", str(tmp_path / "decision_log.idx.jsonl"))
+    monkeypatch.setattr(decision_registry, "LEGACY_LOG_FILE", str(tmp_path / "decision_log.json"))
+    monkeypatch.setattr(decision_registry, "_index", decision_registry._DecisionIndex())
+    monkeypatch.setattr(decision_registry, "_index_checked", False)
+    return decision_registry
+
+
+def _restart(registry, monkeypatch):
+    """Forget in-memory state, as a new process would."""
+    monkeypatch.setattr(registry, "_index", registry._DecisionIndex())
+    monkeypatch.setattr(registry, "_index_checked", False)
+
+
+def _log(registry, agent_id, topic):
+    registry.log_decision(agent_id, topic, ["a", "b"], "a", "because")
+
+
+def test_filters_select_from_index(registry):
+    _log(registry, "ARCH_AGENT", "Database")
+    _log(registry, "PM_AGENT", "Scope")
+    _log(registry, "ARCH_AGENT", "Queue")
+
+    assert [d["topic"] for d in registry.get_decisions(agent_id="ARCH_AGENT")] == ["Database", "Queue"]
+    assert [d["agent_id"] for d in registry.get_decisions(topic="Scope")] == ["PM_AGENT"]
+    assert len(registry.get_decisions()) == 3
+    assert registry.count_decisions() == 3
+
+
+def test_iter_decisions_is_lazy_and_allows_logging(registry):
+    _log(registry, "ARCH_AGENT", "Database")
+    _log(registry, "ARCH_AGENT", "Queue")
+
+    decisions = registry.iter_decisions(agent_id="ARCH_AGENT")
+    assert isinstance(decisions, types.GeneratorType)
+    seen = []
+    for decision in decisions:
+        seen.append(decision["topic"])
+        _log(registry, "ARCH_AGENT", "Follow-up to " + decision["topic"])
+
+    assert seen == ["Database", "Queue"]
+    assert registry.count_decisions() == 4
+
+
+def test_stale_sidecar_is_rebuilt_on_first_use(registry, monkeypatch):
+    _log(registry, "ARCH_AGENT", "Database")
+    with open(registry.LOG_FILE, "a") as f:
+        f.write(json.dumps({"timestamp": "2026-02-01T00:00:00", "agent_id": "QA_AGENT",
+                            "topic": "Coverage", "options": [], "selected": "80%",
+                            "rationale": "added by hand"}) + "\n")
+
+    _restart(registry, monkeypatch)
+    assert [d["topic"] for d in registry.get_decisions(agent_id="QA_AGENT")] == ["Coverage"]
+    assert registry.count_decisions() == 2
+
+
+def test_legacy_log_is_migrated(registry):
+    with open(registry.LEGACY_LOG_FILE, "w") as f:
+        json.dump([{"timestamp": "2025-12-01T00:00:00", "agent_id": "ARCH_AGENT",
+                    "topic": "Cache", "options": [], "selected": "Redis", "rationale": ""}], f)
+
+    assert [d["selected"] for d in registry.get_decisions(since="2025-12")] == ["Redis"]
+    assert registry.get_decisions(until="2025-11") == []
@@ -0,0 +1,51 @@
+import gc
+import json
+import os
+import weakref
+
+import pytest
+
+import follow_up_manager
+from follow_up_manager import FollowUpManager
+
+
+@pytest.fixture(autouse=True)
+def quiet_console(monkeypatch):
+    monkeypatch.setattr(follow_up_manager.console, "print", lambda *a, **k: None)
+
+
+def test_stale_markdown_is_rendered_at_init(tmp_path):
+    manager = FollowUpManager(str(tmp_path), render_interval=3600)
+    manager.add_item("Which SSO provider?", context="PRD")
+    manager.flush()
+    markdown = tmp_path / "open_questions.md"
+
+    # Another process appends without rendering (e.g. it was killed before exit)
+    with open(tmp_path / "open_questions.jsonl", "a") as f:
+        f.write(json.dumps({"event": "add", "id": 2, "question": "Data retention?", "status": "🟡 Open"}) + "\n")
+    os.utime(markdown, ns=(0, 0))
+
+    FollowUpManager(str(tmp_path))
+    assert "Data retention?" in markdown.read_text()
+
+
+def test_legacy_markdown_is_migrated_and_ids_continue(tmp_path):
+    (tmp_path / "open_questions.md").write_text(
+        "# Open Questions (Follow-Up Items)\n\n"
+        "| ID | Question | Status | Context | Created |\n"
+        "|----|----------|--------|---------|---------|\n"
+        "| 1 | Budget? | 🟡 Open | PRD | 2026-01-02 |\n"
+        "| 4 | Region? | ✅ Resolved | ARCH | 2026-01-03 |\n"
+    )
+    manager = FollowUpManager(str(tmp_path))
+
+    assert [item["id"] for item in manager.get_open_items()] == [1]
+    assert manager.add_item("Latency budget?")["id"] == 5
+
+
+def test_managers_are_not_kept_alive_for_exit(tmp_path):
+    manager = FollowUpManager(str(tmp_path))
+    ref = weakref.ref(manager)
+    del manager
+    gc.collect()
+    assert ref() is None
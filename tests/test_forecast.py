@@ -0,0 +1,40 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import forecast
+from forecast import DeliveryForecaster
+from planning_agent import DependencyGraph
+
+
+def _graph():
+    return DependencyGraph([
+        {"id": "S1", "points": 5, "status": "Done"},
+        {"id": "S2", "points": 3, "status": "closed"},
+        {"id": "S3", "points": 8, "status": None, "dependencies": ["S1"]},
+        {"id": "S4", "points": 5, "status": "In Progress", "dependencies": ["S3", "S2"]},
+    ])
+
+
+def test_done_statuses_match_health_engine():
+    forecaster = DeliveryForecaster(_graph(), [10], seed=1)
+    assert forecaster.ids == ["S3", "S4"]
+
+
+def test_chunks_are_sized_by_stories_plus_horizon(monkeypatch):
+    forecaster = DeliveryForecaster(_graph(), [10, 12], seed=1)
+    sizes = []
+    simulate_chunk = forecaster._simulate_chunk
+
+    def spy(trials):
+        sizes.append(trials)
+        return simulate_chunk(trials)
+
+    monkeypatch.setattr(forecaster, "_simulate_chunk", spy)
+    monkeypatch.setattr(forecast, "CHUNK_CELLS", 60)
+    result = forecaster.simulate(trials=100)
+
+    # 2 stories + a horizon of at least 2 sprints: never more than 15 trials per chunk
+    assert sum(sizes) == 100
+    assert max(sizes) <= 15
+    assert result["percentiles"][50] >= 2
@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from guardrails import ApprovalGate
+
+
+@pytest.fixture
+def gate(tmp_path):
+    return ApprovalGate(audit_log_path=str(tmp_path / "approval_log.jsonl"))
+
+
+def test_failed_write_keeps_items_queued(gate, tmp_path):
+    blocked = tmp_path / "blocked"
+    blocked.write_text("a file where a directory is needed")
+    first = gate.queue.submit("write_prd", "PRD", target_path=str(blocked / "prd.md"))
+    second = gate.queue.submit("write_epic", "EPIC", target_path=str(tmp_path / "epic.md"))
+
+    with pytest.raises(OSError):
+        gate.queue.decide([first, second], approved=True)
+
+    assert [item["id"] for item in gate.queue.pending()] == [first, second]
+    assert not (tmp_path / "approval_log.jsonl").exists()
+
+
+def test_decide_flushes_and_audits(gate, tmp_path):
+    target = tmp_path / "out" / "prd.md"
+    item_id = gate.queue.submit("write_prd", "PRD v2", target_path=str(target))
+
+    assert len(gate.queue.decide([item_id], approved=True)) == 1
+    assert target.read_text() == "PRD v2"
+    assert gate.queue.pending() == []
+    with open(tmp_path / "approval_log.jsonl") as f:
+        assert json.loads(f.readline())["decision"] == "approved"
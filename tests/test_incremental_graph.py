@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from incremental_graph import CycleError, IncrementalDependencyGraph
+from planning_agent import DependencyGraph
+
+STORIES = [
+    {"id": "DB-1", "points": 3},
+    {"id": "API-1", "points": 5, "dependencies": ["DB-1", "EXT-AUTH"]},
+    {"id": "UI-1", "points": 2, "dependencies": ["API-1"]},
+    {"id": "DOC-1", "points": 1},
+]
+
+
+def _assert_topological(graph):
+    position = {node: i for i, node in enumerate(graph.topological_sort())}
+    for node, preds in graph.pred.items():
+        for p in preds:
+            assert position[p] < position[node]
+
+
+def test_matches_full_rebuild_after_edits():
+    graph = IncrementalDependencyGraph(STORIES)
+    graph.add_dependency("DB-1", "DOC-1")  # DOC-1 was ordered after DB-1: forces a reorder
+    graph.set_points("DOC-1", 4)
+    _assert_topological(graph)
+
+    rebuilt = DependencyGraph([dict(graph.stories[s]) for s in graph.stories if s not in graph.placeholders])
+    assert sorted(map(sorted, graph.get_layers())) == sorted(map(sorted, rebuilt.get_layers()))
+    assert graph.get_critical_path() == ["DOC-1", "DB-1", "API-1", "UI-1"]
+    assert graph.duration() == 4 + 3 + 5 + 2
+
+
+def test_cycle_is_rejected_and_rolled_back():
+    graph = IncrementalDependencyGraph(STORIES)
+    before = (graph.topological_sort(), dict(graph.earliest_start))
+
+    with pytest.raises(CycleError):
+        graph.add_dependency("DB-1", "UI-1")
+    with pytest.raises(CycleError):
+        graph.add_story({"id": "DB-1", "points": 8, "dependencies": ["NEW-1", "UI-1"]})
+
+    assert "NEW-1" not in graph.stories
+    assert graph.stories["DB-1"]["points"] == 3
+    assert (graph.topological_sort(), dict(graph.earliest_start)) == before
+
+
+def test_checkpoint_skips_placeholders_and_replays_log(tmp_path):
+    path = str(tmp_path / "backlog_state.json")
+    graph = IncrementalDependencyGraph(STORIES, path=path)
+    assert "EXT-AUTH" in graph.placeholders
+    graph.checkpoint()
+    graph.add_story({"id": "QA-1", "points": 2, "dependencies": ["UI-1", "EXT-PERF"]})
+    graph.close()
+
+    with open(path) as f:
+        assert [s["id"] for s in json.load(f)["stories"] if s["id"].startswith("EXT")] == []
+
+    reopened = IncrementalDependencyGraph.open(path)
+    assert reopened.placeholders == {"EXT-AUTH", "EXT-PERF"}
+    assert reopened.get_critical_path()[-1] == "QA-1"
+    reopened.checkpoint()
+
+    with open(path) as f:
+        ids = {s["id"] for s in json.load(f)["stories"]}
+    assert ids == {"DB-1", "API-1", "UI-1", "DOC-1", "QA-1"}
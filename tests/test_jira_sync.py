@@ -0,0 +1,110 @@
+"""
+Jira sync against a local stand-in server (JIRA_BASE_URL), covering the
+bulk key mapping and recovery from a bulk create whose outcome is unknown.
+"""
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from jira_client import JiraClient
+from planning_agent import PlanningAgent
+
+
+class StandInJira:
+    def __init__(self):
+        self.issues = []          # {"key", "fields"}
+        self.fail_next_bulk = False
+        self.reject_summaries = set()
+        self.bulk_requests = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stand_in.bulk_requests += 1
+                issues, errors = [], []
+                for number, update in enumerate(payload["issueUpdates"]):
+                    if update["fields"]["summary"] in stand_in.reject_summaries:
+                        errors.append({"failedElementNumber": number, "elementErrors": {"errors": {"summary": "bad"}}})
+                        continue
+                    key = f"PROJ-{len(stand_in.issues) + 1}"
+                    stand_in.issues.append({"key": key, "fields": update["fields"]})
+                    issues.append({"key": key})
+                if stand_in.fail_next_bulk:
+                    # Created, but the caller never learns the keys
+                    stand_in.fail_next_bulk = False
+                    self._reply(500, {})
+                    return
+                self._reply(201, {"issues": issues, "errors": errors})
+
+            def do_GET(self):
+                jql = parse_qs(urlparse(self.path).query)["jql"][0]
+                matches = [issue for issue in stand_in.issues
+                           if any(f'"{label}"' in jql for label in issue["fields"].get("labels", []))]
+                self._reply(200, {"issues": [{"key": i["key"], "fields": {"labels": i["fields"]["labels"]}}
+                                             for i in matches]})
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/rest/api/3"
+
+
+@pytest.fixture
+def jira(monkeypatch):
+    stand_in = StandInJira()
+    for name, value in {"JIRA_EMAIL": "dev@example.com", "JIRA_API_TOKEN": "token", "JIRA_DOMAIN": "example",
+                        "JIRA_BASE_URL": stand_in.url, "JIRA_MAX_RETRIES": "0", "JIRA_PROJECT_KEY": "PROJ"}.items():
+        monkeypatch.setenv(name, value)
+    yield stand_in
+    stand_in.server.shutdown()
+
+
+def _backlog(tmp_path):
+    path = tmp_path / "backlog.json"
+    path.write_text(json.dumps({
+        "epics": [{"id": "EPIC-1", "summary": "Checkout", "type": "Epic"}],
+        "stories": [{"id": "S-1", "summary": "Pay by card", "parent": "EPIC-1"},
+                    {"id": "S-2", "summary": "Pay by invoice", "parent": "EPIC-1"}]
+    }))
+    return path
+
+
+def test_bulk_keys_skip_rejected_elements(jira):
+    jira.reject_summaries = {"two"}
+    with JiraClient() as client:
+        payloads = [client.build_issue_payload("PROJ", summary, "", "Story") for summary in ("one", "two", "three")]
+        assert client.create_issues_bulk(payloads) == ["PROJ-1", None, "PROJ-2"]
+
+
+def test_unknown_outcome_is_reconciled_not_recreated(jira, tmp_path, capsys):
+    path = _backlog(tmp_path)
+    checkpoint = f"{path}.sync-checkpoint.jsonl"
+
+    jira.fail_next_bulk = True
+    PlanningAgent().sync(str(path), workers=2)
+    assert len(jira.issues) == 1
+    with open(checkpoint) as f:
+        assert [json.loads(line) for line in f] == [{"id": "EPIC-1", "status": "unknown"}]
+
+    PlanningAgent().sync(str(path), workers=2)
+    data = json.loads(path.read_text())
+    assert data["epics"][0]["jira_id"] == "PROJ-1"
+    assert [s["jira_id"] for s in data["stories"]] == ["PROJ-2", "PROJ-3"]
+    assert len(jira.issues) == 3
+    assert jira.issues[1]["fields"]["parent"] == {"key": "PROJ-1"}
+    assert not os.path.exists(checkpoint)
@@ -0,0 +1,46 @@
+import json
+
+from planning_agent import DependencyGraph, PlanningAgent
+
+
+def test_health_json_to_stdout_stays_parseable(tmp_path, capsys):
+    PlanningAgent().health(str(tmp_path / "missing.json"), json_path="-")
+
+    captured = capsys.readouterr()
+    report = json.loads(captured.out)
+    assert set(report["summary"]) == {"HEALTHY", "AT_RISK", "BLOCKED", "DONE"}
+    assert "Invalid JSON input file" in captured.err
+
+
+def test_critical_path_and_slack():
+    graph = DependencyGraph([
+        {"id": "DB", "points": 3},
+        {"id": "API", "points": 5, "dependencies": ["DB"]},
+        {"id": "UI", "points": 2, "dependencies": ["API"]},
+        {"id": "DOCS", "points": 1, "dependencies": ["DB"]},
+    ])
+    analysis = graph.analyze_critical_path()
+
+    assert analysis["critical_path"] == ["DB", "API", "UI"]
+    assert analysis["duration"] == 10
+    assert analysis["slack"] == {"DB": 0, "API": 0, "UI": 0, "DOCS": 6}
+    assert analysis["latest_start"]["DOCS"] == 9
+
+
+def test_cycles_are_reported_with_edges_to_break():
+    graph = DependencyGraph([
+        {"id": "A", "dependencies": ["C"]},
+        {"id": "B", "dependencies": ["A"]},
+        {"id": "C", "dependencies": ["B"]},
+        {"id": "D", "dependencies": ["D"]},
+        {"id": "E", "dependencies": ["A"]},
+    ])
+    assert graph.topological_sort() is None
+    assert graph.get_critical_path() == []
+
+    report = graph.find_cycles()
+    assert sorted(map(sorted, report["components"])) == [["A", "B", "C"], ["D"]]
+    assert ("D", "D") in report["feedback_edges"]
+    assert len(report["feedback_edges"]) == 2
+    layered = [node for layer in report["layers"] for node in layer]
+    assert sorted(layered) == ["A", "B", "C", "D", "E"]
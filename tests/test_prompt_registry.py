@@ -0,0 +1,120 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import prompt_registry
+from prompt_registry import PromptRegistry, SQLitePromptStore, TemplateError, compile_template
+
+
+@pytest.fixture(autouse=True)
+def quiet_console(monkeypatch):
+    monkeypatch.setattr(prompt_registry.console, "print", lambda *a, **k: None)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    (tmp_path / "prompts").mkdir()
+    (tmp_path / "prompts" / "prd.md").write_text("Write a PRD for {{ feature }}\n")
+    reg = PromptRegistry(
+        registry_path=str(tmp_path / "prompts" / "registry.json"),
+        prompts_base=str(tmp_path),
+    )
+    reg.register_prompt("PRD_GEN", "prompts/prd.md")
+    return reg
+
+
+def test_watch_fires_hook_after_another_caller_rehashed(registry, tmp_path, monkeypatch):
+    monkeypatch.setattr(prompt_registry, "Observer", None)
+    fired = threading.Event()
+    events = []
+
+    def hook(event):
+        events.append(event)
+        fired.set()
+
+    registry.add_invalidation_hook(hook)
+    stop = registry.watch(interval=0.05)
+    try:
+        time.sleep(0.2)
+        path = tmp_path / "prompts" / "prd.md"
+        path.write_text("Write a short PRD for {{ feature }}\n")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        # Another caller updates the shared file index before the watcher polls
+        assert registry.check_for_changes()
+        assert fired.wait(5)
+    finally:
+        stop.set()
+
+    assert events[0]["path"] == os.path.join("prompts", "prd.md")
+    assert events[0]["old_hash"] != events[0]["new_hash"]
+
+
+def test_registry_json_is_seeded_in_one_transaction(tmp_path):
+    (tmp_path / "prompts").mkdir()
+    (tmp_path / "prompts" / "registry.json").write_text(json.dumps({"prompts": {
+        "PRD_GEN": {"latest": "v2", "description": "PRD generator", "versions": {
+            "v1": {"path": "prompts/prd_v1.md", "hash": "abc", "created_at": "2026-01-01T00:00:00"},
+            "v2": {"path": "prompts/prd_v2.md", "hash": "def", "created_at": "2026-02-01T00:00:00",
+                   "tags": ["prod"]},
+        }},
+    }}))
+    reg = PromptRegistry(registry_path=str(tmp_path / "prompts" / "registry.json"), prompts_base=str(tmp_path))
+
+    info = reg.registry["prompts"]["PRD_GEN"]
+    assert info["latest"] == "v2"
+    assert info["versions"]["v2"]["tags"] == ["prod"]
+    assert reg.store.seed_versions([]) is False  # Already seeded
+
+
+def test_failed_seed_leaves_the_store_empty(tmp_path):
+    store = SQLitePromptStore(str(tmp_path / "registry.db"))
+    rows = [
+        {"name": "PRD_GEN", "version": "v1", "path": "prd.md", "file_hash": "abc"},
+        {"name": "EPIC_GEN", "version": "v1"},  # Missing path: fails mid-import
+    ]
+    with pytest.raises(TypeError):
+        store.seed_versions(rows)
+    assert store.is_empty()
+
+    assert store.seed_versions(rows[:1]) is True
+    assert not store.is_empty()
+
+
+def test_compiled_template_fills_slots_once():
+    template = compile_template("Write a {{ kind }} for {{FEATURE}}. Keep {{kind}} short.")
+    assert template.variables == {"kind", "FEATURE"}
+    # Substituted values are not re-scanned for placeholders
+    assert template.render({"kind": "PRD", "FEATURE": "{{kind}}"}) == "Write a PRD for {{kind}}. Keep PRD short."
+    assert template.render({"kind": "PRD"}) == "Write a PRD for {{FEATURE}}. Keep PRD short."
+    with pytest.raises(TemplateError):
+        template.render({"kind": "PRD", "extra": 1}, strict=True)
+    assert compile_template(template.source) is template
+
+
+def test_get_template_recompiles_after_invalidation(registry, tmp_path):
+    first = registry.get_template("PRD_GEN")
+    assert registry.get_template("PRD_GEN") is first
+    assert first.render({"feature": "SSO"}) == "Write a PRD for SSO\n"
+
+    prompt_registry.invalidate_templates()
+    assert registry.get_template("PRD_GEN") is not first
+
+
+def test_statistics_helpers_match_reference_values():
+    low, high = prompt_registry._wilson_interval(8, 10, 1.96)
+    assert low == pytest.approx(0.4902, abs=1e-4)
+    assert high == pytest.approx(0.9433, abs=1e-4)
+    assert prompt_registry._wilson_interval(0, 0, 1.96) == (0.0, 1.0)
+
+    # Student's t, df = 10: two-sided 5% critical value 2.228
+    assert prompt_registry._t_critical(0.05, 10) == pytest.approx(2.2281, abs=1e-3)
+    assert prompt_registry._t_two_sided_p(2.2281, 10) == pytest.approx(0.05, abs=1e-4)
+
+    p_value, mean, se = prompt_registry._paired_t_test([0.1, 0.2, 0.15, 0.05, 0.3])
+    assert mean == pytest.approx(0.16)
+    assert se == pytest.approx(0.04301, abs=1e-4)
+    assert p_value == pytest.approx(0.0205, abs=1e-3)
+    assert prompt_registry._paired_t_test([0.2])[0] == 1.0
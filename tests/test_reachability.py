@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from planning_agent import DependencyGraph
+from reachability import ReachabilityIndex
+
+
+def _brute_force(succ, source):
+    seen, stack = set(), [source]
+    while stack:
+        for v in succ.get(stack.pop(), ()):
+            if v not in seen:
+                seen.add(v)
+                stack.append(v)
+    return seen
+
+
+def _check(index, nodes):
+    position = {node: i for i, node in enumerate(index.order)}
+    for u in nodes:
+        expected = _brute_force(index.succ, u)
+        assert set(index.dependents(u)) == expected
+        for v in index.succ.get(u, ()):
+            assert position[u] < position[v]
+        for v in nodes:
+            assert index.reaches(u, v) == (v in expected and v != u)
+
+
+@pytest.mark.parametrize("mode", ["bitset", "interval"])
+def test_incremental_edits_match_brute_force(mode):
+    rng = random.Random(7)
+    ids = [f"S{i}" for i in range(30)]
+    stories = [{"id": s, "dependencies": [d for d in ids[:i] if rng.random() < 0.08]} for i, s in enumerate(ids)]
+    index = ReachabilityIndex(DependencyGraph(stories), mode=mode)
+    nodes = list(ids)
+    _check(index, nodes)
+
+    rebuilds = 0
+    original_rebuild = index.rebuild
+
+    def counting_rebuild():
+        nonlocal rebuilds
+        rebuilds += 1
+        original_rebuild()
+
+    index.rebuild = counting_rebuild
+
+    for step in range(150):
+        if step % 10 == 0:
+            story = f"N{step}"
+            index.add_story(story, rng.sample(nodes, 2))
+            nodes.append(story)
+        dep, story = rng.sample(nodes, 2)
+        if rng.random() < 0.3 and index.succ.get(dep):
+            index.remove_edge(dep, rng.choice(index.succ[dep]))
+        elif not index.reaches(story, dep):
+            index.add_edge(dep, story)
+        if step % 25 == 0:
+            _check(index, nodes)
+    _check(index, nodes)
+
+    with pytest.raises(ValueError):
+        u = next(n for n in nodes if index.succ.get(n))
+        index.add_edge(index.succ[u][0], u)
+    if mode == "bitset":
+        assert rebuilds == 0
+
+
+def test_inserts_never_rebuild_intervals():
+    rng = random.Random(3)
+    ids = [f"S{i}" for i in range(40)]
+    index = ReachabilityIndex(DependencyGraph([{"id": s} for s in ids]), mode="interval")
+    index.rebuild = lambda: pytest.fail("interval index rebuilt on insert")
+
+    for _ in range(200):
+        dep, story = rng.sample(ids, 2)
+        if not index.reaches(story, dep):
+            index.add_edge(dep, story)
+    index.add_story("NEW", ["S1", "S2"])
+    _check(index, ids + ["NEW"])
+
+
+def test_transitive_reduction_drops_implied_edges():
+    graph = DependencyGraph([
+        {"id": "A"},
+        {"id": "B", "dependencies": ["A"]},
+        {"id": "C", "dependencies": ["A", "B"]},
+    ])
+    for mode in ("bitset", "interval"):
+        assert sorted(ReachabilityIndex(graph, mode=mode).transitive_reduction()) == [("A", "B"), ("B", "C")]
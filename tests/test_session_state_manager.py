@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+
+import session_state_manager
+from session_state_manager import SessionStateManager
+
+
+@pytest.fixture(autouse=True)
+def quiet_console(monkeypatch):
+    monkeypatch.setattr(session_state_manager.console, "print", lambda *args, **kwargs: None)
+
+
+def _run_with_timeout(fn, timeout=10):
+    errors = []
+
+    def target():
+        try:
+            fn()
+        except Exception as e:  # surfaced below
+            errors.append(e)
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "call deadlocked"
+    if errors:
+        raise errors[0]
+
+
+def test_register_entity_migrates_legacy_markdown(tmp_path):
+    (tmp_path / "entities.md").write_text(
+        "# Entity Registry\n\n"
+        "| Entity | Discovered In | CRUD | States | Notes |\n"
+        "|:-------|:--------------|:-----|:-------|:------|\n"
+        "| Policy | Session 1 | CRU | Draft, Issued | legacy |\n"
+    )
+    manager = SessionStateManager(str(tmp_path))
+
+    _run_with_timeout(lambda: manager.register_entity("Claim", "Session 2", operations="CR"))
+
+    names = {e["name"] for e in manager.get_all_entities()}
+    assert names == {"Policy", "Claim"}
+    assert manager.get_entity("policy")["notes"] == "legacy"
+    assert (tmp_path / "entities.jsonl").exists()
+
+
+def test_reader_survives_compaction_by_another_manager(tmp_path):
+    reader, writer = SessionStateManager(str(tmp_path)), SessionStateManager(str(tmp_path))
+    for i in range(60):
+        reader.register_entity(f"B{i}", "x")
+    for i in range(200):
+        writer.register_entity("E1", "x", notes=str(i))
+    for i in range(5):
+        writer.register_entity(f"N{i}", "x")
+
+    assert len(reader.get_all_entities()) == 66
+    assert reader.get_entity("E1")["notes"] == "199"
+    assert reader.get_entity("n4") is not None
+
+
+def test_updates_keep_existing_fields(tmp_path):
+    manager = SessionStateManager(str(tmp_path))
+    manager.register_entity("Policy", "Session 1", operations="CRU", states="Draft")
+    manager.register_entity("policy", "Session 2", notes="renamed")
+
+    entity = SessionStateManager(str(tmp_path)).get_entity("POLICY")
+    assert entity["discovered_in"] == "Session 1"
+    assert entity["operations"] == "CRU"
+    assert entity["notes"] == "renamed"
+
+
+LEGACY_ENTRY = """
+## Session {timestamp}
+**Agent:** {agent}
+**Tools Run:** None
+**Key Outcomes:**
+- No significant outcomes recorded.
+**Open Questions Added:** 0
+
+---
+"""
+
+
+def test_legacy_session_log_is_indexed(tmp_path):
+    (tmp_path / "session_log.md").write_text(
+        SessionStateManager.SESSION_LOG_HEADER
+        + LEGACY_ENTRY.format(timestamp="2026-01-05 09:00", agent="PRD Agent")
+        + LEGACY_ENTRY.format(timestamp="2026-01-06 10:30", agent="Epic Agent")
+    )
+    manager = SessionStateManager(str(tmp_path))
+    assert [s["agent"] for s in manager.get_recent_sessions(5)] == ["Epic Agent", "PRD Agent"]
+
+    manager.log_session("Story Agent", ["crud"], ["Drafted stories"])
+    sessions = manager.get_recent_sessions(3)
+    assert [s["agent"] for s in sessions] == ["Story Agent", "Epic Agent", "PRD Agent"]
+    assert sessions[2]["timestamp"] == "2026-01-05 09:00"
+    assert sessions[2]["content"].startswith("## Session 2026-01-05 09:00")
+    assert sessions[2]["content"].endswith("---")